@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import dataclasses
+import functools
+from enum import Enum
+from typing import Final, Optional
+
+import regex
+from regex import Pattern
+
+
+class Char_Class(Enum):
+    HAN = "han"
+    HIRAGANA = "hiragana"
+    KATAKANA = "katakana"
+    LETTER = "letter"
+    DIGIT = "digit"
+    SPACE = "space"
+    PUNCTUATION = "punctuation"
+
+
+pats_script: Final[dict[Char_Class, Pattern]] = {
+    Char_Class.HAN: regex.compile("\\p{Script=Han}"),
+    Char_Class.HIRAGANA: regex.compile("\\p{Script=Hiragana}"),
+    # a modifier letter like 'ー' is shared by kana but mostly used in katakana words
+    Char_Class.KATAKANA: regex.compile("\\p{Script=Katakana}|(?=\\p{Lm})\\p{Script_Extensions=Katakana}"),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def get_char_class(char: str) -> Char_Class:
+    """classify a single character. punctuation includes any other symbols."""
+    for char_class, pat in pats_script.items():
+        if pat.match(char):
+            return char_class
+    if char.isspace():
+        return Char_Class.SPACE
+    if char.isdigit():
+        return Char_Class.DIGIT
+    if char.isalpha():
+        return Char_Class.LETTER
+    return Char_Class.PUNCTUATION
+
+
+@dataclasses.dataclass(frozen=True)
+class Char_Run:
+    """maximal run of characters of the same class. ascii is true if all the characters are ascii."""
+
+    char_class: Char_Class
+    text: str
+    start: int
+    ascii: bool
+
+    @property
+    def end(self) -> int:
+        return self.start + len(self.text)
+
+
+def tokenize(text: str) -> tuple[Char_Run, ...]:
+    """split text into runs by character class. ascii and non-ascii characters make separate runs except for space, so that e.g. 'Ａ' and 'A' never share a run."""
+    runs: list[Char_Run] = []
+    start: int = 0
+    key_prev: Optional[tuple[Char_Class, bool]] = None
+    for i, char in enumerate(text):
+        char_class: Char_Class = get_char_class(char)
+        key: tuple[Char_Class, bool] = (char_class, char_class == Char_Class.SPACE or char.isascii())
+        if key_prev is not None and key != key_prev:
+            runs.append(Char_Run(key_prev[0], text[start:i], start, text[start:i].isascii()))
+            start = i
+        key_prev = key
+    if key_prev is not None:
+        runs.append(Char_Run(key_prev[0], text[start:], start, text[start:].isascii()))
+    return tuple(runs)
@@ -1,14 +1,19 @@
 import abc
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, wait
 from typing import Optional
 
 from rich import print
 
+from Decision import Query
 from Mediator import Candidate, Choice, Mediator, Option
 from Text_Line import Paged_Text_Line
 from Text_Lines import Paged_Text_Lines
 
 
 class Choose_from_Integers(metaclass=abc.ABCMeta):
+    # the number of rows ahead whose candidates are computed in background while user is answering
+    prefetch: int = 2
+
     @abc.abstractmethod
     def __init__(self, lines: Paged_Text_Lines) -> None:
         self.lines: Paged_Text_Lines = lines
@@ -54,24 +59,52 @@ class Choose_from_Integers(metaclass=abc.ABCMeta):
             choice = self._get_forced_choice(line, candidates)
             print(f"trivial candidate. auto-choose {self._get_what_chosen(choice=choice)}.")
             return choice
+        query = Query(
+            stage=self.__class__.__name__, text=line.text, candidates=tuple(c.text for c in candidates), choices=True
+        )
         user_input, _ = self.mediator.get_user_input(
-            msg=msg, default_value=Option.Pass.value, domain=range(len(candidates))
+            msg=msg, default_value=Option.Pass.value, domain=range(len(candidates)), query=query
         )
         return self.mediator.interpret(user_input=user_input)
 
     def _on_ignore(self, line: Paged_Text_Line):
         raise NotImplementedError
 
+    def _prefetch_candidates(
+        self, executor: Executor, rows: list[Paged_Text_Line], start: int, futures: dict[int, Future]
+    ) -> None:
+        """submit the candidates of rows[start] and of the prefetch rows after it, unless already submitted."""
+        for j in range(start, min(start + 1 + self.prefetch, len(rows))):
+            if j not in futures:
+                futures[j] = executor.submit(self._get_candidates, rows[j])
+
+    def _discard_prefetched(self, futures: dict[int, Future]) -> None:
+        """forget the candidates computed in advance, waiting for the one being computed so that nothing runs behind."""
+        for future in futures.values():
+            future.cancel()
+        wait(futures.values())
+        futures.clear()
+
     def choose_from_integers(self) -> Paged_Text_Lines:
-        """from displayed candidates, interactively choose one, and return updated lines."""
+        """from displayed candidates, interactively choose one, and return updated lines.
+        candidates of the next rows are computed on a worker thread while user is answering, since they only depend on their own row."""
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            return self._choose_from_integers(executor)
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def _choose_from_integers(self, executor: Executor) -> Paged_Text_Lines:
         new_lines: list[Paged_Text_Line] = []
         delete_idx: list[int] = []
         if len(self.lines) > 0:
             self.mediator.explain()
         rows: list[Paged_Text_Line] = self.find_rows()
         print(f"{len(rows)} cases found.")
+        futures: dict[int, Future] = {}
         for i, line in enumerate(rows):
-            candidates: list[Candidate] = self._get_candidates(line)
+            self._prefetch_candidates(executor, rows, i, futures)
+            candidates: list[Candidate] = futures.pop(i).result()
             if nonzero := (len(candidates) > 0):
                 self._show_candidates(line, candidates)
             msg: Optional[str] = None if i == 0 else f"({(i+1)}/{len(rows)})"
@@ -85,9 +118,14 @@ class Choose_from_Integers(metaclass=abc.ABCMeta):
                 case Option.Remove:
                     delete_idx.append(line.idx)
                 case Option.Exit:
+                    self._discard_prefetched(futures)
                     break
                 case Option.Ignore:
+                    # candidates computed before ignoring might be stale
+                    self._discard_prefetched(futures)
                     self._on_ignore(line)
                 case _:
                     raise Exception(f"unknown choice type {choice.option}.")
+        if len(delete_idx) == 0 and len(new_lines) == 0:
+            return self.lines
         return self.lines.exclude(delete_idx).overwrite(new_lines)
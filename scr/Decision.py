@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import abc
+import csv
+import dataclasses
+import hashlib
+import json
+from enum import Enum
+from pathlib import Path
+from typing import Final, Iterator, Optional
+
+
+@dataclasses.dataclass(frozen=True)
+class Query:
+    """what user is asked at some stage. stage is usually the name of the asking class.
+    text is the row in question and candidates are what is shown with it. if choices is true, candidates are numbered and the answer is the index of one of them.
+    default is what user gets by just hitting enter, and skip is the answer that leaves the row as it is. they are not a part of the key."""
+
+    stage: str
+    text: str
+    candidates: tuple[str, ...] = ()
+    default: str = ""
+    choices: bool = False
+    skip: str = ""
+
+    def get_key(self) -> str:
+        """stable hash of stage, text and candidates, which does not change across runs."""
+        payload: str = json.dumps([self.stage, self.text, list(self.candidates)], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class Decider(metaclass=abc.ABCMeta):
+    """something that answers queries instead of user. answers are raw strings as if typed by user."""
+
+    @abc.abstractmethod
+    def decide(self, query: Query) -> Optional[str]:
+        """answer to query. None if undecidable, in which case user is asked."""
+        raise NotImplementedError
+
+    def observe(self, query: Query, answer: str) -> None:
+        """learn the answer to query that is finally accepted."""
+        pass
+
+    def suggest(self, query: Query) -> Optional[tuple[str, float]]:
+        """propose an answer to query with its confidence, which user is shown as the default. None if there is no idea."""
+        return None
+
+
+class Decision_Journal(Decider):
+    """record every answer to a JSONL file and replay the recorded answer to the same query on later runs."""
+
+    def __init__(self, path: Path | str) -> None:
+        self.path: Path = Path(path)
+        self._answers: dict[str, str] = self._load()
+
+    def __len__(self) -> int:
+        return len(self._answers)
+
+    def _iter_records(self) -> Iterator[dict]:
+        if not self.path.is_file():
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip() != "":
+                    yield json.loads(line)
+
+    def _load(self) -> dict[str, str]:
+        # the latest answer wins
+        return {record["key"]: record["answer"] for record in self._iter_records()}
+
+    def get_decisions(self) -> list[tuple[Query, str]]:
+        """get every query recorded with its latest answer. queries are restored as far as recorded."""
+        decisions: dict[str, tuple[Query, str]] = {}
+        for record in self._iter_records():
+            query = Query(
+                stage=record["stage"],
+                text=record["text"],
+                candidates=tuple(record["candidates"]),
+                default=record.get("default", ""),
+                choices=record.get("choices", False),
+            )
+            decisions[record["key"]] = (query, record["answer"])
+        return list(decisions.values())
+
+    def decide(self, query: Query) -> Optional[str]:
+        return self._answers.get(query.get_key())
+
+    def observe(self, query: Query, answer: str) -> None:
+        key: str = query.get_key()
+        if self._answers.get(key) == answer:
+            return
+        self._answers[key] = answer
+        record: dict = {
+            "key": key,
+            "stage": query.stage,
+            "text": query.text,
+            "candidates": list(query.candidates),
+            "default": query.default,
+            "choices": query.choices,
+            "answer": answer,
+        }
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+class Policy(Enum):
+    """how to answer queries without asking user.
+    trivial answers nothing, since trivial candidates are chosen before asking anyway."""
+
+    Trivial = "trivial"
+    Longest = "longest"
+    Shortest = "shortest"
+    Default = "default"
+    Skip = "skip"
+
+
+class Policy_Decider(Decider):
+    """answer queries by a fixed policy. stage_policies overrides the policy for the given stages."""
+
+    def __init__(self, policy: Policy = Policy.Trivial, stage_policies: dict[str, Policy] = {}) -> None:
+        self.policy: Policy = policy
+        self.stage_policies: dict[str, Policy] = dict(stage_policies)
+
+    def get_policy(self, stage: str) -> Policy:
+        return self.stage_policies.get(stage, self.policy)
+
+    def decide(self, query: Query) -> Optional[str]:
+        match self.get_policy(query.stage):
+            case Policy.Trivial:
+                return None
+            case Policy.Longest | Policy.Shortest if not query.choices or len(query.candidates) == 0:
+                return None
+            case Policy.Longest:
+                return str(max(range(len(query.candidates)), key=lambda i: len(query.candidates[i])))
+            case Policy.Shortest:
+                return str(min(range(len(query.candidates)), key=lambda i: len(query.candidates[i])))
+            case Policy.Default:
+                return query.default if query.default != "" else None
+            case Policy.Skip:
+                return query.skip if query.skip != "" else None
+            case policy:
+                raise ValueError(f"unknown policy {policy}.")
+
+
+class Review_Collector(Decider):
+    """the last resort of batch mode. it never leaves user to answer: it takes the skip answer, or the default if there is none,
+    and keeps the query so that it can be reviewed later."""
+
+    def __init__(self) -> None:
+        self.reviews: list[tuple[Query, str]] = []
+
+    def __len__(self) -> int:
+        return len(self.reviews)
+
+    def decide(self, query: Query) -> Optional[str]:
+        answer: str = query.skip if query.skip != "" else query.default
+        self.reviews.append((query, answer))
+        return answer
+
+    def clear(self) -> None:
+        self.reviews = []
+
+    def save(self, path: Path | str) -> Path:
+        """write the queries left for review as JSONL, one per line with the answer applied instead of user."""
+        path = Path(path)
+        with open(path, "w", encoding="utf-8") as f:
+            for query, answer in self.reviews:
+                record: dict = {
+                    "key": query.get_key(),
+                    "stage": query.stage,
+                    "text": query.text,
+                    "candidates": list(query.candidates),
+                    "default": query.default,
+                    "applied": answer,
+                }
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return path
+
+    def export(self, path: Path | str) -> Path:
+        """write the queries left for review as a worksheet, whose answer column is to be filled by reviewers."""
+        path = Path(path)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f, delimiter="\t")
+            writer.writerow(Worksheet.columns)
+            for query, _ in self.reviews:
+                candidates: list[str] = (
+                    [f"{i} | {c}" for i, c in enumerate(query.candidates)] if query.choices else list(query.candidates)
+                )
+                writer.writerow([query.get_key(), query.stage, query.text, "\n".join(candidates), query.default, ""])
+        return path
+
+
+class Worksheet_Mode(Enum):
+    """export writes the questions into a worksheet instead of asking, and import applies the answers filled in it."""
+
+    Export = "export"
+    Import = "import"
+
+
+class Worksheet(Decider):
+    """answer queries by a worksheet filled by reviewers. a worksheet is a TSV file with a row per query, see Review_Collector.export.
+    rows whose answer is left empty are undecided."""
+
+    columns: Final[list[str]] = ["key", "stage", "text", "candidates", "default", "answer"]
+
+    def __init__(self, path: Path | str) -> None:
+        self.path: Path = Path(path)
+        self._answers: dict[str, str] = self._load()
+
+    def __len__(self) -> int:
+        return len(self._answers)
+
+    def _load(self) -> dict[str, str]:
+        answers: dict[str, str] = {}
+        with open(self.path, encoding="utf-8", newline="") as f:
+            for record in csv.DictReader(f, delimiter="\t"):
+                if (answer := (record.get("answer") or "").strip()) != "":
+                    answers[record["key"]] = answer
+        return answers
+
+    def decide(self, query: Query) -> Optional[str]:
+        return self._answers.get(query.get_key())
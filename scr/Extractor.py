@@ -85,12 +85,27 @@ class Extractor:
                 return L < R
         return len(le) <= len(r)
 
+    def _ja_in_this_order(self, ja_last: dict[str, int], ja_cur: tuple[str, int]) -> bool:
+        """test if japanese header does not go back from the last one of the same unit."""
+        unit, number = ja_cur
+        return number >= ja_last.get(unit, 0)
+
+    def _update_ja_last(self, ja_last: dict[str, int], ja_cur: tuple[str, int]) -> dict[str, int]:
+        """record the latest number of the unit, and forget those of its lower units, e.g., '節' after '章'."""
+        unit, number = ja_cur
+        units: str = Paged_Text_Line.ja_units
+        lower: str = units[units.index(unit) + 1 :] if unit in units else ""
+        updated: dict[str, int] = {u: n for u, n in ja_last.items() if u not in lower}
+        updated[unit] = number
+        return updated
+
     def get_lines_with_unexpected_header(self) -> Paged_Text_Lines:
         """get lines with suspicious header number.
         collect the latter of '13.1.5' followed by '1.31.5', or of 'B. xxx' followed by 'A. yyy',
         or of '1.1.1' followed by 'B. xxxx'.
         it ignores 'A. yyyy' followed by '2.4.1'.
         so it is generous for digit but not so for alphabet header.
+        japanese header like '第3章' is compared with the last one of the same unit, which is reset by a higher unit.
         """
         # set generous init value for digit so that the next digit is easy to pass the ordering test
         digits_init: Final[list[str]] = ["0", "0", "0"]
@@ -98,6 +113,7 @@ class Extractor:
         abc_init: Final[str] = "{"
         digits_last: list[str] = digits_init
         abc_last: str = abc_init
+        ja_last: dict[str, int] = {}
         rows: list[int] = []
         for line in self.lines:
             match line.header:
@@ -116,6 +132,11 @@ class Extractor:
                         rows.append(line.idx)
                     abc_last = abc_cur
                     # not init digit
+                case line.Header.JA:
+                    if (ja_cur := line.get_ja_header()) is not None:
+                        if not self._ja_in_this_order(ja_last, ja_cur):
+                            rows.append(line.idx)
+                        ja_last = self._update_ja_last(ja_last, ja_cur)
                 case line.Header.NO:
                     rows.append(line.idx)
                 case line.Header.WORD:
@@ -139,16 +160,23 @@ class Extractor:
         else:  # they are all normal
             return a <= b <= c
 
-    def get_order_disturbing_main_pages(self) -> Paged_Text_Lines:
-        """get lines like page-indexed (10,8,13) or (10,14,11)"""
+    def get_order_disturbing_main_pages(self, check_front_matter: bool = True) -> Paged_Text_Lines:
+        """get lines like page-indexed (10,8,13) or (10,14,11).
+        if check_front_matter is true, roman-indexed lines like (iv,ii,vi) and those indexed by corrupt roman number like 'iiii' are also collected in the same pass.
+        """
         page_numbers: list[int] = []
+        # value -1 for a row with no roman page, and 0 for a row with corrupt roman page
+        front_numbers: list[int] = []
         for line in self.lines:
             if not line.is_page_set():
                 page_numbers.append(-1)
+                front_numbers.append(-1)
             elif line.roman_page_number is not None:
                 page_numbers.append(0)
+                front_numbers.append(0 if (value := line.roman_page_value) is None else value)
             elif line.page_number is not None:
                 page_numbers.append(line.page_number)
+                front_numbers.append(-1)
         # run through page numbers list to find disturbing page
         # pick three adjacent elements to check their order consistency
         # ignore 0 since we are not interested in front matter page
@@ -161,4 +189,15 @@ class Extractor:
             suc: int = page_numbers[i + 1] if i < L - 1 else INF
             if not self.__is_well_ordered(pre, cur, suc):
                 ill_page.append(self.lines[i])
+            elif check_front_matter and not self.__is_well_ordered_front(front_numbers, i):
+                ill_page.append(self.lines[i])
         return Paged_Text_Lines(ill_page)
+
+    def __is_well_ordered_front(self, front_numbers: list[int], i: int) -> bool:
+        """test if the i-th roman page is valid and ordered relative to its neighboring roman pages."""
+        cur: int = front_numbers[i]
+        if cur == 0:
+            return False
+        pre: int = front_numbers[i - 1] if i > 0 else -1
+        suc: int = front_numbers[i + 1] if i < len(front_numbers) - 1 else -1
+        return self.__is_well_ordered(pre, cur, suc)
@@ -1,5 +1,6 @@
 from rich import print
 
+from Decision import Query
 from Filtering_Prompt import Prompt
 from Interpreter import Interpreter
 from Text_Lines import Paged_Text_Lines, Texts_Printer
@@ -58,7 +59,13 @@ class Filter_Lines:
             with_header: bool = set == 0
             self._printer.print(lines=self.lines, start=start, end=end, with_def=with_header, with_page_idx=False)
             # ask user to enter line indexes to delete
-            prompt.prompt(inter=inter, msg=f"({i+1}/{total}): Enter N to delete (n/-n/m-n/a[ll]/n[one]/[h]elp)")
+            query = Query(
+                stage=self.__class__.__name__,
+                text="\n".join(self.lines[j].to_text() for j in range(start, min(start + self.max_line, L))),
+            )
+            prompt.prompt(
+                inter=inter, msg=f"({i+1}/{total}): Enter N to delete (n/-n/m-n/a[ll]/n[one]/[h]elp)", query=query
+            )
             # convert selected list of integer like [0,1,4,6] to corresponding row idx of lines such as [20, 21, 24, 26]
             choice_in_range: list[int] = sorted(prompt.input.intersection(self._get_effective_range(n_th_zero_start=i)))
             selected_row_idx: list[int] = self._get_corresponding_row_idx_in_lines(i, choice_in_range)
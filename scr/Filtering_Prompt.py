@@ -1,13 +1,20 @@
+import dataclasses
+from typing import Optional
+
 import click
 from rich import print
 
+from Decision import Query
 from Input import _Input
 from Interpreter import Interpreter
+from Mediator import Mediator
+from Text_Lines import Texts_Printer
 
 
 class Prompt(_Input):
     def __init__(self) -> None:
         self._input: set[int] = set()
+        self._assignments: dict[int, str] = {}
 
     @property
     def input(self) -> set[int]:
@@ -16,46 +23,90 @@ class Prompt(_Input):
     def get_input(self) -> list[int]:
         return sorted(self.input)
 
+    def get_assignments(self) -> dict[int, str]:
+        """get values assigned to rows by the last input like '5=123'."""
+        return self._assignments
+
     def _get_highlighted(self, text: str, color: str = "magenda") -> str:
         return f"[{color}]{text}[/]"
 
-    def print_help(self, highlight: str = "magenda") -> None:
+    def print_help(self, highlight: str = "magenda", assign: bool = False) -> None:
         print("Inputs are interpreted sequentially from left to right.")
         print(f"1 6 4   ->   {self._get_highlighted('[1, 4, 6]', color=highlight)}")
         print(f"3-6     ->   {self._get_highlighted('[3, 4, 5, 6]', color=highlight)}")
         print(f"2-5 -4  ->   {self._get_highlighted('[2, 3, 5]', color=highlight)}")
         print(f"n       ->   {self._get_highlighted('[]', color=highlight)}")
         print(f"all     ->   {self._get_highlighted('all listed numbers', color=highlight)}")
+        if assign:
+            print(f"1-3 5=7 ->   {self._get_highlighted('[1, 2, 3] and 7 for 5', color=highlight)}")
+
+    def _interpret(self, inter: Interpreter, raw_input: str) -> Optional[set[int]]:
+        """interpret raw input into the set of chosen integers. None if it is invalid or asks for help, with the reason printed."""
+        # if raw input can be turned into sentence
+        if not Interpreter.Sentence.is_sentenceable(raw_input):
+            print(Interpreter.Sentence.get_error_msg(raw_input))
+            return None
+        sentence = inter.Sentence(raw_input)
+        # length and character check
+        if not inter.test_valid_length(sentence):
+            print(f"Invalid length. length must be <= {inter._get_maximum_valid_length()}.")
+            return None
+        elif not inter.test_valid_characters(sentence):
+            print(f"Invalid characters. Use from {inter.valid_words}.")
+            return None
+        # check sentence consists only of valid words
+        ng_words: list[inter.Word] = inter.get_invalid_words(sentence)
+        if ng_words != []:
+            print(f"invalid input found.{','.join(ng_words)}")
+            return None
+        interpreted: set[int] | inter.Phrase.Name = inter.interpret(sentence)
+        # check if input contains a dominant phrase
+        if isinstance(interpreted, inter.Phrase.Name):
+            # get a dominant phrase HELP
+            self.print_help(assign=inter.allow_assign)
+            return None
+        if not inter._is_in_range(interpreted | set(inter.get_assignments(sentence))):
+            print(f"input must be included in range={inter.range}")
+            return None
+        return interpreted
 
-    def prompt(self, inter: Interpreter, msg: str = "") -> None:
-        """ask user to type input in CLI repeatedly until it gets a valid one."""
+    def prompt(
+        self, inter: Interpreter, msg: str = "", query: Optional[Query] = None, default: Optional[str] = None
+    ) -> None:
+        """ask user to type input in CLI repeatedly until it gets a valid one.
+        if query is given, deciders are consulted first. their answer is checked just like what user types."""
+        if query is not None:
+            query = dataclasses.replace(query, skip=query.skip or "none")
+            answer: Optional[str] = Mediator.consult(query, is_valid=lambda a: self._interpret(inter, a) is not None)
+            if answer is not None and (interpreted := self._interpret(inter, answer)) is not None:
+                print(f"decided: {answer}")
+                self._input = interpreted
+                self._assignments = inter.get_assignments(inter.Sentence(answer))
+                return
         while True:
-            raw_input: str = click.prompt(msg, type=str)
-            # if raw input can be turned into sentence
-            if not Interpreter.Sentence.is_sentenceable(raw_input):
-                print(Interpreter.Sentence.get_error_msg(raw_input))
-                continue
-            sentence = inter.Sentence(raw_input)
-            # length and character check
-            if not inter.test_valid_length(sentence):
-                print(f"Invalid length. length must be <= {inter._get_maximum_valid_length()}.")
+            raw_input: str = click.prompt(msg, type=str, default=default)
+            if (interpreted := self._interpret(inter, raw_input)) is None:
                 continue
-            elif not inter.test_valid_characters(sentence):
-                print(f"Invalid characters. Use from {inter.valid_words}.")
-                continue
-            # check sentence consists only of valid words
-            ng_words: list[inter.Word] = inter.get_invalid_words(sentence)
-            if ng_words != []:
-                print(f"invalid input found.{','.join(ng_words)}")
-                continue
-            interpreted: set[int] | inter.Phrase.Name = inter.interpret(sentence)
-            # check if input contains a dominant phrase
-            if isinstance(interpreted, inter.Phrase.Name):
-                # get a dominant phrase HELP
-                self.print_help()
-            elif isinstance(interpreted, set):
-                if not inter._is_in_range(interpreted):
-                    print(f"input must be included in range={inter.range}")
-                    continue
-                self._input = interpreted
-                break
+            self._input = interpreted
+            self._assignments = inter.get_assignments(inter.Sentence(raw_input))
+            if query is not None:
+                Mediator.notify(query, raw_input)
+            break
+
+    def ask_page(
+        self,
+        stage: str,
+        texts: list[str],
+        msg: str = "",
+        default: str = "none",
+        allow_assign: bool = False,
+    ) -> tuple[list[int], dict[int, str]]:
+        """show texts numbered on a single screen and ask which of them to take in one line, e.g. '1-4 7 -3'.
+        return the positions taken and, if allow_assign, the values assigned to positions like '5=123'.
+        the default takes none of them, so that just pressing Enter leaves every row as it is, as the prompt of a single row does."""
+        # a short last page takes no numbers beyond its rows
+        inter = Interpreter(range_size=len(texts), allow_assign=allow_assign)
+        Texts_Printer().print_numbered(texts)
+        query = Query(stage=stage, text="\n".join(texts), default=default, skip="none")
+        self.prompt(inter=inter, msg=msg, query=query, default=default)
+        return sorted(self.input), self.get_assignments()
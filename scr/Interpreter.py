@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-import itertools
+import dataclasses
 import re
 from enum import IntEnum, auto
 from re import Pattern
-from typing import Callable, Final, Iterable
+from typing import Callable, Final, Optional
 
 
 class Interpreter:
@@ -58,6 +58,14 @@ class Interpreter:
         def to_words(self) -> list[Interpreter.Word]:
             return [Interpreter.Word(s) for s in self.split()]
 
+    @dataclasses.dataclass(frozen=True)
+    class Token:
+        """a word of a sentence with its kind, see token_kinds. kind and match are None if the word is of no kind."""
+
+        word: str
+        kind: Optional[str] = None
+        match: Optional[re.Match] = None
+
     # regexp patterns and their key names
     class Digit:
         """dataclass that holds Pattern object for detecting digit pattern and key to get detected digit."""
@@ -73,6 +81,12 @@ class Interpreter:
         calls: Final[list[str]] = ["first", "second"]
         pat: Final[Pattern] = re.compile(f"(?P<{calls[0]}>^\\d+)-(?P<{calls[1]}>\\d+)$")
 
+    class Assign:
+        """'N=M' assigns value M to row N, where M may come with '+'. only valid if the interpreter allows assignment."""
+
+        calls: Final[list[str]] = ["row", "value"]
+        pat: Final[Pattern] = re.compile(f"^(?P<{calls[0]}>\\d+)=(?P<{calls[1]}>[+]?\\d+)$")
+
     class Phrase:
         """holds identifiers key phrases as Phrase.Name and corresponding Pattern objects that detect the phrases in raw input"""
 
@@ -111,12 +125,47 @@ class Interpreter:
             """get dominant names in Phrase class. Note that dominant names are not defined explicitly in their property, but implicitly by is_dominant_function."""
             return [name for name in cls.Name if cls.is_dominant(name)]
 
-    def __init__(self, range_size: int = 10) -> None:
+    # kinds of words, each with the pattern that tells it
+    token_kinds: Final[dict[str, Pattern]] = {
+        "range": Range.pat,
+        "minus": Minus.pat,
+        "assign": Assign.pat,
+        "digit": Digit.pat,
+        "all": Phrase.Pat.all,
+        "none": Phrase.Pat.none,
+        "help": Phrase.Pat.help,
+    }
+    # a single pattern made of the above that tells the kind of a whole word by the name of the group it hits
+    pat_token: Final[Pattern] = re.compile(
+        "|".join(f"(?P<kind_{kind}>{pat.pattern})" for kind, pat in token_kinds.items())
+    )
+
+    def __init__(self, range_size: int = 10, allow_assign: bool = False) -> None:
+        """if allow_assign, words like '5=123' are accepted, see get_assignments."""
         self._validate_range(range_max=range_size)
         self.__range: set[int] = set(range(0, range_size))
         self.__input: set[int] = set()
+        self.allow_assign: bool = allow_assign
         self.__default_words: set[str] = {" ", "\\-"}.union([str(r) for r in range(0, min(10, range_size + 1))])
+        if allow_assign:
+            # page numbers assigned may contain any digits
+            self.__default_words |= {"=", "\\+"}.union([str(r) for r in range(0, 10)])
         self.__valid_words: list[str] = sorted(self._list_valid_characters())
+        self.__pat_invalid_characters: Pattern = re.compile(f"[^{''.join(self.valid_words)}]")
+        # bits of all the numbers in range
+        self.__mask_all: int = (1 << range_size) - 1
+        # evaluation of each kind of words. each takes (chosen numbers in range as bitmask, those out of range, match)
+        self.__evaluators: dict[str, Callable[[int, set[int], re.Match], int]] = {
+            "digit": self._evaluate_digit,
+            "minus": self._evaluate_minus,
+            "range": self._evaluate_range,
+            "all": lambda mask, outside, _: self._evaluate_phrase(self.__mask_all, outside),
+            "none": lambda mask, outside, _: self._evaluate_phrase(0, outside),
+            # assignment does not choose anything by itself. see get_assignments
+            "assign": lambda mask, outside, _: mask,
+        }
+        # the last sentence tokenized and its tokens, since a sentence is usually checked and then interpreted
+        self.__tokenized: tuple[str, list[Interpreter.Token]] = ("", [])
 
     def _validate_range(self, range_max: int) -> bool:
         if range_max <= 0 or not isinstance(range_max, int):
@@ -164,69 +213,6 @@ class Interpreter:
             else any(re.search(pat, word) is not None for word in text.to_words())
         )
 
-    def _test_match_by(self, pats: list[Pattern], word: Word, eval: Callable[[Iterable], bool] = any) -> bool:
-        """An extension of _test_match() to accept many patterns. returns the result processed by the eval function."""
-        return eval(self._test_match(pat, word) for pat in pats)
-
-    def _interpret_digit_pattern(self, word: Word, wrt: set[int] = set()) -> set[int]:
-        """add digit specified by word to wrt, assuming word corresponds to a digit pattern."""
-        return wrt.union(self._get_matched_integers(self.Digit(), word))
-
-    def _interpret_minus_pattern(self, word: Word, wrt: set[int] = set()) -> set[int]:
-        """minus digit specified by word to wrt, assuming word corresponds to a minus digit pattern."""
-        return wrt.difference(self._get_matched_integers(self.Minus(), word))
-
-    def _interpret_range_pattern(self, word: Word, wrt: set[int] = set()) -> set[int]:
-        """add digits to specified by word to wrt, assuming word corresponds to a range pattern."""
-        x, y = self._get_matched_integers(self.Range(), word)
-        return wrt | set(range(min(x, y), max(x, y) + 1))
-
-    def _get_matched_integers(
-        self, match_cls: Interpreter.Digit | Interpreter.Minus | Interpreter.Range, word: Word
-    ) -> list[int]:
-        """get list of integers when the pair of pattern (of match_cls) and word hits something meaningful."""
-        return (
-            [int(match.group(call)) for call in match_cls.calls]
-            if (match := re.search(match_cls.pat, word)) is not None
-            else []
-        )
-
-    def _get_matched_phrase(self, word: Word) -> Phrase.Name:
-        """get the first hit phrase in word. Error if it hits no phrases."""
-        for name in self.Phrase.Name:
-            if self._test_match(self.Phrase.get_pattern(name), word):
-                return name
-        raise Exception(f"{word} does not match any of {self.Phrase.__name__}.")
-
-    def _interpret_phrase(self, word: Word) -> set[int]:
-        """get set of integers meant by phrase in word. an error wil be raised if word is not a phrase."""
-        match self._get_matched_phrase(word):  # raise error if it is not a phrase
-            case self.Phrase.Name.ALL:
-                return self.range
-            case self.Phrase.Name.NONE:
-                return set()
-        raise Exception(f"{word} is not a phrase.")
-
-    def _exist_dominant_phrase(self, sentence: Sentence) -> bool:
-        """test if word has a dominant phrase."""
-        return any(
-            itertools.chain.from_iterable(
-                [self._test_match(self.Phrase.get_pattern(d_name), word) for d_name in self.Phrase.get_dominant_names()]
-                for word in sentence.to_words()
-            )
-        )
-
-    def _find_most_dominant_phrase(self, sentence: Sentence) -> Phrase.Name:
-        """get the most dominant phrase in sentence."""
-        d_phrases = [
-            name
-            for name in self.Phrase.get_dominant_names()
-            if self._test_match(self.Phrase.get_pattern(name), sentence)
-        ]
-        if len(d_phrases) == 0:
-            raise ValueError(f"No dominant phrase are found in {sentence}")
-        return d_phrases[0]
-
     def _list_valid_characters(self) -> set[str]:
         """get the possible characters for input. It is defined as the set {numerical characters in range} | {space and -} | {characters in phrase}."""
         # default set consists of numerical characters and space and -.
@@ -238,50 +224,97 @@ class Interpreter:
 
     def test_valid_characters(self, sentence: Sentence) -> bool:
         """test if input sentence is free of invalid characters"""
-        pat: Pattern = re.compile(f"[^{''.join(self.valid_words)}]")
-        return re.search(pat, sentence) is None
+        return self.__pat_invalid_characters.search(sentence) is None
 
-    def _get_maximum_valid_length(self, scale: int = 5) -> int:
-        return max(self.range) * scale
+    def _get_maximum_valid_length(self, scale: Optional[int] = None) -> int:
+        """assignments take longer words, so that they are given more room by default."""
+        scale = (10 if self.allow_assign else 5) if scale is None else scale
+        return len(self.range) * scale
 
     def test_valid_length(self, sentence: Sentence) -> bool:
         """test if input sentence is of reasonable length."""
         return len(sentence) <= self._get_maximum_valid_length()
 
+    def _tokenize(self, sentence: Sentence) -> list[Token]:
+        """split sentence into words in a single pass, each with its kind."""
+        if self.__tokenized[0] == sentence:
+            return self.__tokenized[1]
+        tokens: list[Interpreter.Token] = []
+        for word in sentence.split():
+            match: Optional[re.Match] = self.pat_token.fullmatch(word)
+            kind: Optional[str] = None if match is None or match.lastgroup is None else match.lastgroup[len("kind_") :]
+            if match is None or kind is None or (kind == "assign" and not self.allow_assign):
+                tokens.append(self.Token(word=word))
+            else:
+                tokens.append(self.Token(word=word, kind=kind, match=match))
+        self.__tokenized = (sentence, tokens)
+        return tokens
+
     def get_invalid_words(self, sentence: Sentence) -> list[Word]:
-        pats: list[Pattern] = [self.Phrase.get_pattern(name) for name in self.Phrase.Name] + [
-            self.Digit.pat,
-            self.Minus.pat,
-            self.Range.pat,
-        ]
-        return [word for word in sentence.to_words() if not self._test_match_by(pats, word)]
+        return [self.Word(token.word) for token in self._tokenize(sentence) if token.kind is None]
+
+    def _evaluate_digit(self, mask: int, outside: set[int], match: re.Match) -> int:
+        if (x := int(match.group(self.Digit.calls[0]))) < len(self.range):
+            return mask | (1 << x)
+        outside.add(x)
+        return mask
+
+    def _evaluate_minus(self, mask: int, outside: set[int], match: re.Match) -> int:
+        if (x := int(match.group(self.Minus.calls[0]))) < len(self.range):
+            return mask & ~(1 << x)
+        outside.discard(x)
+        return mask
+
+    def _evaluate_range(self, mask: int, outside: set[int], match: re.Match) -> int:
+        x, y = (int(match.group(call)) for call in self.Range.calls)
+        first, last = min(x, y), max(x, y)
+        size: int = len(self.range)
+        # numbers out of range are kept as they are, only to be rejected later
+        outside.update(range(max(first, size), last + 1))
+        if first >= size:
+            return mask
+        last = min(last, size - 1)
+        return mask | (((1 << (last + 1)) - 1) ^ ((1 << first) - 1))
+
+    def _evaluate_phrase(self, mask: int, outside: set[int]) -> int:
+        outside.clear()
+        return mask
+
+    def _to_set(self, mask: int) -> set[int]:
+        """get the numbers whose bits are set in mask."""
+        return {i for i, bit in enumerate(reversed(bin(mask)[2:])) if bit == "1"}
+
+    def _to_mask(self, numbers: set[int]) -> tuple[int, set[int]]:
+        """get bitmask of numbers in range together with the rest of numbers."""
+        mask: int = 0
+        for x in numbers:
+            if 0 <= x < len(self.range):
+                mask |= 1 << x
+        return mask, {x for x in numbers if not 0 <= x < len(self.range)}
 
     def _interpret(self, sentence: Sentence, wrt: set[int] = set()) -> set[int]:
-        """get set of integers meant by sentence, assuming there is no dominant phrases that supersede integer interpretation."""
-        for word in sentence.to_words():
-            # if it is a phrase
-            if self._test_match_by([self.Phrase.Pat.all, self.Phrase.Pat.none], word):
-                wrt = self._interpret_phrase(word)
-            # digit
-            elif self._test_match(self.Digit.pat, word):
-                wrt = self._interpret_digit_pattern(word, wrt)
-            # minus
-            elif self._test_match(self.Minus.pat, word):
-                wrt = self._interpret_minus_pattern(word, wrt)
-            # range
-            elif self._test_match(self.Range.pat, word):
-                wrt = self._interpret_range_pattern(word, wrt)
-            else:
-                raise ValueError(f"{word} in {sentence} can't be interpreted.")
-        return wrt
+        """get set of integers meant by sentence, assuming there is no dominant phrases that supersede integer interpretation.
+        words are evaluated from left to right over a bitmask of the numbers in range, so that a range costs the same however wide it is.
+        """
+        mask, outside = self._to_mask(wrt)
+        for token in self._tokenize(sentence):
+            if token.kind is None or token.match is None or token.kind not in self.__evaluators:
+                raise ValueError(f"{token.word} in {sentence} can't be interpreted.")
+            mask = self.__evaluators[token.kind](mask, outside, token.match)
+        return self._to_set(mask) | outside
+
+    def get_assignments(self, sentence: Sentence) -> dict[int, str]:
+        """get values assigned to rows by words like '5=123' or '5=+123'. the later wins. empty unless assignment is allowed."""
+        assignments: dict[int, str] = {}
+        for token in self._tokenize(sentence):
+            if token.kind == "assign" and token.match is not None:
+                row, value = (token.match.group(call) for call in self.Assign.calls)
+                assignments[int(row)] = value
+        return assignments
 
     def interpret(self, sentence: Sentence) -> set[int] | Phrase.Name:
-        # check exist dominant phrase
-        if self._exist_dominant_phrase(sentence):
-            phrase: Interpreter.Phrase.Name = self._find_most_dominant_phrase(sentence)
-            if phrase == Interpreter.Phrase.Name.HELP:
-                return phrase
-            else:
-                raise ValueError(f"Unknown dominant phrase {phrase}.")
+        # a dominant phrase supersedes everything else
+        if any(token.kind == "help" for token in self._tokenize(sentence)):
+            return Interpreter.Phrase.Name.HELP
         # now we assume that input means some digits
         return self._interpret(sentence=sentence)
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import math
+from typing import Iterable, Optional
+
+from Decision import Decider, Query
+
+# an option of a query: the answer it stands for and its features
+Option_Features = tuple[str, dict[str, float]]
+
+
+class Choice_Model:
+    """conditional logit over the options of a query, trained per stage from the answers recorded in the past.
+    options are the default of a query, the candidates if they are numbered choices, and the non-numeric answers like 'p' or 'no' ever given at the stage.
+    every option is scored by a linear function of cheap features of itself and of the query, and the probability of choosing it is the softmax of the scores.
+    """
+
+    def __init__(self, epochs: int = 200, learning_rate: float = 0.5, l2: float = 1e-3, min_examples: int = 5) -> None:
+        """stages with fewer examples than min_examples are left without prediction."""
+        self.epochs: int = epochs
+        self.learning_rate: float = learning_rate
+        self.l2: float = l2
+        self.min_examples: int = min_examples
+        self.weights: dict[str, dict[str, float]] = {}
+        # non-numeric answers seen at each stage
+        self.tokens: dict[str, list[str]] = {}
+
+    def _get_query_features(self, query: Query) -> dict[str, float]:
+        text: str = query.text.rstrip()
+        return {
+            "len": min(len(text) / 60, 2.0),
+            "ends_digit": float(text[-1:].isdigit()),
+            "has_digit": float(any(c.isdigit() for c in text)),
+            "ascii": float(text.isascii()),
+            "n_candidates": min(len(query.candidates) / 5, 2.0),
+        }
+
+    def _get_candidate_features(self, query: Query, i: int) -> dict[str, float]:
+        lengths: list[int] = [len(c) for c in query.candidates]
+        candidate: str = query.candidates[i]
+        return {
+            "cand:first": float(i == 0),
+            "cand:rank": i / len(lengths),
+            "cand:longest": float(lengths[i] == max(lengths)),
+            "cand:shortest": float(lengths[i] == min(lengths)),
+            "cand:len_ratio": len(candidate) / max(len(query.text), 1),
+            "cand:space_delta": (candidate.count(" ") - query.text.count(" ")) / max(query.text.count(" "), 1),
+        }
+
+    def get_options(self, query: Query) -> list[Option_Features]:
+        """list the options of query, each with its features. an option is keyed by its kind, so that weights are shared among the options of the same kind."""
+        answers: dict[str, str] = {}
+        if query.choices:
+            for i in range(len(query.candidates)):
+                answers.setdefault(str(i), "cand")
+        for token in self.tokens.get(query.stage, []):
+            answers.setdefault(token, f"token:{token}")
+        if query.default != "":
+            answers.setdefault(query.default, "default")
+        q_features: dict[str, float] = self._get_query_features(query)
+        options: list[Option_Features] = []
+        for answer, kind in answers.items():
+            features: dict[str, float] = {kind: 1.0, "is_default": float(answer == query.default)}
+            features.update({f"{kind}*{name}": value for name, value in q_features.items()})
+            if kind == "cand":
+                features.update(self._get_candidate_features(query, int(answer)))
+            options.append((answer, features))
+        return options
+
+    def _score(self, weights: dict[str, float], features: dict[str, float]) -> float:
+        return sum(weights.get(name, 0.0) * value for name, value in features.items())
+
+    def _softmax(self, scores: list[float]) -> list[float]:
+        top: float = max(scores)
+        exps: list[float] = [math.exp(s - top) for s in scores]
+        total: float = sum(exps)
+        return [e / total for e in exps]
+
+    def train(self, decisions: Iterable[tuple[Query, str]]) -> Choice_Model:
+        """fit weights of every stage by gradient descent on the log likelihood of the recorded answers."""
+        by_stage: dict[str, list[tuple[Query, str]]] = {}
+        for query, answer in decisions:
+            by_stage.setdefault(query.stage, []).append((query, answer))
+        for stage, decided in by_stage.items():
+            self.tokens[stage] = sorted({answer for _, answer in decided if not answer.lstrip("+-").isdigit()})
+            examples: list[tuple[list[dict[str, float]], int]] = []
+            for query, answer in decided:
+                options: list[Option_Features] = self.get_options(query)
+                chosen: list[int] = [k for k, (a, _) in enumerate(options) if a == answer]
+                # answers out of the options, like a page typed by hand, tell nothing here
+                if len(chosen) > 0 and len(options) > 1:
+                    examples.append(([f for _, f in options], chosen[0]))
+            if len(examples) < self.min_examples:
+                continue
+            self.weights[stage] = self._fit(examples)
+        return self
+
+    def _fit(self, examples: list[tuple[list[dict[str, float]], int]]) -> dict[str, float]:
+        weights: dict[str, float] = {}
+        for _ in range(self.epochs):
+            grad: dict[str, float] = {}
+            for options, chosen in examples:
+                probs: list[float] = self._softmax([self._score(weights, f) for f in options])
+                for k, features in enumerate(options):
+                    coef: float = (1.0 if k == chosen else 0.0) - probs[k]
+                    for name, value in features.items():
+                        grad[name] = grad.get(name, 0.0) + coef * value
+            for name in set(grad) | set(weights):
+                w: float = weights.get(name, 0.0)
+                weights[name] = w + self.learning_rate * (grad.get(name, 0.0) / len(examples) - self.l2 * w)
+        return weights
+
+    def predict(self, query: Query) -> Optional[tuple[str, float]]:
+        """get the most likely answer to query and its probability. None if the stage is not learned."""
+        if (weights := self.weights.get(query.stage)) is None:
+            return None
+        options: list[Option_Features] = self.get_options(query)
+        if len(options) == 0:
+            return None
+        probs: list[float] = self._softmax([self._score(weights, f) for _, f in options])
+        k: int = max(range(len(options)), key=lambda k: probs[k])
+        return options[k][0], probs[k]
+
+
+class Learned_Decider(Decider):
+    """suggest the answer predicted by model as the default. if threshold is given, predictions at least that confident are applied without asking."""
+
+    def __init__(self, model: Choice_Model, threshold: Optional[float] = None) -> None:
+        self.model: Choice_Model = model
+        self.threshold: Optional[float] = threshold
+
+    def decide(self, query: Query) -> Optional[str]:
+        if self.threshold is None or (predicted := self.model.predict(query)) is None:
+            return None
+        answer, confidence = predicted
+        return answer if confidence >= self.threshold else None
+
+    def suggest(self, query: Query) -> Optional[tuple[str, float]]:
+        return self.model.predict(query)
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Final, Optional
+
+
+def get_file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_source_hash() -> str:
+    """hash of the sources of tidy-toc, which changes whenever the code does, released or not."""
+    digest = hashlib.sha256()
+    for source in sorted(Path(__file__).parent.glob("*.py")):
+        digest.update(source.name.encode("utf-8"))
+        digest.update(get_file_hash(source).encode("utf-8"))
+    return digest.hexdigest()
+
+
+# outputs made by other code are made again
+VERSION: Final[str] = get_source_hash()
+
+
+class Manifest:
+    """record of the files tidied into a directory, which lets later runs skip files that would be tidied the same way again.
+    an entry per input file holds the key made of the input content, the options and the version, and the hash of the output.
+    the key is taken from the input after tidying, so that an input overwritten by its output is also recognized.
+    the key covers no other file, so runs that read answers from a journal or a worksheet should not use a manifest."""
+
+    file_name: Final[str] = ".tidy-toc-manifest.json"
+    # entries recorded since the last save before checkpoint saves them
+    save_every: int = 16
+
+    def __init__(self, dir_out: Path | str) -> None:
+        self.path: Path = Path(dir_out) / self.file_name
+        self.entries: dict[str, dict[str, str]] = self._load()
+        self.unsaved: int = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _load(self) -> dict[str, dict[str, str]]:
+        if not self.path.is_file():
+            return {}
+        # a broken manifest only costs tidying every file again
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def save(self) -> Path:
+        """write the entries to a temporary file and replace the manifest with it, so that a crash never leaves a half written one."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp = tempfile.mkstemp(prefix=self.file_name, suffix=".tmp", dir=self.path.parent)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, ensure_ascii=False, indent=1, sort_keys=True)
+            os.replace(temp, self.path)
+        except BaseException:
+            os.unlink(temp)
+            raise
+        self.unsaved = 0
+        return self.path
+
+    def checkpoint(self) -> None:
+        """save if save_every entries are recorded since the last save. the rest is left to the last save of the run."""
+        if self.unsaved >= self.save_every:
+            self.save()
+
+    @staticmethod
+    def get_key(file: Path, options: dict) -> str:
+        """hash of the content of file, the options and the version. options are anything json can dump with str as the fallback."""
+        payload: str = json.dumps([get_file_hash(file), options, VERSION], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_entry(self, file: Path) -> Optional[dict[str, str]]:
+        return self.entries.get(file.name)
+
+    def is_fresh(self, file: Path, options: dict) -> bool:
+        """true if file was tidied with the same options by this version since it last changed, and the output is untouched."""
+        if (entry := self.get_entry(file)) is None or entry["key"] != self.get_key(file, options):
+            return False
+        output: Path = self.path.parent / entry["output"]
+        return output.is_file() and get_file_hash(output) == entry["output_hash"]
+
+    def record(self, file: Path, saved_file: Path, options: dict) -> None:
+        self.entries[file.name] = {
+            "key": self.get_key(file, options),
+            "output": saved_file.name,
+            "output_hash": get_file_hash(saved_file),
+        }
+        self.unsaved += 1
+
+    def get_stale(self, files: list[Path]) -> list[str]:
+        """names of the outputs whose input is no longer among files. they are left as they are."""
+        names: set[str] = {file.name for file in files}
+        return sorted(entry["output"] for name, entry in self.entries.items() if name not in names)
@@ -1,15 +1,18 @@
 from __future__ import annotations
 
+import contextlib
+import dataclasses
 import re
 from dataclasses import dataclass
 from enum import Enum, IntEnum, auto
 from re import Pattern
-from typing import Iterable, Optional
+from typing import Callable, ClassVar, Iterable, Iterator, Optional
 
 import click
 from rich import print
 from typing_extensions import Self
 
+from Decision import Decider, Query
 from Text_Lines import Texts_Printer
 
 
@@ -42,6 +45,43 @@ class Choice:
 class Mediator:
     _pat_digit: Pattern = re.compile("^[+-]?\\d+$")
     _pat_plus: Pattern = re.compile("^[+]\\d+$")
+    # deciders shared by every stage. the first one that answers wins.
+    deciders: ClassVar[list[Decider]] = []
+
+    @classmethod
+    @contextlib.contextmanager
+    def use_deciders(cls, deciders: list[Decider]) -> Iterator[list[Decider]]:
+        """let deciders answer while the context lasts. the deciders before are back at exit, however it exits."""
+        previous: list[Decider] = cls.deciders
+        cls.deciders = deciders
+        try:
+            yield deciders
+        finally:
+            cls.deciders = previous
+
+    @classmethod
+    def consult(cls, query: Query, is_valid: Optional[Callable[[str], bool]] = None) -> Optional[str]:
+        """get the answer of the first decider that can answer query. None if nobody can.
+        if is_valid is given, an answer failing it is passed over to the next decider."""
+        for decider in cls.deciders:
+            if (answer := decider.decide(query)) is not None and (is_valid is None or is_valid(answer)):
+                return answer
+        return None
+
+    @classmethod
+    def propose(cls, query: Query, is_valid: Optional[Callable[[str], bool]] = None) -> Optional[tuple[str, float]]:
+        """get the first suggestion of deciders with its confidence. suggestions failing is_valid are passed over."""
+        for decider in cls.deciders:
+            suggested: Optional[tuple[str, float]] = decider.suggest(query)
+            if suggested is not None and (is_valid is None or is_valid(suggested[0])):
+                return suggested
+        return None
+
+    @classmethod
+    def notify(cls, query: Query, answer: str) -> None:
+        """let every decider know the answer finally accepted."""
+        for decider in cls.deciders:
+            decider.observe(query, answer)
 
     class Integer_Flag(IntEnum):
         """record if integer is provided with '+' sign."""
@@ -72,9 +112,10 @@ class Mediator:
         int_max = self._max_page if int_max is None else int_max
         return int_min <= value <= int_max
 
-    def _convert_input(self, inp: str) -> tuple[Optional[int | str], Integer_Flag]:
+    def _convert_input(self, inp: str, quiet: bool = False) -> tuple[Optional[int | str], Integer_Flag]:
         """try to convert input into some assumed type.
         None is the signature of failure, in which case input should be asked for user again.
+        the failure is told to user unless quiet is true.
         """
         # inp = inp.lower() if isinstance(inp, str) else inp
         flag_default = self.Integer_Flag.Normal
@@ -82,7 +123,7 @@ class Mediator:
             return int(inp), self.Integer_Flag.get_flag(inp)
         elif inp in self._public_options:
             return inp, flag_default
-        else:
+        elif not quiet:
             print(f"invalid string. use {self._public_options}.")
         # otherwise
         return None, flag_default
@@ -113,14 +154,64 @@ class Mediator:
                 return Choice(option=option, number=0)
         raise ValueError(f"Unknown option. {user_input}")
 
+    def interpret_raw(self, raw_input: str) -> Optional[Choice]:
+        """convert input typed as text, such as '+12' or 'p', into choice object. None if it is not a valid input."""
+        user_input, flag = self._convert_input(raw_input)
+        return None if user_input is None else self.interpret(user_input=user_input, flag=flag)
+
+    def _test_input(
+        self, inp: Optional[int | str], domain: Optional[Iterable[int]] = None, quiet: bool = False
+    ) -> bool:
+        if inp is None:
+            return False
+        if isinstance(inp, int):
+            if domain is not None and inp not in (d := list(domain)):
+                if not quiet:
+                    print(f"input integer x must be in {d}.")
+                return False
+            if not self._test_range(value=inp):
+                if not quiet:
+                    print(f"input integer x must be {-self._max_page}<=x<={self._max_page}.")
+                return False
+        return True
+
+    def _test_answer(self, answer: str, domain: Optional[Iterable[int]] = None) -> bool:
+        """test an answer of deciders. unlike what user typed, an invalid one is passed over silently."""
+        return self._test_input(self._convert_input(answer, quiet=True)[0], domain, quiet=True)
+
+    def _get_skip(self) -> str:
+        """get the option that leaves the row as it is. empty if there is no such option."""
+        for option in [Option.Pass, Option.Exit]:
+            if option.value in self._public_options:
+                return option.value
+        return ""
+
+    def _to_raw_input(self, inp: int | str, flag: Mediator.Integer_Flag) -> str:
+        """get back the string user would type for the converted input."""
+        return f"+{inp}" if flag == self.Integer_Flag.Plus else str(inp)
+
     def get_user_input(
         self,
         msg: Optional[str] = None,
         default_value: int | str = Option.Pass.value,
         domain: Optional[Iterable[int]] = None,
         show_msg: bool = True,
+        query: Optional[Query] = None,
     ) -> tuple[int | str, Mediator.Integer_Flag]:
-        """ask user to enter some input that represents her choice."""
+        """ask user to enter some input that represents her choice.
+        if query is given, deciders are consulted first, and user is asked only if none of them gives a valid answer."""
+        if query is not None:
+            query = dataclasses.replace(query, default=str(default_value), skip=query.skip or self._get_skip())
+            answer = self.consult(query, is_valid=lambda a: self._test_answer(a, domain))
+            if answer is not None:
+                decided, decided_flag = self._convert_input(answer, quiet=True)
+                if decided is not None:
+                    print(f"decided: {answer}")
+                    return decided, decided_flag
+            suggested = self.propose(query, is_valid=lambda a: self._test_answer(a, domain))
+            if suggested is not None:
+                default_value = suggested[0]
+                print(f"suggested: {suggested[0]} ({suggested[1]:.0%})")
         msg = "enter action. default =" if msg is None else msg
         msg = msg if show_msg else ""
         while True:
@@ -128,13 +219,8 @@ class Mediator:
                 text=msg, type=str | int, value_proc=self._convert_input, default=default_value
             )
             inp, flag = ret
-            if inp is None:
+            if inp is None or not self._test_input(inp, domain):
                 continue
-            if isinstance(inp, int):
-                if domain is not None and inp not in (d := list(domain)):
-                    print(f"input integer x must be in {d}.")
-                    continue
-                if not self._test_range(value=inp):
-                    print(f"input integer x must be {-self._max_page}<=x<={self._max_page}.")
-                    continue
+            if query is not None:
+                self.notify(query, self._to_raw_input(inp, flag))
             return inp, flag
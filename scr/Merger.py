@@ -1,21 +1,52 @@
-from typing import Callable, Iterator
+import dataclasses
+from typing import Callable, Final, Iterator, Optional, TypeVar
 
 import click
+import regex
+from regex import Pattern
+from rich import print
 
+from Decision import Query
+from Filtering_Prompt import Prompt
+from Mediator import Mediator
 from Text_Line import Paged_Text_Line
 from Text_Lines import Paged_Text_Lines, Texts_Printer
 
+R = TypeVar("R")
+
+
+@dataclasses.dataclass
+class Pair_Features:
+    """cheap features of a pair of neighboring rows that tell how likely the second continues the first."""
+
+    first_header: Paged_Text_Line.Header
+    second_header: Paged_Text_Line.Header
+    trailing_hyphen: bool
+    lowercase_continuation: bool
+    first_length: int
+    second_page_only: bool
+
 
 class Merger:
-    def __init__(self, ptls: Paged_Text_Lines) -> None:
+    pat_trailing_hyphen: Final[Pattern] = regex.compile("[a-zA-Z][-\u2010\u00ad]$")
+    pat_lowercase_head: Final[Pattern] = regex.compile("^[a-z]")
+
+    def __init__(
+        self,
+        ptls: Paged_Text_Lines,
+        threshold_merge: Optional[float] = None,
+        threshold_skip: Optional[float] = None,
+        length_full: int = 60,
+        page_size: Optional[int] = None,
+    ) -> None:
+        """pairs scoring at least threshold_merge are merged and those scoring below threshold_skip are skipped without asking. None disables each.
+        if page_size is given, pairs are asked page_size at once instead of one by one."""
         self.lines: Paged_Text_Lines = ptls
         self._printer = Texts_Printer()
-
-    def _merge(self, first: Paged_Text_Line, second: Paged_Text_Line) -> Paged_Text_Line:
-        """get the merged paged text line. both texts are combined, the page number is taken from the second, and the other properties are inherited from the first."""
-        return Paged_Text_Line(
-            idx=first.idx, text=" ".join([first.text, second.text]), sep=first.sep, page_number=second.page_number
-        )
+        self.threshold_merge: float = float("inf") if threshold_merge is None else threshold_merge
+        self.threshold_skip: float = float("-inf") if threshold_skip is None else threshold_skip
+        self.length_full: int = length_full
+        self.page_size: Optional[int] = page_size
 
     def _ask_whether_merge(self, idx_first: int) -> bool:
         """show candidates lines and ask user if they should be merged."""
@@ -23,9 +54,37 @@ class Merger:
         self._printer.print(
             self.lines, start=idx_pos, end=idx_pos + 1, with_page_idx=False, with_def=False, with_N=False
         )
-        return click.prompt(text="merge these rows?", type=bool, default="yes")
+        query = Query(
+            stage=self.__class__.__name__,
+            text=self.lines[idx_pos].to_text(),
+            candidates=tuple(line.to_text() for line in self.lines[idx_pos + 1 : idx_pos + 2]),
+            default="yes",
+            skip="no",
+        )
+        if (answer := Mediator.consult(query, is_valid=lambda a: a in ["yes", "no"])) is not None:
+            print(f"decided: {answer}")
+            return answer == "yes"
+        default: str = "yes"
+        if (suggested := Mediator.propose(query, is_valid=lambda a: a in ["yes", "no"])) is not None:
+            default = suggested[0]
+            print(f"suggested: {suggested[0]} ({suggested[1]:.0%})")
+        merge: bool = click.prompt(text="merge these rows?", type=bool, default=default)
+        Mediator.notify(query, "yes" if merge else "no")
+        return merge
 
-    def _map_between(self, fn: Callable[[Paged_Text_Line, Paged_Text_Line], int]) -> Iterator[int]:
+    def _ask_page(self, positions: list[int], n_th: int, total: int) -> list[int]:
+        """show the pairs starting at the given positions on a single screen and ask which of them should be merged.
+        return the positions accepted."""
+        assert self.page_size is not None
+        texts: list[str] = [f"{self.lines[i].to_text()}  +  {self.lines[i + 1].to_text()}" for i in positions]
+        chosen, _ = Prompt().ask_page(
+            stage=self.__class__.__name__,
+            texts=texts,
+            msg=f"({n_th}/{total}): Enter N to merge (n/-n/m-n/a[ll]/n[one]/[h]elp)",
+        )
+        return [positions[k] for k in chosen]
+
+    def _map_between(self, fn: Callable[[Paged_Text_Line, Paged_Text_Line], R]) -> Iterator[R]:
         """process each pair of two neighboring elements"""
         itr = iter(self.lines)
         nxt = itr.__next__()
@@ -40,7 +99,7 @@ class Merger:
             and (
                 second.is_page_number_only()
                 or (
-                    second.header != first.Header.DIGIT
+                    second.header not in [first.Header.DIGIT, first.Header.JA]
                     and first.header != first.Header.NO
                     and not (second.header == first.header and first.header == first.Header.ALPHABET)
                 )
@@ -57,14 +116,120 @@ class Merger:
         idx: list[int] = [i for i in self._map_between(tester) if i != -1]
         return self.lines.select(idx)
 
+    def get_pair_features(self, first: Paged_Text_Line, second: Paged_Text_Line) -> Pair_Features:
+        return Pair_Features(
+            first_header=first.header,
+            second_header=second.header,
+            trailing_hyphen=regex.search(self.pat_trailing_hyphen, first.text) is not None,
+            lowercase_continuation=regex.search(self.pat_lowercase_head, second.text) is not None,
+            first_length=len(first.text),
+            second_page_only=second.is_page_number_only(),
+        )
+
+    def get_features(self) -> list[Pair_Features]:
+        """get features of every pair of neighboring rows in a single pass."""
+        if len(self.lines) == 0:
+            return []
+        return list(self._map_between(self.get_pair_features))
+
+    def score(self, features: Pair_Features) -> float:
+        """score how likely a pair should be merged. the higher, the more likely."""
+        H = Paged_Text_Line.Header
+        score: float = 0.0
+        if features.second_page_only:
+            score += 3.0
+        if features.trailing_hyphen:
+            score += 2.0
+        if features.lowercase_continuation:
+            score += 1.5
+        if features.first_header in [H.DIGIT, H.ALPHABET, H.JA]:
+            score += 0.5
+        if features.second_header == H.ALPHABET:
+            score -= 1.0
+        # a row as long as a full line in the original page is likely to be wrapped
+        score += min(features.first_length / self.length_full, 1.0)
+        return score
+
+    def _decide_whether_merge(self, score: float) -> Optional[bool]:
+        """decide a pair by its score. None means the score is uncertain and user should be asked."""
+        if score >= self.threshold_merge:
+            return True
+        if score < self.threshold_skip:
+            return False
+        return None
+
+    def get_links(self) -> list[bool]:
+        """test every pair of neighboring rows in a single pass. the i-th flag tells whether the i-th row might be continued by the (i+1)-th."""
+        if len(self.lines) == 0:
+            return []
+        return [i != -1 for i in self._map_between(self.test_pair)]
+
+    def get_chains(self, links: list[bool]) -> list[tuple[int, int]]:
+        """get maximal runs of linked rows as pairs of positional index (first, last), both inclusive.
+        a title that OCR split across three rows results in a chain of length three."""
+        chains: list[tuple[int, int]] = []
+        first: int = 0
+        for i, linked in enumerate(links):
+            if not linked:
+                if first < i:
+                    chains.append((first, i))
+                first = i + 1
+        if first < len(links):
+            chains.append((first, len(links)))
+        return chains
+
+    def _merge_chain(self, chain: list[Paged_Text_Line]) -> Paged_Text_Line:
+        """get the line into which all the rows in chain are merged. already parsed page data are reused."""
+        return chain[0].get_merged(chain[1:])
+
+    def apply_links(self, links: list[bool]) -> Paged_Text_Lines:
+        """merge every accepted chain of rows and rebuild lines at once.
+        links[i] tells whether the i-th row should be merged with the (i+1)-th."""
+        if len(self.lines) == 0:
+            return self.lines
+        if len(links) != len(self.lines) - 1:
+            raise ValueError(f"links of length {len(links)} do not fit lines of length {len(self.lines)}.")
+        if not any(links):
+            return self.lines
+        merged: list[Paged_Text_Line] = []
+        chain: list[Paged_Text_Line] = [self.lines[0]]
+        for line, linked in zip(self.lines.lines[1:], links):
+            if linked:
+                chain.append(line)
+                continue
+            merged.append(self._merge_chain(chain))
+            chain = [line]
+        merged.append(self._merge_chain(chain))
+        return Paged_Text_Lines(merged)
+
     def get_merged_lines(self) -> Paged_Text_Lines:
-        """interactively merge two neighboring lines with page number is missing at the first line and not at the second.
+        """interactively merge neighboring lines with page number is missing at the first lines and not at the last.
+        every candidate pair is asked once, and chains of accepted pairs are merged into a single row.
         return the new page text lines output by this process."""
-        merged: list[Paged_Text_Line] = []
-        idx_to_delete: list[int] = []
-        for line in self.get_candidates():
-            if self._ask_whether_merge(line.idx):
-                line_second: Paged_Text_Line = self.lines.get_line_next_to(line, 1)
-                merged.append(self._merge(line, line_second))
-                idx_to_delete.append(line_second.idx)
-        return self.lines.exclude(idx_to_delete).overwrite(Paged_Text_Lines(merged))
+        links: list[bool] = self.get_links()
+        scores: list[float] = [self.score(f) for f in self.get_features()]
+        accepted: list[bool] = [False] * len(links)
+        # positions of pairs left to be asked page by page
+        undecided: list[int] = []
+        n_auto: int = 0
+        for first, last in self.get_chains(links):
+            for i in range(first, last):
+                idx: int = self.lines[i].idx
+                decided: Optional[bool] = self._decide_whether_merge(scores[i])
+                if decided is not None:
+                    accepted[i] = decided
+                    n_auto += 1
+                elif self.page_size is None:
+                    accepted[i] = self._ask_whether_merge(idx)
+                else:
+                    undecided.append(i)
+        if n_auto > 0:
+            print(f"{n_auto} pairs decided by score.")
+        if self.page_size is not None:
+            pages: list[list[int]] = [
+                undecided[k : k + self.page_size] for k in range(0, len(undecided), self.page_size)
+            ]
+            for n_th, page in enumerate(pages):
+                for i in self._ask_page(page, n_th=n_th + 1, total=len(pages)):
+                    accepted[i] = True
+        return self.apply_links(accepted)
@@ -1,33 +1,77 @@
 from __future__ import annotations
 
 import re
+from enum import Enum
 from re import Pattern
-from typing import Callable
+from typing import Callable, Iterator, Optional
 
-from Mediator import Mediator, Option
+from Decision import Query
+from Filtering_Prompt import Prompt
+from Mediator import Choice, Mediator, Option
 from Text_Line import Paged_Text_Line
 from Text_Lines import Paged_Text_Lines, Texts_Printer
 
 
+class Fill_Policy(Enum):
+    """how to fill a row of missing page number from the nearest numbered rows before and after it."""
+
+    Next = "next"
+    Previous = "previous"
+    Between = "between"
+
+
 class Suggester:
-    def __init__(self, lines_ref: Paged_Text_Lines, default_value: str = Option.Pass.value) -> None:
+    def __init__(self, lines_ref: Paged_Text_Lines, default_value: str = Option.Pass.value, radius: int = 1) -> None:
         self._lines_ref: Paged_Text_Lines = lines_ref
         self.default_value: str = default_value
+        self.radius: int = radius
+        # positional index of each row, and of the nearest arabic-numbered row at or before/after each position
+        self._positions: dict[int, int] = {line.idx: i for i, line in enumerate(lines_ref)}
+        self._numbered_before: list[int] = self._fill_numbered_positions(range(len(lines_ref)))
+        self._numbered_after: list[int] = self._fill_numbered_positions(range(len(lines_ref) - 1, -1, -1))
+
+    def _fill_numbered_positions(self, order: range) -> list[int]:
+        """scan lines_ref in the given order and record, at each position, the latest position having arabic page number. -1 if none."""
+        filled: list[int] = [-1] * len(self._lines_ref)
+        latest: int = -1
+        for i in order:
+            if self._lines_ref[i].page_number is not None:
+                latest = i
+            filled[i] = latest
+        return filled
+
+    def _get_page_at(self, pos: int) -> Optional[int]:
+        return None if pos == -1 else self._lines_ref[pos].page_number
 
     def suggest(self, line: Paged_Text_Line) -> str:
-        """suggest default page-number for the given line"""
-        arounds: Paged_Text_Lines = self._lines_ref.get_rows_around(line=line, radius=1)
-        if len(arounds) == 0:
+        """suggest default page-number for the given line, taken from the nearest numbered row within radius"""
+        pos: Optional[int] = self._positions.get(line.idx)
+        if pos is None:
             return self.default_value
+        # prioritize the successor row here just for my preference
+        after: int = self._numbered_after[pos + 1] if pos + 1 < len(self._numbered_after) else -1
+        if after != -1 and after - pos <= self.radius and (page := self._get_page_at(after)) is not None:
+            return str(page)
+        before: int = self._numbered_before[pos - 1] if pos > 0 else -1
+        if before != -1 and pos - before <= self.radius and (page := self._get_page_at(before)) is not None:
+            return str(page)
+        return self.default_value
 
-        # set default value
-        default_value: str = self.default_value
-        for around in reversed(arounds):
-            # prioritize the successor row here just for my preference
-            if around.page_number is not None:
-                default_value = str(around.page_number)
-                break
-        return default_value
+    def get_pages_around(self, line: Paged_Text_Line) -> tuple[Optional[int], Optional[int]]:
+        """get the page numbers of the nearest numbered rows before and after the given line, regardless of radius."""
+        pos: Optional[int] = self._positions.get(line.idx)
+        if pos is None:
+            return None, None
+        before: int = self._numbered_before[pos - 1] if pos > 0 else -1
+        after: int = self._numbered_after[pos + 1] if pos + 1 < len(self._numbered_after) else -1
+        return self._get_page_at(before), self._get_page_at(after)
+
+    def get_query(self, stage: str, line: Paged_Text_Line, n_around: int = 1) -> Query:
+        """get query about the given line, whose candidates are the texts of the rows shown around it."""
+        pos: Optional[int] = self._positions.get(line.idx)
+        around: list[int] = [] if pos is None else [pos + i for i in range(-n_around, n_around + 1) if i != 0]
+        texts: tuple[str, ...] = tuple(self._lines_ref[p].to_text() for p in around if 0 <= p < len(self._lines_ref))
+        return Query(stage=stage, text=line.to_text(), candidates=texts)
 
     def get_processed_suggestion(
         self,
@@ -44,39 +88,91 @@ class Fill:
         self,
         lines_blank_page_number: Paged_Text_Lines,
         lines_ref: Paged_Text_Lines,
+        radius: int = 1,
+        policy: Optional[Fill_Policy] = None,
+        page_size: Optional[int] = None,
     ) -> None:
+        """if policy is given, rows are filled automatically by the policy, and only the rows whose neighbors disagree are asked.
+        if page_size is given, rows are asked page_size at once instead of one by one."""
         self._lines: Paged_Text_Lines = lines_blank_page_number
         self._lines_ref: Paged_Text_Lines = lines_ref
+        self.policy: Optional[Fill_Policy] = policy
+        self.page_size: Optional[int] = page_size
         self.mediator: Mediator = Mediator(
             public_options=[Option.Pass.value, Option.Remove.value], private_options=[Option.Digit.value]
         )
-        self.suggest: Suggester = Suggester(lines_ref=lines_ref, default_value=Option.Pass.value)
+        self.suggest: Suggester = Suggester(lines_ref=lines_ref, default_value=Option.Pass.value, radius=radius)
         self.printer = Texts_Printer()
 
+    def _interpolate(self, before: Optional[int], after: Optional[int], policy: Fill_Policy) -> Optional[int]:
+        """get the page number that keeps pages monotone under the policy. None if the neighbors disagree."""
+        if before is not None and after is not None and before > after:
+            return None
+        match policy:
+            case Fill_Policy.Next:
+                return after
+            case Fill_Policy.Previous:
+                return before
+            case Fill_Policy.Between:
+                return after if before == after else None
+            case _:
+                raise ValueError(f"unknown policy {policy}.")
+
+    def interpolate(self, policy: Fill_Policy) -> tuple[list[Paged_Text_Line], list[Paged_Text_Line]]:
+        """fill page number of every row in a single pass by the policy. return the filled rows and the rows left undecided."""
+        filled: list[Paged_Text_Line] = []
+        undecided: list[Paged_Text_Line] = []
+        for line in self._lines:
+            page: Optional[int] = self._interpolate(*self.suggest.get_pages_around(line), policy=policy)
+            if page is None:
+                undecided.append(line)
+                continue
+            line.page_number = page
+            filled.append(line)
+        return filled, undecided
+
     def get_filled_lines(self) -> Paged_Text_Lines:
         """interactively ask user to fill numbers in rows of missing page number. return the filled lines object."""
         new_lines: list[Paged_Text_Line] = []
         delete_idx: list[int] = []
-        if len(self._lines) > 0:
+        rows: list[Paged_Text_Line] = list(self._lines)
+        if self.policy is not None:
+            new_lines, rows = self.interpolate(self.policy)
+            print(f"{len(new_lines)} rows filled by {self.policy.value} page. {len(rows)} rows left.")
+        if self.page_size is not None:
+            for line, choice in ask_pages(self, rows, suggest=self.suggest.suggest, allow_append=False):
+                self._apply(line, choice, new_lines, delete_idx)
+            return rebuild(self._lines_ref, new_lines, delete_idx)
+        if len(rows) > 0:
             self.mediator.explain()
-        for i, line in enumerate(self._lines):
+        for i, line in enumerate(rows):
             self.printer.print_around(self._lines_ref, row=line.idx, N_around=1)
-            user_input, flag = self.mediator.get_user_input(show_msg=(i == 0), default_value=self.suggest.suggest(line))
+            user_input, flag = self.mediator.get_user_input(
+                show_msg=(i == 0),
+                default_value=self.suggest.suggest(line),
+                query=self.suggest.get_query(self.__class__.__name__, line),
+            )
             choice = self.mediator.interpret(user_input=user_input, flag=flag)
             # if suggest is chosen, ask user to re-input
             # if choice.option == Option.Suggest:
             #     choice = self.suggest.suggest(line)
-            match choice.option:
-                case Option.Pass:
-                    continue
-                case Option.Digit:
-                    line.page_number = choice.number
-                    new_lines.append(line)
-                case Option.Remove:
-                    delete_idx.append(line.idx)
-                case _:
-                    raise Exception(f"unknown choice type {choice.option}.")
-        return self._lines_ref.exclude(delete_idx).overwrite(new_lines)
+            self._apply(line, choice, new_lines, delete_idx)
+        return rebuild(self._lines_ref, new_lines, delete_idx)
+
+    def _apply(
+        self, line: Paged_Text_Line, choice: Choice, new_lines: list[Paged_Text_Line], delete_idx: list[int]
+    ) -> None:
+        """apply choice to line, collecting the rows to overwrite and to delete."""
+        match choice.option:
+            case Option.Pass:
+                return
+            case Option.Digit:
+                line.page_number = choice.number
+                new_lines.append(line)
+            case Option.Remove:
+                delete_idx.append(line.idx)
+            case _:
+                raise Exception(f"unknown choice type {choice.option}.")
 
 
 class Correct:
@@ -86,15 +182,19 @@ class Correct:
         lines_ref: Paged_Text_Lines,
         ignore: list[int] = [],
         append_key: list[str] = ["chapter", "part", "section"],
+        radius: int = 1,
+        page_size: Optional[int] = None,
     ) -> None:
+        """if page_size is given, rows are asked page_size at once instead of one by one."""
         self._lines: Paged_Text_Lines = lines_strange_page_number
         self._lines_ref: Paged_Text_Lines = lines_ref
         self._ignore: list[int] = ignore
+        self.page_size: Optional[int] = page_size
         self.mediator: Mediator = Mediator(
             public_options=[Option.Pass.value, Option.Remove.value],
             private_options=[Option.Digit.value, Option.Append.value],
         )
-        self.suggest: Suggester = Suggester(lines_ref=lines_ref)
+        self.suggest: Suggester = Suggester(lines_ref=lines_ref, radius=radius)
         self.printer = Texts_Printer()
         self.pat_append: Pattern = re.compile("|".join([f"({key})" for key in append_key]))
 
@@ -110,25 +210,72 @@ class Correct:
         """interactively ask user to fill numbers in rows of missing page number. return the filled lines object."""
         new_lines: list[Paged_Text_Line] = []
         delete_idx: list[int] = []
+        if self.page_size is not None:
+            for line, choice in ask_pages(self, list(self._lines), suggest=self.get_suggestion, allow_append=True):
+                self._apply(line, choice, new_lines, delete_idx)
+            return rebuild(self._lines_ref, new_lines, delete_idx)
         if len(self._lines) > 0:
             self.mediator.explain()
         for i, line in enumerate(self._lines):
             self.printer.print_around(self._lines_ref, row=line.idx, N_around=1)
-            user_input, flag = self.mediator.get_user_input(show_msg=(i == 0), default_value=self.get_suggestion(line))
+            user_input, flag = self.mediator.get_user_input(
+                show_msg=(i == 0),
+                default_value=self.get_suggestion(line),
+                query=self.suggest.get_query(self.__class__.__name__, line),
+            )
             choice = self.mediator.interpret(user_input=user_input, flag=flag)
-            match choice.option:
-                case Option.Pass:
-                    continue
-                case Option.Digit:
-                    line.page_number = choice.number
-                    new_lines.append(line)
-                case Option.Append:
-                    text: str = line.to_text()
-                    line.page_number = choice.number
-                    line.text = text
-                    new_lines.append(line)
-                case Option.Remove:
-                    delete_idx.append(line.idx)
-                case _:
-                    raise Exception(f"unknown choice type {choice.option}.")
-        return self._lines_ref.exclude(delete_idx).overwrite(new_lines)
+            self._apply(line, choice, new_lines, delete_idx)
+        return rebuild(self._lines_ref, new_lines, delete_idx)
+
+    def _apply(
+        self, line: Paged_Text_Line, choice: Choice, new_lines: list[Paged_Text_Line], delete_idx: list[int]
+    ) -> None:
+        """apply choice to line, collecting the rows to overwrite and to delete."""
+        match choice.option:
+            case Option.Pass:
+                return
+            case Option.Digit:
+                line.page_number = choice.number
+                new_lines.append(line)
+            case Option.Append:
+                text: str = line.to_text()
+                line.page_number = choice.number
+                line.text = text
+                new_lines.append(line)
+            case Option.Remove:
+                delete_idx.append(line.idx)
+            case _:
+                raise Exception(f"unknown choice type {choice.option}.")
+
+
+def ask_pages(
+    asker: Fill | Correct,
+    rows: list[Paged_Text_Line],
+    suggest: Callable[[Paged_Text_Line], str],
+    allow_append: bool,
+) -> Iterator[tuple[Paged_Text_Line, Choice]]:
+    """ask rows page_size of asker at once with their suggestions, and yield the choices made for them.
+    chosen rows take their suggestion, and 'N=M' sets page M to row N. 'N=+M' appends M to the text if allow_append, and is taken as M otherwise."""
+    assert asker.page_size is not None
+    pages: list[list[Paged_Text_Line]] = [rows[k : k + asker.page_size] for k in range(0, len(rows), asker.page_size)]
+    msg_assign: str = "N=M/N=+M" if allow_append else "N=M"
+    for n_th, page in enumerate(pages):
+        suggestions: list[str] = [suggest(line) for line in page]
+        chosen, assignments = Prompt().ask_page(
+            stage=asker.__class__.__name__,
+            texts=[f"{line.to_text()}  ->  {suggested}" for line, suggested in zip(page, suggestions)],
+            msg=f"({n_th + 1}/{len(pages)}): Enter N to take the suggestion (n/-n/m-n/{msg_assign}/a[ll]/n[one]/[h]elp)",
+            allow_assign=True,
+        )
+        answers: dict[int, str] = {k: suggestions[k] for k in chosen}
+        answers.update(assignments if allow_append else {k: v.lstrip("+") for k, v in assignments.items()})
+        for k, answer in sorted(answers.items()):
+            if (choice := asker.mediator.interpret_raw(answer)) is not None:
+                yield page[k], choice
+
+
+def rebuild(lines_ref: Paged_Text_Lines, new_lines: list[Paged_Text_Line], delete_idx: list[int]) -> Paged_Text_Lines:
+    """overwrite new_lines to lines_ref and delete the rows of delete_idx. lines_ref itself is returned if there is nothing to do."""
+    if len(new_lines) == 0 and len(delete_idx) == 0:
+        return lines_ref
+    return lines_ref.exclude(delete_idx).overwrite(new_lines)
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import dataclasses
+import heapq
+
+from Word_Dictionary import Word_Dictionary, dictionary
+
+
+@dataclasses.dataclass(order=True, frozen=True)
+class Segmentation:
+    """words into which a glued token is split, with the log probability of the split."""
+
+    score: float
+    words: tuple[str, ...]
+
+    def to_text(self, sep: str = " ") -> str:
+        return sep.join(self.words)
+
+
+class Word_Segmenter:
+    """split a glued token like 'LinearAlgebra' into words by dynamic programming over unigram word frequencies.
+    a lower character followed by an Upper one is a strong hint of word boundary, so splitting elsewhere or not splitting there costs boundary_weight.
+    segmentations are memoized per token, so repeated tokens across a document are computed only once."""
+
+    def __init__(
+        self,
+        word_dictionary: Word_Dictionary = dictionary,
+        max_word: int = 20,
+        top_k: int = 3,
+        boundary_weight: float = 10.0,
+    ) -> None:
+        if max_word <= 0 or top_k <= 0:
+            raise ValueError(f"max_word and top_k must be positive integers. max_word={max_word}, top_k={top_k}.")
+        self.dictionary: Word_Dictionary = word_dictionary
+        self.max_word: int = max_word
+        self.top_k: int = top_k
+        self.boundary_weight: float = boundary_weight
+        self._cache: dict[str, list[Segmentation]] = {}
+
+    def _get_boundary_counts(self, token: str) -> list[int]:
+        """get cumulative counts of lower-to-Upper boundaries. the i-th element counts those at positions < i."""
+        counts: list[int] = [0]
+        for i in range(len(token)):
+            is_boundary: bool = i > 0 and token[i - 1].islower() and token[i].isupper()
+            counts.append(counts[-1] + int(is_boundary))
+        return counts
+
+    def _score_word(self, token: str, start: int, end: int, counts: list[int]) -> float:
+        """log probability of token[start:end] being a word, with costs of ignoring case boundaries."""
+        log_p: float = self.dictionary.get_log_probability(token[start:end])
+        if counts[-1] == 0:
+            # no hint from case. e.g., 'theoryofgames'
+            return log_p
+        # boundaries strictly inside the word are left unsplit
+        n_ignored: int = counts[end] - counts[start + 1]
+        split_at_boundary: bool = start == 0 or counts[start + 1] - counts[start] == 1
+        n_ignored += 0 if split_at_boundary else 1
+        return log_p - self.boundary_weight * n_ignored
+
+    def segment(self, token: str) -> list[Segmentation]:
+        """get at most top_k most likely segmentations of token, the best first. it runs in O(len(token) * max_word * top_k)."""
+        if token in self._cache:
+            return self._cache[token]
+        # best[i] holds the top_k segmentations of token[:i]
+        best: list[list[Segmentation]] = [[Segmentation(score=0.0, words=())]]
+        counts: list[int] = self._get_boundary_counts(token)
+        for end in range(1, len(token) + 1):
+            extended: list[Segmentation] = []
+            for start in range(max(0, end - self.max_word), end):
+                log_p: float = self._score_word(token, start, end, counts)
+                extended.extend(
+                    Segmentation(score=s.score + log_p, words=s.words + (token[start:end],)) for s in best[start]
+                )
+            best.append(heapq.nlargest(self.top_k, extended))
+        self._cache[token] = best[-1] if token != "" else []
+        return self._cache[token]
+
+    def clear(self) -> None:
+        self._cache.clear()
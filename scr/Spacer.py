@@ -1,15 +1,30 @@
 import dataclasses
+import heapq
 import itertools
-from typing import Callable, Optional
+from typing import Callable, Final, Iterator, Optional
 
 import regex
 from regex import Match, Pattern
 from typing_extensions import Self
 
+from Char_Class import Char_Class, Char_Run
 from Choose_from_Integers import Choose_from_Integers
+from Decision import Query
 from Mediator import Candidate, Choice, Mediator, Option
+from Segmenter import Word_Segmenter
 from Text_Line import Paged_Text_Line
 from Text_Lines import Paged_Text_Lines
+from Word_Dictionary import Word_Dictionary, dictionary
+
+
+def iter_subsets_by_score(positions: list[int], scores: list[float]) -> Iterator[list[int]]:
+    """lazily yield non-empty subsets of positions, starting from the whole set and then dropping the lowest scored positions first.
+    each subset is sorted in the increasing order of position."""
+    order: list[int] = sorted(range(len(positions)), key=lambda i: scores[i])
+    for r in range(len(positions)):
+        for dropped in itertools.combinations(order, r):
+            drop: set[int] = set(dropped)
+            yield [p for i, p in enumerate(positions) if i not in drop]
 
 
 class Insert_Space(Choose_from_Integers):
@@ -18,9 +33,16 @@ class Insert_Space(Choose_from_Integers):
         lines: Paged_Text_Lines,
         options_max: int = 100,
         pat_need_space: Pattern = regex.compile("(?<=[a-z])[A-Z]"),
+        candidates_max: int = 10,
+        word_dictionary: Word_Dictionary = dictionary,
+        segmenter: Optional[Word_Segmenter] = None,
     ) -> None:
+        """if segmenter is given, candidates are the most likely segmentations of glued words instead of the combinations of positions to insert space."""
         self.lines: Paged_Text_Lines = lines
         self.pat_need_space: Pattern = pat_need_space
+        self.candidates_max: int = min(candidates_max, options_max)
+        self.dictionary: Word_Dictionary = word_dictionary
+        self.segmenter: Optional[Word_Segmenter] = segmenter
         self.mediator = Mediator(
             public_options=[Option.Pass.value, Option.Remove.value],
             private_options=[Option.Digit.value],
@@ -35,20 +57,60 @@ class Insert_Space(Choose_from_Integers):
         """find rows having strings in which a lower character is followed by an Upper character. e.g., ProbabilityTheory"""
         return [p for p in self.lines if p.test_pattern_at(self.pat_need_space)]
 
+    def _get_positions_to_insert(self, line: Paged_Text_Line) -> list[int]:
+        """get the positional indexes of line.text at which space might need to be inserted."""
+        return list(
+            itertools.chain.from_iterable(match.starts() for match in regex.finditer(self.pat_need_space, line.text))
+        )
+
+    def _score_positions(self, text: str, positions: list[int]) -> list[float]:
+        """score how plausible inserting space is at each position, by whether the letters on both sides of it make dictionary words when all spaces are inserted."""
+        bounds: list[int] = [0] + positions + [len(text)]
+
+        def letters(piece: str, from_end: bool) -> str:
+            hit: Optional[Match] = regex.search("[a-zA-Z]+$" if from_end else "^[a-zA-Z]+", piece)
+            return "" if hit is None else hit.group()
+
+        return [
+            float(self.dictionary.has(letters(text[bounds[i] : bounds[i + 1]], from_end=True)))
+            + float(self.dictionary.has(letters(text[bounds[i + 1] : bounds[i + 2]], from_end=False)))
+            for i in range(len(positions))
+        ]
+
+    def _iter_where_to_insert(self, line: Paged_Text_Line) -> Iterator[list[int]]:
+        """lazily yield the lists of positional indexes of line.text at which space might need to be inserted.
+        inserting space at all the positions comes first, followed by those dropping the least plausible positions."""
+        positions: list[int] = self._get_positions_to_insert(line)
+        return iter_subsets_by_score(positions, self._score_positions(line.text, positions))
+
     def _get_where_to_insert(self, line: Paged_Text_Line) -> list[list[int]]:
-        """get the list of positional indexes of line.text at which space might need to be inserted."""
-        starts = list(
-            itertools.chain.from_iterable(
-                [[start for start in match.starts()] for match in regex.finditer(self.pat_need_space, line.text)]
+        """get at most candidates_max lists of positional indexes of line.text at which space might need to be inserted."""
+        return list(itertools.islice(self._iter_where_to_insert(line), self.candidates_max))
+
+    def _get_segmented_texts(self, line: Paged_Text_Line, segmenter: Word_Segmenter) -> list[str]:
+        """get at most top_k texts of segmenter in which every glued run of letters is replaced by its likely segmentation, the most likely first."""
+        text: str = line.text
+        top_k: int = min(segmenter.top_k, self.candidates_max)
+        # pairs of total score and text segmented so far
+        beams: list[tuple[float, str]] = [(0.0, "")]
+        last: int = 0
+        for run in regex.finditer("[a-zA-Z]+", text):
+            if regex.search(self.pat_need_space, run.group()) is None:
+                continue
+            gap: str = text[last : run.start()]
+            segs = segmenter.segment(run.group())
+            beams = heapq.nlargest(
+                top_k, [(sc + seg.score, t + gap + seg.to_text()) for sc, t in beams for seg in segs]
             )
-        )
-        combinations: list[list[int]] = []
-        for r in range(len(starts) + 1):
-            combinations.extend([cl for c in itertools.combinations(starts, r) if (cl := list(c)) != []])
-        return combinations
+            last = run.end()
+        return [t + text[last:] for _, t in beams]
 
     def _get_candidates(self, line: Paged_Text_Line) -> list[Candidate]:
         """suggest new strings by which an input line might be replaced."""
+        if self.segmenter is not None:
+            return Candidate.to_candidate(
+                [t for t in self._get_segmented_texts(line, self.segmenter) if t != line.text]
+            )
 
         def insert_space(text: str, where_to_insert: list[int]) -> str:
             """get new text with space at specified index."""
@@ -78,14 +140,30 @@ class Insert_Space(Choose_from_Integers):
 
 
 class Remove_Space(Choose_from_Integers):
+    # how plausible two characters of these classes are to be in a same word when a space lies between them
+    bigram_scores: Final[dict[tuple[Char_Class, Char_Class], float]] = {
+        (Char_Class.HAN, Char_Class.HAN): 2.0,
+        (Char_Class.HAN, Char_Class.HIRAGANA): 2.0,
+        (Char_Class.KATAKANA, Char_Class.KATAKANA): 2.0,
+        (Char_Class.HIRAGANA, Char_Class.HIRAGANA): 1.0,
+        (Char_Class.HAN, Char_Class.KATAKANA): 1.0,
+        (Char_Class.KATAKANA, Char_Class.HAN): 1.0,
+        (Char_Class.KATAKANA, Char_Class.HIRAGANA): 1.0,
+        (Char_Class.HIRAGANA, Char_Class.HAN): 0.5,
+        (Char_Class.HIRAGANA, Char_Class.KATAKANA): 0.5,
+    }
+
     def __init__(
         self,
         lines: Paged_Text_Lines,
         options_max: int = 100,
-        pat_spaced_double_bytes: Pattern = regex.compile("(?<=[^\x01-\x7E部章節])[ \\s]+[^\x01-\x7E]"),
+        space_kept_after: str = "部章節",
+        candidates_max: int = 10,
     ) -> None:
+        """space between double-byte characters is to be removed unless it follows one of space_kept_after, as in '第I章 実数'."""
         self.lines: Paged_Text_Lines = lines
-        self.pat_spaced_double_bytes: Pattern = pat_spaced_double_bytes
+        self.space_kept_after: str = space_kept_after
+        self.candidates_max: int = min(candidates_max, options_max)
         self.mediator = Mediator(
             public_options=[Option.Pass.value, Option.Remove.value],
             private_options=[Option.Digit.value],
@@ -93,7 +171,7 @@ class Remove_Space(Choose_from_Integers):
         )
 
     def has_double_bytes(self, text: str) -> bool:
-        return regex.search(r"[^\x01-\x7E]", text) is not None
+        return not text.isascii()
 
     def get_rows_space_removed(self) -> Paged_Text_Lines:
         """interactively insert space where a lower character is followed by an Upper character with no space between."""
@@ -101,22 +179,43 @@ class Remove_Space(Choose_from_Integers):
 
     def find_rows(self) -> list[Paged_Text_Line]:
         """find rows having strings in which a space character lies between double-byte characters. e.g., 全角文字と 全角文字"""
-        return [p for p in self.lines if p.test_pattern_at(self.pat_spaced_double_bytes)]
+        return [p for p in self.lines if self._get_spaced_runs(p) != []]
+
+    def _is_spaced_out(self, line: Paged_Text_Line) -> bool:
+        """test if line.words but the header consists solely of single characters like '推 定 法'"""
+        return all(len(w) == 1 for i, w in enumerate(line.words) if i > 0)
+
+    def _get_spaced_runs(self, line: Paged_Text_Line) -> list[int]:
+        """get the positional indexes of line.runs of space that lies between double-byte characters."""
+        runs: tuple[Char_Run, ...] = line.runs
+        return [
+            i
+            for i in range(1, len(runs) - 1)
+            if runs[i].char_class == Char_Class.SPACE
+            and not runs[i - 1].ascii
+            and not runs[i + 1].ascii
+            and runs[i - 1].text[-1] not in self.space_kept_after
+        ]
+
+    def _score_runs(self, runs: tuple[Char_Run, ...], spaced: list[int]) -> list[float]:
+        """score how plausible removing space is at each run of space, by the classes of the characters on both sides of it."""
+        return [self.bigram_scores.get((runs[i - 1].char_class, runs[i + 1].char_class), 0.0) for i in spaced]
+
+    def _iter_where_to_remove(self, line: Paged_Text_Line) -> Iterator[list[int]]:
+        """lazily yield the lists of positional indexes of line.text at which space might need to be removed.
+        removing space at all the positions comes first, followed by those keeping the least plausible positions."""
+        spaced: list[int] = self._get_spaced_runs(line)
+        positions: list[int] = [line.runs[i].start for i in spaced]
+        if positions == []:
+            return iter([])
+        if self._is_spaced_out(line):
+            # collapsing everything is the only sensible choice
+            return iter([positions])
+        return iter_subsets_by_score(positions, self._score_runs(line.runs, spaced))
 
     def _get_where_to_remove(self, line: Paged_Text_Line) -> list[list[int]]:
-        """get the list of positional indexes of line.text at which space might need to be inserted."""
-        starts = list(
-            itertools.chain.from_iterable(
-                [
-                    [start for start in match.starts()]
-                    for match in regex.finditer(self.pat_spaced_double_bytes, line.text)
-                ]
-            )
-        )
-        combinations: list[list[int]] = []
-        for r in range(len(starts)):
-            combinations.extend([list(c) for c in itertools.combinations(starts, r) if c != []])
-        return combinations
+        """get at most candidates_max lists of positional indexes of line.text at which space might need to be removed."""
+        return list(itertools.islice(self._iter_where_to_remove(line), self.candidates_max))
 
     def _is_trivial_candidate(self, line: Paged_Text_Line, new_text: str) -> bool:
         """check whether new_text is a worthy candidate."""
@@ -124,7 +223,7 @@ class Remove_Space(Choose_from_Integers):
         if line.text == new_text:
             return True
         # trivial if it has digit header and has a single word part
-        if line.header == line.Header.DIGIT and any(
+        if line.header in [line.Header.DIGIT, line.Header.JA] and any(
             len(w) == 1 for i, w in enumerate(new_text.split()) if i > 0 and self.has_double_bytes(w)
         ):
             return True
@@ -157,7 +256,7 @@ class Remove_Space(Choose_from_Integers):
             return True
         if L > 1:
             # trivial if line.words consists solely of single word like '推 定 法'
-            return all(len(w) == 1 for i, w in enumerate(line.words) if i > 0)
+            return self._is_spaced_out(line)
         # L==1
         return True
 
@@ -166,7 +265,8 @@ class Remove_Space(Choose_from_Integers):
         if (L := len(candidates)) == 0:
             return Choice(option=Option.Pass, number=0)
         elif L > 1:
-            return Choice(option=Option.Digit, number=candidates[-1].idx)
+            # the first candidate removes the most spaces
+            return Choice(option=Option.Digit, number=candidates[0].idx)
         if L == 1:
             if candidates[0].text == "":
                 return Choice(option=Option.Remove, number=0)
@@ -188,7 +288,32 @@ class Header_Symbol:
         return sorted([Header_Symbol(symbol=key, appearance=value) for key, value in d.items()], reverse=True)
 
 
+@dataclasses.dataclass
+class Header_Histogram:
+    """line.idx grouped by pairs of leading symbol and separator of digits in header.
+    symbol '' stands for the header starting with digits, and separator None for the digits followed by no separator."""
+
+    rows: dict[tuple[str, Optional[str]], list[int]]
+    idx_symboled: list[int]
+
+    def get_symbol_frequency(self) -> dict[str, int]:
+        freq: dict[str, int] = {"": 0}
+        for (symbol, _), idx in self.rows.items():
+            if symbol != "":
+                freq[symbol] = freq.get(symbol, 0) + len(idx)
+        return freq
+
+    def get_sep_frequency(self, header_symbol: str) -> dict[str, int]:
+        freq: dict[str, int] = {"": 0}
+        for (symbol, sep), idx in self.rows.items():
+            if symbol == header_symbol and sep is not None:
+                freq[sep] = freq.get(sep, 0) + len(idx)
+        return freq
+
+
 class Header_Symbol_Detecter:
+    pat_digits_sep: Final[Pattern] = regex.compile("\\s?\\d+([^\\s\\d])")
+
     @classmethod
     def coalesce(cls, x: Optional[str]) -> str:
         return "" if x is None else x
@@ -208,6 +333,9 @@ class Header_Symbol_Detecter:
         self.sep_symbol: Optional[str] = self.coalesce(sep)
         self.sep_possible: list[str] = sep_possible
         self.pat_leading_symbol: Pattern = self._get_pat_leading_symbol()
+        # histogram and what it was built from
+        self._histogram: Optional[Header_Histogram] = None
+        self._histogram_source: tuple[Optional[Paged_Text_Lines], str] = (None, "")
 
     def _get_pat_leading_symbol(self) -> Pattern:
         seps: str = "".join(self.sep_possible + [self.coalesce(self.sep_symbol)])
@@ -220,24 +348,39 @@ class Header_Symbol_Detecter:
         self.sep_symbol = None if (s := self.get_header_sep(self.header_symbol)) is None else s.symbol
         self.pat_leading_symbol = self._get_pat_leading_symbol()
 
-    def _get_frequency(self, pat: Pattern) -> dict[str, int]:
-        """get potential header symbol with their appearance times"""
-        freq: dict[str, int] = {"": 0}
+    def _get_sep(self, text: str, pos: int) -> Optional[str]:
+        """get the separator that follows digits starting at pos of text. e.g., '.' for '1.2 hoge'"""
+        hit: Optional[Match] = self.pat_digits_sep.match(text, pos)
+        return None if hit is None else hit.group(1)
+
+    def get_histogram(self) -> Header_Histogram:
+        """get histogram of leading symbols and separators in a single pass over lines.
+        it is reused until lines or the pattern of leading symbol changes."""
+        lines, pattern = self._histogram_source
+        if self._histogram is not None and lines is self.lines and pattern == self.pat_leading_symbol.pattern:
+            return self._histogram
+        rows: dict[tuple[str, Optional[str]], list[int]] = {}
+        idx_symboled: list[int] = []
         for line in self.lines:
-            hit: Optional[Match] = regex.search(pat, line.text)
-            if isinstance(hit, Match):
+            text: str = line.text
+            hit: Optional[Match] = self.pat_leading_symbol.match(text)
+            if hit is not None:
                 symbol: str = hit.group()
-                freq.setdefault(symbol, 0)
-                freq[symbol] += 1
-        return freq
+                rows.setdefault((symbol, self._get_sep(text, len(symbol))), []).append(line.idx)
+                idx_symboled.append(line.idx)
+            if (sep := self._get_sep(text, 0)) is not None:
+                rows.setdefault(("", sep), []).append(line.idx)
+        self._histogram = Header_Histogram(rows=rows, idx_symboled=idx_symboled)
+        self._histogram_source = (self.lines, self.pat_leading_symbol.pattern)
+        return self._histogram
 
     def get_header_symbol_frequency(self) -> dict[str, int]:
         """get potential header symbol with their appearance times"""
-        return self._get_frequency(self.pat_leading_symbol)
+        return self.get_histogram().get_symbol_frequency()
 
     def get_idx_symboled(self) -> list[int]:
         """get list of line.idx that hit the potential header symbol pattern"""
-        return [line.idx for line in self.lines if regex.search(self.pat_leading_symbol, line.text) is not None]
+        return list(self.get_histogram().idx_symboled)
 
     def show_header_symbols(self, symbols: list[Header_Symbol]) -> None:
         if len(symbols) > 0:
@@ -248,12 +391,15 @@ class Header_Symbol_Detecter:
         else:
             print("no header symbols are detected.")
 
-    def _get_symbol(self, symbols: list[Header_Symbol]) -> Optional[Header_Symbol]:
+    def _get_symbol(self, symbols: list[Header_Symbol], kind: str = "symbol") -> Optional[Header_Symbol]:
         if len(symbols) == 0:
             return
         self.mediator.explain()
         self.show_header_symbols(symbols)
-        user_input, _ = self.mediator.get_user_input(default_value="0", domain=range(len(symbols)))
+        query = Query(
+            stage=self.__class__.__name__, text=kind, candidates=tuple(s.symbol for s in symbols), choices=True
+        )
+        user_input, _ = self.mediator.get_user_input(default_value="0", domain=range(len(symbols)), query=query)
         choice = self.mediator.interpret(user_input=user_input)
         match choice.option:
             case Option.Exit:
@@ -270,18 +416,19 @@ class Header_Symbol_Detecter:
         return self._get_symbol(symbols)
 
     def get_header_sep_frequency(self, header_symbol: Optional[str]) -> dict[str, int]:
-        pat_lead: str = "(?<=^\\s?\\d+)" if header_symbol is None else f"(?<=^{header_symbol}\\s?\\d+)"
-        pat: Pattern = regex.compile(f"{pat_lead}[^\\s\\d]")
-        return self._get_frequency(pat)
+        return self.get_histogram().get_sep_frequency(self.coalesce(header_symbol))
 
     def get_header_sep(self, header_symbol: Optional[str]) -> Optional[Header_Symbol]:
         symbols = Header_Symbol.to_symbols(self.get_header_sep_frequency(header_symbol))
         if len(symbols) > 0:
             print("choose separator of digits in header.")
-        return self._get_symbol(symbols)
+        return self._get_symbol(symbols, kind="separator")
 
 
 class Header_Aligner(Choose_from_Integers):
+    pat_space: Final[Pattern] = regex.compile("\\s")
+    pat_trailing_digits: Final[Pattern] = regex.compile("\\d+$")
+
     @classmethod
     def coalesce(cls, x: Optional[str]) -> str:
         return "" if x is None else x
@@ -310,6 +457,10 @@ class Header_Aligner(Choose_from_Integers):
         self.pat_sep_possible: Pattern = self._get_pat_sep_possible()
         self.pat_replace_sep: Pattern = self._get_pat_replace_sep()
         self.pat_digit_place_undecidable: Pattern = self._get_pat_digit_place_undecidable()
+        self.pat_sample_header_symbol: Pattern = self._get_pat_sample_header_symbol()
+        self.pat_header_prefix: Pattern = self._get_pat_header_prefix()
+        # templates of raw candidates keyed by header prefix and whether anything follows it
+        self._raw_candidates: dict[tuple[str, bool], set[str]] = {}
 
     def detect_symbols(self) -> None:
         def coalesce(x: Optional[str]) -> str:
@@ -324,6 +475,9 @@ class Header_Aligner(Choose_from_Integers):
         self.pat_sep_possible = self._get_pat_sep_possible()
         self.pat_replace_sep = self._get_pat_replace_sep()
         self.pat_digit_place_undecidable = self._get_pat_digit_place_undecidable()
+        self.pat_sample_header_symbol = self._get_pat_sample_header_symbol()
+        self.pat_header_prefix = self._get_pat_header_prefix()
+        self._raw_candidates.clear()
 
     def is_ignorable(self, text: str) -> bool:
         return any(text.lower().startswith(w.lower()) for w in self.ignore)
@@ -361,8 +515,12 @@ class Header_Aligner(Choose_from_Integers):
     def _get_pat_sample_header_symbol(self) -> Pattern:
         return regex.compile(f"^[^{''.join(self._get_characters_in_header())}]")
 
+    def _get_pat_header_prefix(self) -> Pattern:
+        chrs: str = "".join(self._get_characters_in_header())
+        return regex.compile(f"^[^{chrs}]?[{chrs}]*")
+
     def replace_header_symbol(self, text: str) -> str:
-        return regex.sub(self._get_pat_sample_header_symbol(), self.header_symbol, text)
+        return regex.sub(self.pat_sample_header_symbol, self.header_symbol, text)
 
     def replace_sep(self, text: str) -> str:
         return regex.sub(self.pat_replace_sep, self.sep, text)
@@ -386,7 +544,7 @@ class Header_Aligner(Choose_from_Integers):
             hit: Optional[Match] = regex.search(pat, text)
             if isinstance(hit, Match):
                 end: int = hit.end()
-                al: str = (regex.sub("\\s", "", text[:end])).strip() + " " + text[end:].strip()
+                al: str = (regex.sub(self.pat_space, "", text[:end])).strip() + " " + text[end:].strip()
                 als.add(al)
             else:
                 als.add(text)
@@ -396,15 +554,17 @@ class Header_Aligner(Choose_from_Integers):
         return self.choose_from_integers()
 
     def _sample_header_symbol(self, line: Paged_Text_Line) -> str:
-        pat = regex.compile(f"^[^{''.join(self._get_characters_in_header())}]")
-        return "" if (hit := regex.search(pat, line.text)) is None else hit.group()
+        return "" if (hit := regex.search(self.pat_sample_header_symbol, line.text)) is None else hit.group()
 
     def find_rows(self) -> list[Paged_Text_Line]:
+        lines: list[Paged_Text_Line] = [
+            line for i in self.detecter.get_idx_symboled() if (line := self.lines.lookup_row(i)) is not None
+        ]
         return [
-            self.lines[i]
-            for i in self.detecter.get_idx_symboled()
-            if not self.is_ignorable(self.lines[i].text)
-            and (not self.is_aligned(self.lines[i]) or self._is_digit_place_undecidable(self.lines[i]))
+            line
+            for line in lines
+            if not self.is_ignorable(line.text)
+            and (not self.is_aligned(line) or self._is_digit_place_undecidable(line))
         ]
 
     def _get_all_combinations(self, length: int) -> list[tuple]:
@@ -424,10 +584,10 @@ class Header_Aligner(Choose_from_Integers):
             processed.add(t)
         return processed
 
-    def _get_raw_candidates(self, line: Paged_Text_Line) -> set[str]:
+    def _expand_raw_candidates(self, text: str) -> set[str]:
         """get possible pattern of candidates. replace_header x replace_sep"""
-        als: list[str] = self._get_aligned(line.text)
-        if self._is_digit_place_undecidable(line):
+        als: list[str] = self._get_aligned(text)
+        if self._is_digit_place_undecidable(text):
             als = self._get_suggestion_diff_sep_place(als)
         cands: set[str] = set()
         for al in als:
@@ -436,6 +596,22 @@ class Header_Aligner(Choose_from_Integers):
             )
         return cands
 
+    def _get_raw_candidates(self, line: Paged_Text_Line) -> set[str]:
+        """get possible pattern of candidates. replace_header x replace_sep
+        every transformation touches only the header prefix of text, so candidates are memoized as templates of header followed by the rest of text."""
+        text: str = line.text
+        end: int = self.pat_header_prefix.match(text).end()
+        header, rest = text[:end], text[end:]
+        key: tuple[str, bool] = (header, rest != "")
+        if key in self._raw_candidates:
+            return {t + rest for t in self._raw_candidates[key]}
+        cands: set[str] = self._expand_raw_candidates(text)
+        # the first space might lie in the rest, and then moving digits around it depends on the rest
+        depends_on_rest: bool = self._is_digit_place_undecidable(text) and self.pat_space.search(header) is None
+        if not depends_on_rest and all(c.endswith(rest) for c in cands):
+            self._raw_candidates[key] = {c[: len(c) - len(rest)] for c in cands}
+        return cands
+
     def _get_candidates(self, line: Paged_Text_Line) -> list[Candidate]:
         cands: set[str] = set()
         for cand in self._get_raw_candidates(line):
@@ -470,10 +646,8 @@ class Header_Aligner(Choose_from_Integers):
 
     def _get_suggestion_diff_sep_place(self, texts: list[str]) -> list[str]:
         cands: list[str] = []
-        pat_digits: Pattern = regex.compile("\\d+$")
-        pat_space: Pattern = regex.compile("\\s")
         for text in texts:
-            hit: Optional[Match] = regex.search(pat_space, text)
+            hit: Optional[Match] = regex.search(self.pat_space, text)
             if isinstance(hit, Match):
                 start = hit.starts()[0]
                 end = hit.ends()[0]
@@ -481,7 +655,7 @@ class Header_Aligner(Choose_from_Integers):
                 text = text[:start] + text[end:]
                 # now start points at the first character of sentence
                 # end points at the second
-                for match in regex.finditer(pat_digits, text[:start]):
+                for match in regex.finditer(self.pat_trailing_digits, text[:start]):
                     if isinstance(match, Match):
                         text_match: str = match.group()
                         for i in range(len(text_match) + 1):
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import locale
+import mmap
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+
+def read_lines(path: Path | str, encoding: Optional[str] = None) -> Iterator[str]:
+    """yield the lines of a text file without line breaks, split as str.splitlines does.
+    the file is read through mmap a line at a time, so it is never held in memory as a whole.
+    encoding must be ascii compatible. the default is the one open uses."""
+    encoding = locale.getpreferredencoding(False) if encoding is None else encoding
+    with open(path, "rb") as f:
+        # mmap can not map an empty file
+        if Path(path).stat().st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start: int = 0
+            while start < len(mm):
+                end: int = mm.find(b"\n", start)
+                end = len(mm) if end == -1 else end + 1
+                # a chunk may still hold breaks other than \n, such as a lone \r
+                yield from mm[start:end].decode(encoding).splitlines()
+                start = end
+
+
+def write_lines(path: Path | str, lines: Iterable[str], encoding: Optional[str] = None) -> Path:
+    """write lines joined by line breaks without a trailing one, as '\\n'.join would, but without joining them in memory."""
+    path = Path(path)
+    with open(path, mode="w", encoding=encoding) as f:
+        f.writelines(_join_lines(lines))
+    return path
+
+
+def _join_lines(lines: Iterable[str]) -> Iterator[str]:
+    for i, line in enumerate(lines):
+        yield line if i == 0 else "\n" + line
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import copy
+import functools
+import unicodedata
 from enum import IntEnum, auto
 from typing import Final, Iterator, Optional, overload
 
@@ -8,6 +11,68 @@ from regex import Match, Pattern
 from textblob import Word  # type: ignore
 from typing_extensions import Self
 
+from Char_Class import Char_Run, tokenize
+
+pat_roman_canonical: Final[Pattern] = regex.compile(
+    "^M{0,3}(?:CM|CD|D?C{0,3})(?:XC|XL|L?X{0,3})(?:IX|IV|V?I{0,3})$", regex.IGNORECASE
+)
+roman_values: Final[dict[str, int]] = {"I": 1, "V": 5, "X": 10, "L": 50, "C": 100, "D": 500, "M": 1000}
+
+
+@functools.lru_cache(maxsize=None)
+def roman_to_int(roman: str) -> Optional[int]:
+    """convert roman numeral such as 'xiv' into integer. None if it is not in the canonical form, e.g., 'iiii', 'vx' or 'Xiv'."""
+    if roman == "" or roman not in [roman.lower(), roman.upper()] or regex.search(pat_roman_canonical, roman) is None:
+        return None
+    values: list[int] = [roman_values[c] for c in roman.upper()]
+    # a numeral smaller than the next one is subtracted, e.g., 'iv' = -1 + 5
+    return sum(-v if i + 1 < len(values) and v < values[i + 1] else v for i, v in enumerate(values))
+
+
+kanji_numerals: Final[dict[str, int]] = {
+    "〇": 0,
+    "零": 0,
+    "一": 1,
+    "二": 2,
+    "三": 3,
+    "四": 4,
+    "五": 5,
+    "六": 6,
+    "七": 7,
+    "八": 8,
+    "九": 9,
+}
+kanji_units: Final[dict[str, int]] = {"十": 10, "百": 100, "千": 1000}
+
+
+@functools.lru_cache(maxsize=None)
+def kanji_to_int(kanji: str) -> Optional[int]:
+    """convert kanji or full-width numeral such as '十二', '二〇' or '１２' into integer. None if it is not a numeral."""
+    text: str = unicodedata.normalize("NFKC", kanji)
+    if text.isdecimal():
+        return int(text)
+    if text == "" or any(c not in kanji_numerals and c not in kanji_units for c in text):
+        return None
+    # positional form like '二〇'
+    if all(c in kanji_numerals for c in text):
+        return int("".join(str(kanji_numerals[c]) for c in text))
+    # form with units like '百二十'. units must appear in the decreasing order.
+    total: int = 0
+    digit: Optional[int] = None
+    unit_last: int = 10000
+    for c in text:
+        if c in kanji_numerals:
+            if digit is not None:
+                return None
+            digit = kanji_numerals[c]
+        else:
+            if kanji_units[c] >= unit_last:
+                return None
+            unit_last = kanji_units[c]
+            total += (1 if digit is None else digit) * unit_last
+            digit = None
+    return total + (0 if digit is None else digit)
+
 
 class Text_Line:
     def __init__(self, idx: int = -1, text: str = "", sep: str = " ") -> None:
@@ -17,6 +82,8 @@ class Text_Line:
         self._text: str = text_slim
         self._words: list[str] = []
         self._sep: str = sep
+        # runs of character classes and the text they are computed from
+        self._runs: tuple[str, tuple[Char_Run, ...]] = ("", ())
         # update words should be manually called in a subclass
         if isinstance(self, Text_Line):
             self.update_words()
@@ -92,6 +159,15 @@ class Text_Line:
         self._words = words
         self.update_text()
 
+    @property
+    def runs(self) -> tuple[Char_Run, ...]:
+        """runs of characters of the same class in self.text. computed once per text."""
+        text, runs = self._runs
+        if text != self.text:
+            runs = tokenize(self.text)
+            self._runs = (self.text, runs)
+        return runs
+
     def is_empty(self) -> bool:
         return self.to_text() == ""
 
@@ -118,9 +194,12 @@ class Text_Line:
         return text.strip()
 
     def format_space(self) -> Self:
-        return self.get_instance(
-            idx=self.idx, text=" ".join([t for t in self.to_text().split(" ") if t != ""]), sep=self.sep
-        )
+        """collapse runs of spaces and strip the text. self is returned as it is if there is nothing to do."""
+        text: str = self.to_text()
+        formatted: str = " ".join([t for t in text.split(" ") if t != ""])
+        if formatted == text:
+            return self
+        return self.get_instance(idx=self.idx, text=formatted, sep=self.sep)
 
     def _has_newline(self, text: str) -> bool:
         return len(lines := text.splitlines()) != 0 and lines[0] != text
@@ -163,12 +242,20 @@ class Paged_Text_Line(Text_Line):
     pat_page: Final[Pattern] = regex.compile(f"(?P<{page_key}>\\s?[0-9]+)$")
     pat_roman_page: Final[Pattern] = regex.compile(f"(?=\\s|^)\\s?(?P<{roman_page_key}>[ixv]+|[IXV]+)$")
     pat_word_header: Final[Pattern] = regex.compile("^[a-zA-Z]+[\\.,]*$")
+    # units of japanese header from the top of hierarchy
+    ja_units: Final[str] = "編部章節項款"
+    ja_appendix: Final[str] = "付録"
+    pat_ja_header: Final[Pattern] = regex.compile(
+        f"^第\\s?(?P<number>[0-9０-９{''.join(kanji_numerals)}{''.join(kanji_units)}]+)\\s?(?P<unit>[{ja_units}])"
+    )
+    pat_ja_appendix: Final[Pattern] = regex.compile(f"^{ja_appendix}\\s?(?P<number>[A-ZＡ-Ｚ]?)(?![a-zA-Z])")
 
     class Header(IntEnum):
         DIGIT = auto()
         ALPHABET = auto()
         WORD = auto()
         NO = auto()
+        JA = auto()
 
     def __init__(
         self,
@@ -227,6 +314,18 @@ class Paged_Text_Line(Text_Line):
             text_line=text_line,
         )
 
+    def get_merged(self, others: list[Paged_Text_Line]) -> Self:
+        """get a line whose text is self.text followed by the texts of others and whose page number is taken from the last of others.
+        page data and header type are reused as they are already parsed, so no regular expression runs again."""
+        if others == []:
+            return self
+        merged: Self = copy.copy(self)
+        merged._text = self.sep.join([t for t in [self.text] + [o.text for o in others] if t != ""])
+        merged.page_number = others[-1].page_number
+        merged.roman_page_number = others[-1].roman_page_number
+        merged.update_words()
+        return merged
+
     def to_text(self, sep: str | None = None, combine: bool = True) -> str:
         """combine text and page number."""
         if not combine or not self.is_page_set():
@@ -252,6 +351,11 @@ class Paged_Text_Line(Text_Line):
         match: Optional[Match] = regex.search(self.pat_roman_page, self.text)
         return match.group(self.roman_page_key) if match else None
 
+    @property
+    def roman_page_value(self) -> Optional[int]:
+        """integer value of roman page number. None if roman page number is absent or not in the canonical form."""
+        return None if self.roman_page_number is None else roman_to_int(self.roman_page_number)
+
     def is_page_set(self) -> bool:
         """test if page number is set in property, arabic or roman"""
         return self.page_number is not None or self.roman_page_number is not None
@@ -276,8 +380,22 @@ class Paged_Text_Line(Text_Line):
         """test if the input string completely coincides with some word."""
         return regex.search(self.pat_word_header, word) is not None and Word(word).spellcheck()[0][1] >= confidence
 
+    def get_ja_header(self) -> Optional[tuple[str, int]]:
+        """get unit and number of japanese header, e.g., ('章', 12) for '第十二章' and ('付録', 1) for '付録A'.
+        an appendix with no number gets 0. None if self.text does not start with japanese header."""
+        if (match := regex.search(self.pat_ja_header, self.text)) is not None:
+            number: Optional[int] = kanji_to_int(match.group("number"))
+            return None if number is None else (match.group("unit"), number)
+        if (match := regex.search(self.pat_ja_appendix, self.text)) is not None:
+            letter: str = unicodedata.normalize("NFKC", match.group("number"))
+            return self.ja_appendix, 0 if letter == "" else ord(letter) - ord("A") + 1
+        return None
+
     def _get_header_type(self) -> Header:
         """judge header type based on the first word on self.text"""
+        # japanese header is reliable even if it is glued to the title, like '第1章序論'
+        if self.get_ja_header() is not None:
+            return self.Header.JA
         n_words: int = self.get_number_of_words()
         if (self.is_page_set() and n_words <= 2) or (not self.is_page_set() and n_words <= 1):
             return self.Header.NO
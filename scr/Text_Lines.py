@@ -5,6 +5,8 @@ import itertools
 from typing import Any, Generic, Iterator, Optional, TypeGuard, TypeVar, overload
 
 import rich
+from rich.console import Console
+from rich.text import Text
 from typing_extensions import Self
 
 from Text_Line import Paged_Text_Line, Text_Line
@@ -17,6 +19,7 @@ class _Text_Lines(Generic[T], metaclass=abc.ABCMeta):
 
     def __init__(self, texts: list[T] | T) -> None:
         self.lines: list[T] = sorted(texts) if isinstance(texts, list) else [texts]
+        self._positions: Optional[dict[int, int]] = None
 
     def __add__(self, other: Self | list[T]) -> Self:
         """take union of two Text_Lines"""
@@ -109,6 +112,7 @@ class _Text_Lines(Generic[T], metaclass=abc.ABCMeta):
 
     def get_sorted(self) -> Self:
         self.lines.sort()
+        self._positions = None
         return self
 
     def search(self, row_idx: int, left: int = 0, right: int = -1) -> int:
@@ -126,6 +130,26 @@ class _Text_Lines(Generic[T], metaclass=abc.ABCMeta):
                 r = center - 1
         return -1
 
+    def _get_positions(self) -> dict[int, int]:
+        """get positional index of each row keyed by row number. built at the first call."""
+        if self._positions is None:
+            self._positions = {line.idx: i for i, line in enumerate(self.lines)}
+        return self._positions
+
+    def lookup_row(self, row: int) -> Optional[T]:
+        """get Text_Line object with the row number in O(1). None if not found.
+        unlike self[i], which is positional, this is safe after some rows are deleted."""
+        for _ in range(2):
+            fresh: bool = self._positions is None
+            pos: Optional[int] = self._get_positions().get(row)
+            if pos is not None and pos < len(self.lines) and self.lines[pos].idx == row:
+                return self.lines[pos]
+            if fresh:
+                return None
+            # a miss or a stale hit. lines might have been added or altered since positions were built
+            self._positions = None
+        return None
+
     def has_row(self, row: int) -> bool:
         """if Text_Lines object has the asked row"""
         return self.search(row) != -1
@@ -162,10 +186,15 @@ class _Text_Lines(Generic[T], metaclass=abc.ABCMeta):
 
     def remove_blank_rows(self) -> Self:
         rows: list[int] = [line.idx for line in self if not line.is_empty()]
+        if len(rows) == len(self):
+            return self
         return self.select(rows=rows)
 
     def format_space(self) -> Self:
-        return self.get_instance([line.format_space() for line in self])
+        lines: list[T] = [line.format_space() for line in self]
+        if all(new is old for new, old in zip(lines, self)):
+            return self
+        return self.get_instance(lines)
 
 
 class Text_Lines(_Text_Lines[Text_Line]):
@@ -208,10 +237,16 @@ class Paged_Text_Lines(_Text_Lines[Paged_Text_Line]):
     def to_text(self, combine: bool = True) -> str:
         return "\n".join(self.to_list_str(combine=combine))
 
+    def iter_text(self, combine: bool = True) -> Iterator[str]:
+        """yield the rows of to_list_str one by one."""
+        return (s.to_text(combine=combine) for s in self)
+
 
 class Texts_Printer:
-    def __init__(self, color_set: list[str] = ["magenta", "cyan"]) -> None:
+    def __init__(self, color_set: list[str] = ["magenta", "cyan"], console: Optional[Console] = None) -> None:
+        """every call of print methods renders a single renderable and writes it to console at once. the default console is the one rich.print uses."""
         self._color_set: list[str] = ["magenta", "cyan"] if color_set is None else color_set
+        self.console: Console = rich.get_console() if console is None else console
 
     def generate_color_block(self, color: Optional[str] = None) -> tuple[str, str]:
         c = self._color_set[0] if color is None else color
@@ -239,7 +274,13 @@ class Texts_Printer:
 
     Lines = TypeVar("Lines", Text_Lines, Paged_Text_Lines)
 
-    def print(
+    def _join_rows(self, rows: list[Text], with_blank_line: bool) -> Text:
+        """join rows into a single text, surrounded by blank lines if necessary."""
+        if with_blank_line:
+            rows = [Text(""), *rows, Text("")]
+        return Text("\n").join(rows)
+
+    def render(
         self,
         lines: Lines,
         start: int = 0,
@@ -249,9 +290,8 @@ class Texts_Printer:
         with_def: bool = True,
         colors: list[tuple[int, str]] = [],
         with_blank_line: bool = True,
-    ) -> None:
-        """print continuous part of text lines.
-        By default it prints all lines."""
+    ) -> Text:
+        """render continuous part of text lines. only the def header is parsed as markup, so that row texts are shown as they are."""
 
         colors = colors if colors != [] else [(0, self._color_set[0]), (1, self._color_set[-1])]
         sep: str = " | "
@@ -264,25 +304,47 @@ class Texts_Printer:
                 return [texts[-1]]
             return [texts[0], texts[-1]] if with_N else [texts[1], texts[-1]]
 
-        if with_blank_line:
-            self.insert_blank_line()
-
-        # create and print def header if necessary
+        rows: list[Text] = []
+        # create def header if necessary
         if with_def:
             elems: list[str] = ["N", "Row", "Text"]
             colored_elems: list[str] = self.get_colored(elems, colors)
-            rich.print(sep.join(filter_texts(colored_elems)))
+            rows.append(Text.from_markup(sep.join(filter_texts(colored_elems))))
 
-        # print main part
+        # main part
         end_: int = min(end + 1, len(lines)) if end > 0 else len(lines)
         for i in range(max(start, 0), end_):
             elems: list[str] = [f"{i-start}", f"{lines[i].idx}", f"{lines[i].to_text()}"]
-            rich.print(sep.join(filter_texts(elems)))
+            rows.append(Text(sep.join(filter_texts(elems))))
+        return self._join_rows(rows, with_blank_line)
 
-        if with_blank_line:
-            self.insert_blank_line()
+    def print(
+        self,
+        lines: Lines,
+        start: int = 0,
+        end: int = -1,
+        with_N: bool = True,
+        with_page_idx: bool = True,
+        with_def: bool = True,
+        colors: list[tuple[int, str]] = [],
+        with_blank_line: bool = True,
+    ) -> None:
+        """print continuous part of text lines.
+        By default it prints all lines."""
+        self.console.print(
+            self.render(
+                lines,
+                start=start,
+                end=end,
+                with_N=with_N,
+                with_page_idx=with_page_idx,
+                with_def=with_def,
+                colors=colors,
+                with_blank_line=with_blank_line,
+            )
+        )
 
-    def print_around(
+    def render_around(
         self,
         lines: Lines,
         row: int,
@@ -290,22 +352,46 @@ class Texts_Printer:
         coloring_at: list[int] = [0],
         coloring_with: Optional[str] = None,
         with_blank_line: bool = True,
-    ) -> None:
+    ) -> Optional[Text]:
+        """render the rows around the given row. None if there is no such row."""
         color: str = self._color_set[0] if coloring_with is None else coloring_with
         i_center: int = lines.search(row)
         if i_center == -1:
-            return
+            return None
         include: list[int] = [
             i + i_center for i in range(-N_around, N_around + 1) if i + i_center in range(0, len(lines))
         ]
         color_pos: list[int] = [i + i_center for i in coloring_at if i + i_center in include]
-        if with_blank_line:
-            self.insert_blank_line()
-        for i in include:
-            out: str = self.coloring(lines[i].to_text(), color) if i in color_pos else lines[i].to_text()
-            rich.print(out)
-        if with_blank_line:
-            self.insert_blank_line()
+        rows: list[Text] = [Text(lines[i].to_text(), style=color if i in color_pos else "") for i in include]
+        return self._join_rows(rows, with_blank_line)
+
+    def print_around(
+        self,
+        lines: Lines,
+        row: int,
+        N_around: int = 1,
+        coloring_at: list[int] = [0],
+        coloring_with: Optional[str] = None,
+        with_blank_line: bool = True,
+    ) -> None:
+        rendered: Optional[Text] = self.render_around(
+            lines,
+            row=row,
+            N_around=N_around,
+            coloring_at=coloring_at,
+            coloring_with=coloring_with,
+            with_blank_line=with_blank_line,
+        )
+        if rendered is not None:
+            self.console.print(rendered)
+
+    def render_numbered(self, texts: list[str], with_blank_line: bool = True) -> Text:
+        """render texts one per row, numbered from zero."""
+        rows: list[Text] = [Text.assemble((str(i), self._color_set[0]), f" | {t}") for i, t in enumerate(texts)]
+        return self._join_rows(rows, with_blank_line)
+
+    def print_numbered(self, texts: list[str], with_blank_line: bool = True) -> None:
+        self.console.print(self.render_numbered(texts, with_blank_line=with_blank_line))
 
     def insert_blank_line(self) -> None:
-        print("")
+        self.console.print("")
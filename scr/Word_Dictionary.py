@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import math
+from typing import Final, Mapping
+
+from textblob.en import spelling  # type: ignore
+
+
+class Word_Dictionary:
+    """unigram frequency dictionary of english words.
+    it is backed by the spelling corpus of textblob, which is also what Word.spellcheck() uses to classify headers."""
+
+    def __init__(self, frequency: Mapping[str, int] = spelling) -> None:
+        self._frequency: Mapping[str, int] = frequency
+        self._total: int = 0
+
+    @property
+    def total(self) -> int:
+        """sum of all the frequencies. computed once at the first access."""
+        if self._total == 0:
+            self._total = max(sum(self._frequency.values()), 1)
+        return self._total
+
+    def get_frequency(self, word: str) -> int:
+        return self._frequency.get(word.lower(), 0)
+
+    def has(self, word: str) -> bool:
+        return self.get_frequency(word) > 0
+
+    def get_log_probability(self, word: str) -> float:
+        """log of unigram probability of word. an unknown word gets a penalty that grows with its length, as if each character were a guess out of ten."""
+        freq: int = self.get_frequency(word)
+        if freq > 0:
+            return math.log(freq / self.total)
+        return math.log(1 / self.total) - math.log(10) * len(word)
+
+
+dictionary: Final[Word_Dictionary] = Word_Dictionary()
@@ -1,25 +1,116 @@
+import concurrent.futures
+import contextlib
+import dataclasses
+import io
+import time
+from enum import Enum
+from typing import Callable, Iterable, Optional
+
+import rich
+from rich.table import Table
+
 from Cleaner import Cleaner, Cleaner_ja, Interactive_Cleaner, Interactive_Cleaner_ja
+from Decision import (
+    Decider,
+    Decision_Journal,
+    Policy,
+    Policy_Decider,
+    Review_Collector,
+    Worksheet,
+    Worksheet_Mode,
+)
 from Extractor import Extractor
 from Filter_Lines import Filter_Lines
 from Filtering_Prompt import Prompt
 from Interpreter import Interpreter
+from Learner import Choice_Model, Learned_Decider
+from Manifest import Manifest
+from Mediator import Mediator
 from Merger import Merger
-from Page_Corrector import Correct, Fill
+from Page_Corrector import Correct, Fill, Fill_Policy
+from Segmenter import Word_Segmenter
 from Spacer import Header_Aligner, Insert_Space, Remove_Space
+from Text_IO import read_lines, write_lines
 from Text_Lines import Paged_Text_Lines
 from Type_Alias import Path, Save_Result
 
 
+class Stage(Enum):
+    """stages of tidy in the default order. every stage takes rows and returns them processed, or the same rows if it changes nothing."""
+
+    Clean = "clean"
+    Space = "space"
+    Select = "select"
+    Merge = "merge"
+    Page = "page"
+
+
+@dataclasses.dataclass(frozen=True)
+class Stage_Timing:
+    """how long a stage took, including the time user spent answering. changed is false if the stage returned the rows it took."""
+
+    stage: Stage
+    seconds: float
+    rows_in: int
+    rows_out: int
+    changed: bool
+
+
+def get_stages(
+    stages: list[str] | None = None,
+    clean_dust: bool = True,
+    spacing: bool = False,
+    select_line: bool = True,
+    merge_line: bool = True,
+    correct_page_number: bool = True,
+) -> list[Stage]:
+    """stages to run in order. if stages is given, they run in the given order and the flags are ignored."""
+    if stages is not None:
+        return [Stage(stage) for stage in stages]
+    enabled: dict[Stage, bool] = {
+        Stage.Clean: clean_dust,
+        Stage.Space: spacing,
+        Stage.Select: select_line,
+        Stage.Merge: merge_line,
+        Stage.Page: correct_page_number,
+    }
+    return [stage for stage in Stage if enabled[stage]]
+
+
+def run_stages(
+    ptls: Paged_Text_Lines, runners: list[tuple[Stage, Callable[[Paged_Text_Lines], Paged_Text_Lines]]]
+) -> tuple[Paged_Text_Lines, list[Stage_Timing]]:
+    """pass ptls through runners in order, timing each of them."""
+    timings: list[Stage_Timing] = []
+    for stage, run in runners:
+        start: float = time.perf_counter()
+        processed: Paged_Text_Lines = run(ptls)
+        timings.append(
+            Stage_Timing(stage, time.perf_counter() - start, len(ptls), len(processed), processed is not ptls)
+        )
+        ptls = processed
+    return ptls, timings
+
+
+def print_timing(timings: list[Stage_Timing]) -> None:
+    table = Table(title="time per stage")
+    for column in ["stage", "seconds", "rows in", "rows out", "changed"]:
+        table.add_column(column, justify="left" if column == "stage" else "right")
+    for t in timings:
+        table.add_row(t.stage.value, f"{t.seconds:.3f}", str(t.rows_in), str(t.rows_out), "yes" if t.changed else "no")
+    table.add_row("total", f"{sum(t.seconds for t in timings):.3f}", "", "", "")
+    rich.print(table)
+
+
 def save_text(
-    text: str,
+    text: str | Iterable[str],
     dir_out: Path,
     name_out: str,
 ) -> Save_Result:
-    if not dir_out.exists():
-        dir_out.mkdir(parents=True)
-    text_path: Path = dir_out / name_out
-    with open(text_path, mode="w") as tf:
-        tf.write(text)
+    """save text, or the rows of it joined by line breaks as they are generated."""
+    # workers of tidy_parallel may make it at the same time
+    dir_out.mkdir(parents=True, exist_ok=True)
+    text_path: Path = write_lines(dir_out / name_out, [text] if isinstance(text, str) else text)
     return text_path, text_path.exists()
 
 
@@ -65,45 +156,121 @@ def apply_select(ptls: Paged_Text_Lines, select_line: bool = True, max_line: int
         inter = Interpreter(range_size=max_line)
         prompt = Prompt()
         filter = Filter_Lines(ptls_ex, max_line=max_line)
-        ptls = (ptls - filter.get_filtered_lines(inter, prompt)).remove_blank_rows()
+        filtered: Paged_Text_Lines = filter.get_filtered_lines(inter, prompt)
+        if len(filtered) > 0:
+            ptls = ptls - filtered
+        ptls = ptls.remove_blank_rows()
     return ptls
 
 
-def apply_merge(ptls: Paged_Text_Lines, merge_line: bool) -> Paged_Text_Lines:
+def apply_merge(
+    ptls: Paged_Text_Lines,
+    merge_line: bool,
+    threshold_merge: float | None = None,
+    threshold_skip: float | None = None,
+    page_size: int | None = None,
+) -> Paged_Text_Lines:
     if merge_line:
         print("\n Merging lines.\n")
-        mer = Merger(ptls)
+        mer = Merger(ptls, threshold_merge=threshold_merge, threshold_skip=threshold_skip, page_size=page_size)
         ptls = mer.get_merged_lines()
     return ptls
 
 
-def apply_page_correct(ptls: Paged_Text_Lines, correct_page: bool) -> Paged_Text_Lines:
+def apply_page_correct(
+    ptls: Paged_Text_Lines,
+    correct_page: bool,
+    fill_policy: Fill_Policy | str | None = None,
+    page_size: int | None = None,
+) -> Paged_Text_Lines:
     if correct_page:
         print("\n Correct page numbers.\n")
         ex = Extractor(text=ptls)
         lines_not_numbered = ex.get_non_numbered_lines()
-        filler = Fill(lines_blank_page_number=lines_not_numbered, lines_ref=ptls)
-        ptls = filler.get_filled_lines()
-        ex.read_text(ptls)
+        filler = Fill(
+            lines_blank_page_number=lines_not_numbered,
+            lines_ref=ptls,
+            policy=None if fill_policy is None else Fill_Policy(fill_policy),
+            page_size=page_size,
+        )
+        filled: Paged_Text_Lines = filler.get_filled_lines()
+        # nothing filled leaves what ex has read as it is
+        if filled is not ptls:
+            ptls = filled
+            ex.read_text(ptls)
         cor = Correct(
             lines_strange_page_number=ex.get_order_disturbing_main_pages(),
             lines_ref=ptls,
             ignore=lines_not_numbered.get_index(),
+            page_size=page_size,
         )
         ptls = cor.get_corrected_lines()
     return ptls
 
 
-def insert_space(ptls: Paged_Text_Lines, spacing: bool) -> Paged_Text_Lines:
+def insert_space(ptls: Paged_Text_Lines, spacing: bool, segment: bool = False) -> Paged_Text_Lines:
     if spacing:
         print("\n Adjust spacing.\n")
-        inserter = Insert_Space(ptls)
+        inserter = Insert_Space(ptls, segmenter=Word_Segmenter() if segment else None)
         ptls = inserter.get_rows_space_inserted()
         remover = Remove_Space(ptls)
         ptls = remover.get_rows_space_removed()
     return ptls
 
 
+def train_decider(journal: Path | str, learn_above: float | None = None) -> Learned_Decider:
+    """train a model from the journal. its suggestion is applied without asking if it is at least learn_above confident.
+    training reads the whole journal, so it is done once for all files to tidy."""
+    model = Choice_Model().train(Decision_Journal(journal).get_decisions())
+    print(f"suggestions are learned for {len(model.weights)} stages.")
+    return Learned_Decider(model, threshold=learn_above)
+
+
+def make_deciders(
+    journal: Path | str | None = None,
+    auto: str | None = None,
+    stage_policies: dict[str, str] = {},
+    worksheet: Path | str | None = None,
+    batch: bool = False,
+    learned: Optional[Learned_Decider] = None,
+) -> tuple[list[Decider], Optional[Review_Collector]]:
+    """make the deciders that answer instead of user, and the collector among them if any. the journal replays the answers recorded in the previous runs and records new ones,
+    and the worksheet applies the answers filled in by reviewers.
+    learned, see train_decider, suggests the default of every question.
+    in batch mode or if auto is given, nobody is asked: the policy answers what it can, and the rest is collected for review."""
+    deciders: list[Decider] = []
+    if journal is not None:
+        decision_journal = Decision_Journal(journal)
+        print(f"{len(decision_journal)} decisions are loaded from {decision_journal.path.name}.")
+        deciders.append(decision_journal)
+    if worksheet is not None:
+        if Path(worksheet).is_file():
+            filled = Worksheet(worksheet)
+            print(f"{len(filled)} answers are loaded from {filled.path.name}.")
+            deciders.append(filled)
+        else:
+            print(f"{Path(worksheet).name} is not found. every question is left for review.")
+    if learned is not None:
+        deciders.append(learned)
+    if auto is not None:
+        policies: dict[str, Policy] = {stage: Policy(policy) for stage, policy in stage_policies.items()}
+        deciders.append(Policy_Decider(Policy(auto), stage_policies=policies))
+    collector: Optional[Review_Collector] = None
+    if batch or auto is not None:
+        collector = Review_Collector()
+        deciders.append(collector)
+    return deciders, collector
+
+
+def save_review(collector: Optional[Review_Collector], saved_file: Path) -> Optional[Path]:
+    """save the cases left undecided in batch mode next to the output file. nothing is saved if there is none."""
+    if collector is None or len(collector) == 0:
+        return None
+    review_file: Path = collector.save(saved_file.parent / f"{saved_file.stem}_review.jsonl")
+    print(f"{len(collector)} cases need review. see {review_file.name}.")
+    return review_file
+
+
 def tidy(
     text_file: Path | str,
     clean_dust: bool = True,
@@ -112,37 +279,84 @@ def tidy(
     correct_page_number: bool = True,
     ja: bool = False,
     spacing: bool = False,
+    segment: bool = False,
     max_line: int = 10,
+    merge_above: float | None = None,
+    merge_below: float | None = None,
+    fill_policy: str | None = None,
+    paged: int | None = None,
+    journal: Path | str | None = None,
+    auto: str | None = None,
+    stage_policies: dict[str, str] = {},
+    worksheet: str | None = None,
+    learn: bool = False,
+    learn_above: float | None = None,
     dir: Path | str | None = None,
     prefix: str = "",
     suffix: str = "_cleaned",
     join_with: str = "",
     overwrite: bool = False,
+    stages: list[str] | None = None,
+    timing: bool = False,
+    learned: Optional[Learned_Decider] = None,
 ) -> Path:
+    """tidy text_file and save the output. stages run in the order of Stage, or of stages if given, see get_stages.
+    if learn is true, the suggestions are learned from the journal unless learned is given already trained, see train_decider."""
     file: Path = Path(text_file)
-    print(f"reading {file.name}.")
-    with open(str(file)) as f:
-        # get cleaned text
-        text: str = f.read()
-        ptls = Paged_Text_Lines(text)
+    dir_out: Path = file.parent if dir is None or overwrite else Path(dir)
+    name_out: str = (
+        file.name if overwrite else get_new_file_name(file=file, prefix=prefix, suffix=suffix, join_with=join_with)
+    )
+    # the worksheet of a file goes next to its output
+    mode: Optional[Worksheet_Mode] = None if worksheet is None else Worksheet_Mode(worksheet)
+    worksheet_file: Path = dir_out / f"{Path(name_out).stem}_worksheet.tsv"
+    if learn and journal is not None and learned is None:
+        learned = train_decider(journal, learn_above=learn_above)
+    collector: Optional[Review_Collector]
+    deciders, collector = make_deciders(
+        journal=journal,
+        auto=auto,
+        stage_policies=stage_policies,
+        worksheet=worksheet_file if mode == Worksheet_Mode.Import else None,
+        batch=mode is not None,
+        learned=learned if learn else None,
+    )
+    # the deciders are only those of this file while it is tidied
+    with Mediator.use_deciders(deciders):
+        print(f"reading {file.name}.")
+        ptls = Paged_Text_Lines(list(read_lines(file)))
         assert isinstance(ptls, Paged_Text_Lines)
-        ptls = apply_clean(ptls, clean_dust=clean_dust, ja=ja)
-        ptls = insert_space(ptls, spacing=spacing)
-        ptls = apply_select(ptls, select_line=select_line, max_line=max_line)
-        ptls = apply_merge(ptls, merge_line=merge_line)
-        ptls = apply_page_correct(ptls, correct_page_number)
-        text_processed: str = ptls.to_text()
-        # saving procedure
-        dir_out: Path = file.parent if dir is None else Path(dir)
-        saved_file, success = save_text(
-            text=text_processed,
-            dir_out=file.parent if overwrite else dir_out,
-            name_out=file.name
-            if overwrite
-            else get_new_file_name(file=file, prefix=prefix, suffix=suffix, join_with=join_with),
+        runners: dict[Stage, Callable[[Paged_Text_Lines], Paged_Text_Lines]] = {
+            Stage.Clean: lambda p: apply_clean(p, ja=ja),
+            Stage.Space: lambda p: insert_space(p, spacing=True, segment=segment),
+            Stage.Select: lambda p: apply_select(p, max_line=max_line),
+            Stage.Merge: lambda p: apply_merge(
+                p, merge_line=True, threshold_merge=merge_above, threshold_skip=merge_below, page_size=paged
+            ),
+            Stage.Page: lambda p: apply_page_correct(p, True, fill_policy=fill_policy, page_size=paged),
+        }
+        order: list[Stage] = get_stages(
+            stages,
+            clean_dust=clean_dust,
+            spacing=spacing,
+            select_line=select_line,
+            merge_line=merge_line,
+            correct_page_number=correct_page_number,
         )
+        ptls, timings = run_stages(ptls, [(stage, runners[stage]) for stage in order])
+        if timing:
+            print_timing(timings)
+        # exporting is a dry run. the output is made when the worksheet is imported
+        if mode == Worksheet_Mode.Export and collector is not None:
+            dir_out.mkdir(parents=True, exist_ok=True)
+            collector.export(worksheet_file)
+            print(f"{len(collector)} questions are written to {worksheet_file.name}.")
+            return worksheet_file
+        # saving procedure
+        saved_file, success = save_text(text=ptls.iter_text(), dir_out=dir_out, name_out=name_out)
         if not success:
             raise Exception(f"failed to save {str(saved_file)}.")
+        save_review(collector, saved_file)
         return saved_file
 
 
@@ -154,29 +368,141 @@ def tidy_all(
     correct_page_number: bool = True,
     ja: bool = False,
     spacing: bool = False,
+    segment: bool = False,
     max_line: int = 10,
+    merge_above: float | None = None,
+    merge_below: float | None = None,
+    fill_policy: str | None = None,
+    paged: int | None = None,
+    journal: Path | str | None = None,
+    auto: str | None = None,
+    stage_policies: dict[str, str] = {},
+    worksheet: str | None = None,
+    learn: bool = False,
+    learn_above: float | None = None,
     dirout: Path | str | None = None,
     prefix: str = "",
     suffix: str = "_cleaned",
     join_with: str = "",
     overwrite: bool = False,
-):
+    stages: list[str] | None = None,
+    timing: bool = False,
+    jobs: int = 1,
+    force: bool = False,
+) -> list[Path]:
+    """tidy every text file in dir in the order of the names. with more than one job, files are processed by that many worker processes,
+    which is possible only if nobody is asked, i.e., auto or worksheet is given. failures of a file do not stop the others in that case.
+    files tidied before with the same options are skipped unless force is true or the answers come from a journal or a worksheet,
+    see Manifest."""
     dir = Path(dir)
     if not dir.is_dir():
         raise ValueError(f"{dir} is not a directory.")
-    for file in dir.glob("*.txt"):
-        tidy(
-            text_file=file,
-            clean_dust=clean_dust,
-            select_line=select_line,
-            merge_line=merge_line,
-            correct_page_number=correct_page_number,
-            ja=ja,
-            spacing=spacing,
-            max_line=max_line,
-            dir=dirout,
-            prefix=prefix,
-            suffix=suffix,
-            join_with=join_with,
-            overwrite=overwrite,
-        )
+    files: list[Path] = sorted(dir.glob("*.txt"))
+    options: dict = dict(
+        clean_dust=clean_dust,
+        select_line=select_line,
+        merge_line=merge_line,
+        correct_page_number=correct_page_number,
+        ja=ja,
+        spacing=spacing,
+        segment=segment,
+        max_line=max_line,
+        merge_above=merge_above,
+        merge_below=merge_below,
+        fill_policy=fill_policy,
+        paged=paged,
+        journal=journal,
+        auto=auto,
+        stage_policies=stage_policies,
+        worksheet=worksheet,
+        learn=learn,
+        learn_above=learn_above,
+        dir=dirout,
+        prefix=prefix,
+        suffix=suffix,
+        join_with=join_with,
+        overwrite=overwrite,
+        stages=stages,
+        timing=timing,
+    )
+    if jobs > 1 and auto is None and worksheet is None:
+        print("questions are asked one file at a time. --jobs is ignored without --auto or --worksheet.")
+        jobs = 1
+    # exporting a worksheet makes no output to keep track of. outputs that depend on the answers in a journal or a worksheet,
+    # which the manifest does not cover, are made every time
+    manifest: Optional[Manifest] = None
+    if worksheet is None and journal is None:
+        manifest = Manifest(dir if dirout is None or overwrite else dirout)
+        for name in manifest.get_stale(files):
+            print(f"{name} is stale. its input is no longer in {dir.name}.")
+        if not force:
+            fresh: list[Path] = [file for file in files if manifest.is_fresh(file, options)]
+            if len(fresh) > 0:
+                print(
+                    f"{len(fresh)} files are unchanged since the last run and skipped. use --force to tidy them again."
+                )
+            files = [file for file in files if file not in fresh]
+    # the model is trained once and shared by every file, including those in worker processes
+    learned: Optional[Learned_Decider] = None
+    if learn and journal is not None and len(files) > 0:
+        learned = train_decider(journal, learn_above=learn_above)
+    if jobs > 1:
+        return tidy_parallel(files, jobs=jobs, options=options, manifest=manifest, learned=learned)
+    saved: list[Path] = []
+    try:
+        for file in files:
+            saved.append(tidy(text_file=file, learned=learned, **options))
+            if manifest is not None:
+                manifest.record(file, saved[-1], options)
+                manifest.checkpoint()
+    finally:
+        # files tidied before a failure are not tidied again
+        if manifest is not None and manifest.unsaved > 0:
+            manifest.save()
+    return saved
+
+
+def _tidy_captured(
+    file: Path, options: dict, learned: Optional[Learned_Decider] = None
+) -> tuple[Optional[Path], str, Optional[str]]:
+    """run tidy capturing what it prints, so that the logs of files processed at the same time do not mix.
+    an error is returned as its message instead of being raised."""
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        try:
+            return tidy(text_file=file, learned=learned, **options), log.getvalue(), None
+        except Exception as e:
+            return None, log.getvalue(), f"{type(e).__name__}: {e}"
+
+
+def tidy_parallel(
+    files: list[Path],
+    jobs: int,
+    options: dict,
+    manifest: Optional[Manifest] = None,
+    learned: Optional[Learned_Decider] = None,
+) -> list[Path]:
+    """tidy files by jobs worker processes. logs and results are reported in the order of files whatever order they finish in.
+    files that failed are reported at the end and left out of the result. files tidied are recorded to manifest if given."""
+    saved: list[Path] = []
+    failed: list[tuple[Path, str]] = []
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(_tidy_captured, file, options, learned) for file in files]
+        try:
+            for file, future in zip(files, futures):
+                saved_file, log, error = future.result()
+                print(log, end="")
+                if error is None and saved_file is not None:
+                    saved.append(saved_file)
+                    if manifest is not None:
+                        manifest.record(file, saved_file, options)
+                        manifest.checkpoint()
+                else:
+                    failed.append((file, str(error)))
+        finally:
+            if manifest is not None and manifest.unsaved > 0:
+                manifest.save()
+    for file, error in failed:
+        print(f"failed to tidy {file.name}. {error}")
+    print(f"{len(saved)} of {len(files)} files are tidied.")
+    return saved
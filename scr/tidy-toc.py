@@ -1,12 +1,35 @@
 import click
 
-from main import tidy, tidy_all
+from Decision import Policy, Worksheet_Mode
+from main import Stage, tidy, tidy_all
 from Type_Alias import Path
 
 # this file is for turning main.py into command line tool by click package.
 # just decorating core functions in main.py
 
 
+def get_stage_policies(policy: tuple[str, ...]) -> dict[str, str]:
+    """parse 'STAGE=POLICY' pairs given by --policy."""
+    stage_policies: dict[str, str] = {}
+    for pair in policy:
+        stage, sep, value = pair.partition("=")
+        if sep == "" or value not in [p.value for p in Policy]:
+            raise click.BadParameter(f"{pair} is not of the form STAGE=POLICY.", param_hint="--policy")
+        stage_policies[stage.strip()] = value
+    return stage_policies
+
+
+def get_stage_order(stages: str | None) -> list[str] | None:
+    """parse the comma separated stages given by --stages."""
+    if stages is None:
+        return None
+    order: list[str] = [stage.strip() for stage in stages.split(",") if stage.strip() != ""]
+    for stage in order:
+        if stage not in [s.value for s in Stage]:
+            raise click.BadParameter(f"{stage} is not a stage.", param_hint="--stages")
+    return order
+
+
 @click.command(help="clean OCRed ToC text data.")
 @click.argument("path", type=click.Path(exists=True))
 @click.option(
@@ -41,7 +64,7 @@ from Type_Alias import Path
     "--ja",
     type=bool,
     is_flag=True,
-    help="Japanese language mode. Currently supported only for clean method.",
+    help="Japanese language mode for clean method. headers like '第十二章' or '付録A' are recognized in the select and merge process regardless of this option.",
 )
 @click.option(
     "-a",
@@ -50,6 +73,12 @@ from Type_Alias import Path
     is_flag=True,
     help="whether to adjust spacing. This option is recommended for Japanese text.",
 )
+@click.option(
+    "--segment",
+    type=bool,
+    is_flag=True,
+    help="split glued words like 'LinearAlgebra' by word frequencies and suggest the most likely splits. will be ignored unless --adjust option is enabled.",
+)
 @click.option(
     "-l",
     "--maxline",
@@ -57,6 +86,90 @@ from Type_Alias import Path
     default=10,
     help="the number of suggested rows displayed at once in the --select process. the default uses 10. will be ignored unless --select option is enabled.",
 )
+@click.option(
+    "--merge-above",
+    type=float,
+    default=None,
+    help="pairs of rows whose merge score is at least this value are merged without asking. the default asks every pair. will be ignored unless --merge option is enabled.",
+)
+@click.option(
+    "--merge-below",
+    type=float,
+    default=None,
+    help="pairs of rows whose merge score is below this value are skipped without asking. the default asks every pair. will be ignored unless --merge option is enabled.",
+)
+@click.option(
+    "--fill",
+    type=click.Choice(["next", "previous", "between"]),
+    default=None,
+    help="fill rows of missing page number automatically with the page of the next or previous numbered row, or only if both agree ('between'). rows whose neighbors disagree are still asked. will be ignored unless --page option is enabled.",
+)
+@click.option(
+    "--paged",
+    type=click.IntRange(min=2),
+    default=None,
+    help="ask this many rows at once in the --merge and --page process, answered in a single line like '1-4 7 -3'. rows can be given a page number like '5=123'. an empty answer leaves every row as it is, and 'all' takes every row. the default asks one row at a time.",
+)
+@click.option(
+    "--stages",
+    type=str,
+    default=None,
+    help="comma separated stages to run in this order, e.g. 'clean,page,merge'. the stages are clean, space, select, merge and page. if given, the flags enabling the stages such as --clean are ignored.",
+)
+@click.option(
+    "--timing",
+    type=bool,
+    is_flag=True,
+    help="show how long each stage took, including the time spent answering, and whether it changed anything.",
+)
+@click.option(
+    "--journal",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="JSONL file to record every answer to. answers recorded there are replayed without asking when the same question comes again.",
+)
+@click.option(
+    "--auto",
+    type=click.Choice([policy.value for policy in Policy]),
+    default=None,
+    help="batch mode that never asks. every question is answered by the policy: 'trivial' only takes trivial candidates, 'longest' and 'shortest' choose among candidates by length, 'default' takes the suggestion and 'skip' leaves the row as it is. undecided cases are left as they are and listed in {output}_review.jsonl.",
+)
+@click.option(
+    "--policy",
+    type=str,
+    multiple=True,
+    help="override the --auto policy for a stage, e.g. 'Merger=skip'. the stage is the name of the asking class such as Remove_Space, Insert_Space, Merger, Fill and Correct. can be repeated.",
+)
+@click.option(
+    "--worksheet",
+    type=click.Choice([mode.value for mode in Worksheet_Mode]),
+    default=None,
+    help="review offline instead of answering prompts. 'export' writes every question into {output}_worksheet.tsv without making the output, and 'import' applies the answers filled in the answer column of it. questions left unanswered are listed in {output}_review.jsonl.",
+)
+@click.option(
+    "--learn",
+    type=bool,
+    is_flag=True,
+    help="learn from the answers recorded in --journal and suggest the likely answer as the default of every question, with its confidence. will be ignored unless --journal is given.",
+)
+@click.option(
+    "--learn-above",
+    type=click.FloatRange(min=0, max=1),
+    default=None,
+    help="suggestions learned by --learn that are at least this confident are applied without asking. the default asks every question.",
+)
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    help="the number of files processed at once when PATH is a directory. only effective with --auto or --worksheet, since otherwise questions are asked one file at a time. the default is 1.",
+)
+@click.option(
+    "--force",
+    type=bool,
+    is_flag=True,
+    help="tidy every file when PATH is a directory. the default skips files tidied before with the same options by the same code, which are recorded in .tidy-toc-manifest.json in the output directory. files are always tidied with --journal or --worksheet.",
+)
 @click.option(
     "-d",
     "--dirout",
@@ -97,13 +210,30 @@ def tidy_toc(
     page: bool,
     ja: bool,
     adjust: bool,
+    segment: bool,
     maxline: int,
+    merge_above: float | None,
+    merge_below: float | None,
+    fill: str | None,
+    paged: int | None,
+    stages: str | None,
+    timing: bool,
+    journal: str | None,
+    auto: str | None,
+    policy: tuple[str, ...],
+    worksheet: str | None,
+    learn: bool,
+    learn_above: float | None,
+    jobs: int,
+    force: bool,
     dirout: str | None,
     pre: str,
     suf: str,
     join: str,
     overwrite: bool,
 ) -> None:
+    stage_policies: dict[str, str] = get_stage_policies(policy)
+    stage_order: list[str] | None = get_stage_order(stages)
     p = Path(path)
     if p.is_file():
         tidy(
@@ -114,12 +244,25 @@ def tidy_toc(
             correct_page_number=page,
             ja=ja,
             spacing=adjust,
+            segment=segment,
             max_line=maxline,
+            merge_above=merge_above,
+            merge_below=merge_below,
+            fill_policy=fill,
+            paged=paged,
+            journal=journal,
+            auto=auto,
+            stage_policies=stage_policies,
+            worksheet=worksheet,
+            learn=learn,
+            learn_above=learn_above,
             dir=dirout,
             prefix=pre,
             suffix=suf,
             join_with=join,
             overwrite=overwrite,
+            stages=stage_order,
+            timing=timing,
         )
     elif p.is_dir():
         tidy_all(
@@ -130,12 +273,27 @@ def tidy_toc(
             correct_page_number=page,
             ja=ja,
             spacing=adjust,
+            segment=segment,
             max_line=maxline,
+            merge_above=merge_above,
+            merge_below=merge_below,
+            fill_policy=fill,
+            paged=paged,
+            journal=journal,
+            auto=auto,
+            stage_policies=stage_policies,
+            worksheet=worksheet,
+            learn=learn,
+            learn_above=learn_above,
             dirout=dirout,
             prefix=pre,
             suffix=suf,
             join_with=join,
             overwrite=overwrite,
+            stages=stage_order,
+            timing=timing,
+            jobs=jobs,
+            force=force,
         )
 
 
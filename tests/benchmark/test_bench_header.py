@@ -0,0 +1,32 @@
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(".", "scr"))
+
+import pytest
+from Spacer import Header_Aligner  # type: ignore
+from Text_Lines import Paged_Text_Lines
+
+# timings are only checked by 'pytest -m benchmark'
+pytestmark = pytest.mark.benchmark
+
+# time allowed for finding rows to align among lines of the size below, in seconds
+LATENCY_MAX: float = 0.5
+
+
+@pytest.fixture
+def data_lines_deleted() -> Paged_Text_Lines:
+    texts: list[str] = [f"{i // 10} . {i % 10} section {i}" if i % 2 == 0 else f"{i}. section {i}" for i in range(6000)]
+    # every third row is dropped as if by the earlier stages
+    return Paged_Text_Lines(texts).exclude(list(range(0, 6000, 3)))
+
+
+def test_bench_find_rows(data_lines_deleted):
+    al = Header_Aligner(lines=data_lines_deleted, sep=".", header_symbol="")
+    start: float = time.perf_counter()
+    rows = al.find_rows()
+    elapsed: float = time.perf_counter() - start
+    assert [line.idx for line in rows] == [i for i in range(6000) if i % 2 == 0 and i % 3 != 0]
+    print(f"latency = {elapsed:.6f}s")
+    assert elapsed < LATENCY_MAX
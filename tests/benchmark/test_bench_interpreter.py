@@ -0,0 +1,50 @@
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(".", "scr"))
+
+import pytest
+from Interpreter import Interpreter  # type: ignore
+
+# timings are only checked by 'pytest -m benchmark'
+pytestmark = pytest.mark.benchmark
+
+# worst-case latency allowed for checking and interpreting a single input on a screen of the size below, in seconds
+LATENCY_MAX: float = 0.01
+RANGE_SIZE: int = 5000
+
+
+@pytest.fixture
+def data_long_input() -> str:
+    random.seed(0)
+    words: list[str] = []
+    for _ in range(300):
+        x, y = random.randrange(RANGE_SIZE), random.randrange(RANGE_SIZE)
+        words.append(random.choice([f"{x}-{y}", f"-{x}", f"{x}"]))
+    return " ".join(words)
+
+
+def test_bench_interpret(data_long_input):
+    inter = Interpreter(range_size=RANGE_SIZE)
+    start: float = time.perf_counter()
+    sentence = Interpreter.Sentence(data_long_input)
+    assert inter.test_valid_length(sentence) and inter.test_valid_characters(sentence)
+    assert inter.get_invalid_words(sentence) == []
+    chosen = inter.interpret(sentence)
+    elapsed: float = time.perf_counter() - start
+    assert isinstance(chosen, set) and chosen.issubset(inter.range)
+    print(f"latency = {elapsed:.6f}s")
+    assert elapsed < LATENCY_MAX
+
+
+def test_bench_interpret_wide_range():
+    inter = Interpreter(range_size=RANGE_SIZE)
+    sentence = Interpreter.Sentence(f"0-{RANGE_SIZE - 1} -0 " * 50)
+    start: float = time.perf_counter()
+    chosen = inter.interpret(sentence)
+    elapsed: float = time.perf_counter() - start
+    assert chosen == set(range(1, RANGE_SIZE))
+    print(f"latency = {elapsed:.6f}s")
+    assert elapsed < LATENCY_MAX
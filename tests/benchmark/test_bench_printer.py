@@ -0,0 +1,50 @@
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(".", "scr"))
+
+import pytest
+from rich.console import Console
+from Text_Lines import Paged_Text_Lines, Texts_Printer
+
+# timings are only checked by 'pytest -m benchmark'
+pytestmark = pytest.mark.benchmark
+
+# rows rendered into a null console per second, at least. printing row by row gives about half of it
+THROUGHPUT_MIN: float = 8000
+
+
+@pytest.fixture
+def data_page() -> Paged_Text_Lines:
+    return Paged_Text_Lines(
+        [f"{i // 10}.{i % 10} Section of a fairly long title number {i} {i + 3}" for i in range(5000)]
+    )
+
+
+@pytest.fixture
+def null_console():
+    with open(os.devnull, "w") as f:
+        yield Console(file=f, force_terminal=True, width=120)
+
+
+def test_bench_print(data_page, null_console):
+    printer = Texts_Printer(console=null_console)
+    start: float = time.perf_counter()
+    printer.print(lines=data_page, with_page_idx=False)
+    elapsed: float = time.perf_counter() - start
+    throughput: float = len(data_page) / elapsed
+    print(f"throughput = {throughput:.0f} rows/s")
+    assert throughput > THROUGHPUT_MIN
+
+
+def test_bench_print_around(data_page, null_console):
+    printer = Texts_Printer(console=null_console)
+    rows: list[int] = list(range(0, len(data_page), 10))
+    start: float = time.perf_counter()
+    for row in rows:
+        printer.print_around(data_page, row=row, N_around=1)
+    elapsed: float = time.perf_counter() - start
+    throughput: float = 3 * len(rows) / elapsed
+    print(f"throughput = {throughput:.0f} rows/s")
+    assert throughput > THROUGHPUT_MIN / 4
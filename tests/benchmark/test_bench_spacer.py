@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(".", "scr"))
+
+import pytest
+from Spacer import Insert_Space, Remove_Space  # type: ignore
+from Text_Line import Paged_Text_Line  # type: ignore
+from Text_Lines import Paged_Text_Lines
+
+# timings are only checked by 'pytest -m benchmark'
+pytestmark = pytest.mark.benchmark
+
+# worst-case latency allowed for generating candidates of a single line, in seconds
+LATENCY_MAX: float = 0.05
+
+
+@pytest.fixture
+def data_glued_lines() -> list[str]:
+    return [
+        "IntroductionToLinearAlgebraAndMatrixTheoryWithApplications",
+        "1.1 " + "".join(["WordNumber"] * 15) + " 12",
+        "".join([chr(ord("a") + i % 26) + chr(ord("A") + i % 26) for i in range(40)]),
+    ]
+
+
+@pytest.fixture
+def data_spaced_lines() -> list[str]:
+    return [
+        " ".join("推定法の基礎理論とその応用についての考察" * 5),
+        "1.1 " + " ".join(["確率論", "の", "基礎"] * 30) + " 12",
+    ]
+
+
+def test_bench_insert_space(data_glued_lines):
+    inserter = Insert_Space(Paged_Text_Lines())
+    # load the word dictionary in advance
+    inserter._get_candidates(Paged_Text_Line(text="warmUp"))
+    worst: float = 0.0
+    for text in data_glued_lines:
+        start: float = time.perf_counter()
+        cands = inserter._get_candidates(Paged_Text_Line(text=text))
+        worst = max(worst, time.perf_counter() - start)
+        assert 0 < len(cands) <= inserter.candidates_max
+        assert " " in cands[0].text
+    print(f"worst latency per line = {worst:.6f}s")
+    assert worst < LATENCY_MAX
+
+
+def test_bench_remove_space(data_spaced_lines):
+    remover = Remove_Space(Paged_Text_Lines())
+    worst: float = 0.0
+    for text in data_spaced_lines:
+        start: float = time.perf_counter()
+        cands = remover._get_candidates(Paged_Text_Line(text=text))
+        worst = max(worst, time.perf_counter() - start)
+        assert 0 < len(cands) <= remover.candidates_max
+    print(f"worst latency per line = {worst:.6f}s")
+    assert worst < LATENCY_MAX
@@ -0,0 +1,73 @@
+import os
+import sys
+
+sys.path.append(os.path.join(".", "scr"))
+
+import click
+import pytest
+from Decision import Decision_Journal, Query
+from Filtering_Prompt import Prompt
+from Interpreter import Interpreter
+from Mediator import Mediator, Option
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = Decision_Journal(tmp_path / "journal.jsonl")
+    with Mediator.use_deciders([journal]):
+        yield journal
+
+
+def no_prompt(*args, **kwargs):
+    raise AssertionError("user should not be asked.")
+
+
+def test_query_key():
+    query = Query(stage="Remove_Space", text="推 定", candidates=("推定",))
+    assert query.get_key() == Query(stage="Remove_Space", text="推 定", candidates=("推定",), default="p").get_key()
+    assert query.get_key() != Query(stage="Insert_Space", text="推 定", candidates=("推定",)).get_key()
+    assert query.get_key() != Query(stage="Remove_Space", text="推 定", candidates=()).get_key()
+
+
+def test_journal_replay(journal):
+    query = Query(stage="Correct", text="Chapter 1 12", candidates=("Preface 3", "1.1 intro 5"))
+    assert journal.decide(query) is None
+    journal.observe(query, "+4")
+    journal.observe(query, "+4")
+    reloaded = Decision_Journal(journal.path)
+    assert len(reloaded) == 1
+    assert reloaded.decide(query) == "+4"
+    # the latest answer wins
+    journal.observe(query, "r")
+    assert Decision_Journal(journal.path).decide(query) == "r"
+
+
+def test_mediator_replay(journal, monkeypatch):
+    mediator = Mediator(public_options=[Option.Pass.value, Option.Remove.value])
+    query = Query(stage="Correct", text="Chapter 1 12")
+    monkeypatch.setattr(click, "prompt", lambda *args, **kwargs: (4, Mediator.Integer_Flag.Plus))
+    assert mediator.get_user_input(query=query) == (4, Mediator.Integer_Flag.Plus)
+    monkeypatch.setattr(click, "prompt", no_prompt)
+    assert mediator.get_user_input(query=query) == (4, Mediator.Integer_Flag.Plus)
+
+
+def test_mediator_rejects_invalid_replay(journal, monkeypatch):
+    mediator = Mediator()
+    query = Query(stage="Remove_Space", text="推 定", candidates=("推定",))
+    journal.observe(query, "5")
+    monkeypatch.setattr(click, "prompt", lambda *args, **kwargs: (0, Mediator.Integer_Flag.Normal))
+    # 5 is out of the domain, so user is asked
+    assert mediator.get_user_input(domain=range(1), query=query) == (0, Mediator.Integer_Flag.Normal)
+    assert journal.decide(query) == "0"
+
+
+def test_prompt_replay(journal, monkeypatch):
+    query = Query(stage="Filter_Lines", text="Contents\nPreface v")
+    monkeypatch.setattr(click, "prompt", lambda *args, **kwargs: "0-1")
+    prompt = Prompt()
+    prompt.prompt(inter=Interpreter(range_size=2), query=query)
+    assert prompt.get_input() == [0, 1]
+    monkeypatch.setattr(click, "prompt", no_prompt)
+    prompt = Prompt()
+    prompt.prompt(inter=Interpreter(range_size=2), query=query)
+    assert prompt.get_input() == [0, 1]
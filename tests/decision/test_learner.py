@@ -0,0 +1,86 @@
+import os
+import sys
+
+sys.path.append(os.path.join(".", "scr"))
+
+import click
+import pytest
+from Decision import Decision_Journal, Query
+from Learner import Choice_Model, Learned_Decider
+from Mediator import Mediator
+
+
+@pytest.fixture
+def spacing_decisions():
+    # longer candidates are always chosen
+    decisions = []
+    for i in range(12):
+        short, long = f"推定{i}", f"推 定 {i}"
+        candidates = (short, long) if i % 2 == 0 else (long, short)
+        query = Query(stage="Remove_Space", text=f"推 定{i}", candidates=candidates, default="p", choices=True)
+        decisions.append((query, str(candidates.index(long))))
+    return decisions
+
+
+@pytest.fixture
+def merge_decisions():
+    # rows ending with a page number are never merged
+    decisions = []
+    for i in range(10):
+        decisions.append((Query(stage="Merger", text=f"{i}.1 Introduction 12", default="yes", skip="no"), "no"))
+        decisions.append((Query(stage="Merger", text=f"{i}.1 Introduction", default="yes", skip="no"), "yes"))
+    return decisions
+
+
+def test_predict_candidate(spacing_decisions):
+    model = Choice_Model().train(spacing_decisions)
+    for candidates, expected in [(("推 論 x", "推論x"), "0"), (("推論x", "推 論 x"), "1")]:
+        query = Query(stage="Remove_Space", text="推 論x", candidates=candidates, default="p", choices=True)
+        answer, confidence = model.predict(query)
+        assert answer == expected
+        assert confidence > 0.5
+
+
+def test_predict_token(merge_decisions):
+    model = Choice_Model().train(merge_decisions)
+    assert model.predict(Query(stage="Merger", text="Appendix 99", default="yes"))[0] == "no"
+    assert model.predict(Query(stage="Merger", text="Appendix", default="yes"))[0] == "yes"
+    # unknown stage is not predicted
+    assert model.predict(Query(stage="Correct", text="Appendix", default="p")) is None
+
+
+def test_too_few_examples(merge_decisions):
+    model = Choice_Model(min_examples=100).train(merge_decisions)
+    assert model.predict(Query(stage="Merger", text="Appendix 99", default="yes")) is None
+
+
+def test_threshold(merge_decisions):
+    model = Choice_Model().train(merge_decisions)
+    query = Query(stage="Merger", text="Appendix 99", default="yes")
+    assert Learned_Decider(model).decide(query) is None
+    assert Learned_Decider(model, threshold=0.5).decide(query) == "no"
+    assert Learned_Decider(model, threshold=1.0).decide(query) is None
+    assert Learned_Decider(model).suggest(query)[0] == "no"
+
+
+def test_train_from_journal(tmp_path, merge_decisions):
+    journal = Decision_Journal(tmp_path / "journal.jsonl")
+    for query, answer in merge_decisions:
+        journal.observe(query, answer)
+    decisions = Decision_Journal(journal.path).get_decisions()
+    assert decisions == [(Query(stage=q.stage, text=q.text, default=q.default), a) for q, a in merge_decisions]
+
+
+def test_suggested_default(spacing_decisions, monkeypatch):
+    decider = Learned_Decider(Choice_Model().train(spacing_decisions))
+    query = Query(stage="Remove_Space", text="推 論x", candidates=("推論x", "推 論 x"), default="p", choices=True)
+    defaults = []
+
+    def prompt(*args, **kwargs):
+        defaults.append(kwargs["default"])
+        return kwargs["value_proc"](kwargs["default"])
+
+    monkeypatch.setattr(click, "prompt", prompt)
+    with Mediator.use_deciders([decider]):
+        assert Mediator().get_user_input(domain=range(2), query=query) == (1, Mediator.Integer_Flag.Normal)
+    assert defaults == ["1"]
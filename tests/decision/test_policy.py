@@ -0,0 +1,79 @@
+import os
+import sys
+
+sys.path.append(os.path.join(".", "scr"))
+
+import click
+import pytest
+from Decision import Policy, Policy_Decider, Query, Review_Collector
+from Filtering_Prompt import Prompt
+from Interpreter import Interpreter
+from Mediator import Mediator, Option
+
+
+@pytest.fixture
+def collector():
+    return Review_Collector()
+
+
+def no_prompt(*args, **kwargs):
+    raise AssertionError("user should not be asked.")
+
+
+@pytest.fixture
+def data_sample_policy() -> list[tuple[Policy, Query, str | None]]:
+    query = Query(stage="Remove_Space", text="推 定 量", candidates=("推定 量", "推定量"), default="p", choices=True, skip="p")
+    return [
+        (Policy.Trivial, query, None),
+        (Policy.Longest, query, "0"),
+        (Policy.Shortest, query, "1"),
+        (Policy.Default, query, "p"),
+        (Policy.Skip, query, "p"),
+        # candidates not to be chosen from
+        (Policy.Longest, Query(stage="Correct", text="Chapter 1 12", candidates=("Preface 3",)), None),
+        (Policy.Default, Query(stage="Correct", text="Chapter 1 12"), None),
+    ]
+
+
+def test_policy_decider(data_sample_policy):
+    for policy, query, answer in data_sample_policy:
+        assert Policy_Decider(policy).decide(query) == answer
+
+
+def test_stage_policy():
+    decider = Policy_Decider(Policy.Skip, stage_policies={"Merger": Policy.Default})
+    query = Query(stage="Merger", text="1.1 hello", candidates=("world 5",), default="yes", skip="no")
+    assert decider.decide(query) == "yes"
+    assert decider.get_policy("Correct") == Policy.Skip
+
+
+def test_auto_never_asks(collector, monkeypatch, tmp_path):
+    with Mediator.use_deciders([Policy_Decider(Policy.Trivial), collector]):
+        monkeypatch.setattr(click, "prompt", no_prompt)
+        mediator = Mediator(public_options=[Option.Pass.value, Option.Remove.value])
+        query = Query(stage="Correct", text="Chapter 1 12")
+        assert mediator.get_user_input(default_value="13", query=query) == (
+            Option.Pass.value,
+            Mediator.Integer_Flag.Normal,
+        )
+        prompt = Prompt()
+        prompt.prompt(inter=Interpreter(range_size=2), query=Query(stage="Filter_Lines", text="Contents\nPreface v"))
+        assert prompt.get_input() == []
+        assert len(collector) == 2
+        review = collector.save(tmp_path / "review.jsonl")
+        assert len(review.read_text(encoding="utf-8").splitlines()) == 2
+
+
+def test_invalid_answer_falls_through(collector, monkeypatch, capsys):
+    # longest answers an index out of the domain, so the next decider takes over
+    with Mediator.use_deciders([Policy_Decider(Policy.Longest), collector]):
+        monkeypatch.setattr(click, "prompt", no_prompt)
+        mediator = Mediator()
+        query = Query(stage="Remove_Space", text="推 定", candidates=("推定", "推 定 "), choices=True)
+        assert mediator.get_user_input(domain=range(1), query=query) == (
+            Option.Pass.value,
+            Mediator.Integer_Flag.Normal,
+        )
+        assert len(collector) == 1
+    # answers of deciders are not reported as if user typed them
+    assert "must be in" not in capsys.readouterr().out
@@ -0,0 +1,46 @@
+import csv
+import os
+import sys
+
+sys.path.append(os.path.join(".", "scr"))
+
+import pytest
+from Decision import Query, Review_Collector, Worksheet
+
+
+@pytest.fixture
+def data_sample_queries() -> list[tuple[Query, str]]:
+    return [
+        (Query(stage="Remove_Space", text="推 定 量", candidates=("推定 量", "推定量"), default="p", choices=True), "1"),
+        (Query(stage="Filter_Lines", text="Contents\nPreface v\n1 Introduction 1"), "0 1"),
+        (Query(stage="Merger", text="1.1 hello", candidates=("world 5",), default="yes", skip="no"), ""),
+        (Query(stage="Correct", text="Chapter 1\t12", candidates=("Preface 3", "1.1 intro 5"), default="+5"), "+5"),
+    ]
+
+
+def fill(path, answers: list[str]) -> None:
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f, delimiter="\t"))
+    for row, answer in zip(rows[1:], answers):
+        row[-1] = answer
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        csv.writer(f, delimiter="\t").writerows(rows)
+
+
+def test_worksheet_round_trip(data_sample_queries, tmp_path):
+    collector = Review_Collector()
+    for query, _ in data_sample_queries:
+        collector.decide(query)
+    path = collector.export(tmp_path / "sample_worksheet.tsv")
+    # nothing is answered before reviewers fill it
+    assert len(Worksheet(path)) == 0
+    fill(path, [answer for _, answer in data_sample_queries])
+    worksheet = Worksheet(path)
+    assert len(worksheet) == 3
+    for query, answer in data_sample_queries:
+        assert worksheet.decide(query) == (answer if answer != "" else None)
+    # candidates are numbered only if they are choices
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f, delimiter="\t"))
+    assert rows[0]["candidates"] == "0 | 推定 量\n1 | 推定量"
+    assert rows[3]["candidates"] == "Preface 3\n1.1 intro 5"
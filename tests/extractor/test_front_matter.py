@@ -0,0 +1,47 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(".", "scr"))
+from Extractor import Extractor
+from Text_Line import roman_to_int
+
+
+@pytest.fixture
+def data_roman_to_int() -> list[tuple[str, int | None]]:
+    return [
+        ("i", 1),
+        ("iv", 4),
+        ("ix", 9),
+        ("xiv", 14),
+        ("XL", 40),
+        ("iiii", None),
+        ("vx", None),
+        ("Xiv", None),
+        ("", None),
+    ]
+
+
+@pytest.fixture
+def data_front_matter() -> list[tuple[list[str], list[int]]]:
+    """sample strings for paged text line and list of row indexes that should be extracted"""
+    return [
+        (["Preface v", "Notation vii", "Contents ix", "1.1 intro 1"], []),
+        (["Preface v", "Notation iii", "Contents ix", "1.1 intro 1"], [0, 1]),
+        (["Preface v", "Notation iiii", "Contents ix", "1.1 intro 1"], [1]),
+        (["Preface v", "Notation", "Contents ix", "1.1 intro 1"], []),
+        (["1.1 intro 1", "1.2 hello 5", "1.3 world 9"], []),
+    ]
+
+
+def test_roman_to_int(data_roman_to_int):
+    for roman, ans in data_roman_to_int:
+        assert roman_to_int(roman) == ans
+
+
+def test_order_disturbing_front_pages(data_front_matter):
+    for text, idx in data_front_matter:
+        e = Extractor(text)
+        assert e.get_order_disturbing_main_pages().get_index() == idx
+        assert e.get_order_disturbing_main_pages(check_front_matter=False).get_index() == []
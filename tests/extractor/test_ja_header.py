@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(".", "scr"))
+from Extractor import Extractor
+
+
+@pytest.fixture
+def data_ja_header_order() -> list[tuple[list[str], list[int]]]:
+    """sample strings for paged text line and list of row indexes that should be extracted"""
+    return [
+        (["第一部 基礎 1", "第一章 集合 3", "第二章 写像 10", "第二部 応用 20", "第一章 位相 21"], []),
+        (["第一章 集合 3", "第1節 定義 3", "第2節 例 5", "第二章 写像 10", "第1節 定義 10"], []),
+        (["第一章 集合 3", "第三章 写像 10", "第二章 位相 21"], [2]),
+        (["第1章 集合 3", "第2節 例 5", "第1節 定義 6"], [2]),
+        (["付録A 数表 100", "付録B 公式 110", "付録A 補遺 120"], [2]),
+    ]
+
+
+def test_ja_header_order(data_ja_header_order):
+    for texts, ans in data_ja_header_order:
+        ex = Extractor(texts)
+        assert ex.get_lines_with_unexpected_header().get_index() == ans
@@ -14,37 +14,47 @@ from Interpreter import Interpreter  # type: ignore
 #
 
 
+def get_tokens(inp: Interpreter, text: str) -> list[Interpreter.Token]:
+    return inp._tokenize(Interpreter.Sentence(text))
+
+
 def test_get_digit(digit_ok):
     inp = Interpreter(range_size=100)
     for d in digit_ok:
-        assert inp._get_matched_integers(Interpreter.Digit, Interpreter.Word(d.data)) == [int(d.data)]
+        [token] = get_tokens(inp, d.data)
+        assert token.kind == "digit"
+        assert [int(token.match.group(call)) for call in Interpreter.Digit.calls] == [int(d.data)]
 
 
 def test_get_minus(minus_ok):
     inp = Interpreter(range_size=100)
     for d in minus_ok:
-        assert inp._get_matched_integers(Interpreter.Minus, Interpreter.Word(d.data)) == d.res
+        [token] = get_tokens(inp, d.data)
+        assert token.kind == "minus"
+        assert [int(token.match.group(call)) for call in Interpreter.Minus.calls] == d.res
 
 
 def test_get_range(range_ok):
     inp = Interpreter(range_size=100)
     for d in range_ok:
-        assert inp._get_matched_integers(Interpreter.Range, Interpreter.Word(d.data)) == d.res
+        [token] = get_tokens(inp, d.data)
+        assert token.kind == "range"
+        assert [int(token.match.group(call)) for call in Interpreter.Range.calls] == d.res
 
 
-def test_get_phrase_all(constants, all_ok):
+def test_get_phrase_all(all_ok):
     inp = Interpreter(range_size=100)
     for d in all_ok:
-        assert inp._get_matched_phrase(Interpreter.Word(d.data)) == constants.name_all
+        assert [token.kind for token in get_tokens(inp, d.data)] == ["all"]
 
 
-def test_get_phrase_none(constants, none_ok):
+def test_get_phrase_none(none_ok):
     inp = Interpreter(range_size=100)
     for d in none_ok:
-        assert inp._get_matched_phrase(Interpreter.Word(d.data)) == constants.name_none
+        assert [token.kind for token in get_tokens(inp, d.data)] == ["none"]
 
 
-def test_get_phrase_help(constants, help_ok):
+def test_get_phrase_help(help_ok):
     inp = Interpreter(range_size=100)
     for d in help_ok:
-        assert inp._get_matched_phrase(Interpreter.Word(d.data)) == constants.name_help
+        assert [token.kind for token in get_tokens(inp, d.data)] == ["help"]
@@ -23,7 +23,7 @@ def test_interpret_phrase_all(all_ok):
         for a in all_ok:
             inp = Interpreter(range_size=m)
             w = Interpreter.Word(a.data)
-            assert inp._interpret_phrase(w) == inp.range
+            assert inp._interpret(Interpreter.Sentence(w)) == inp.range
 
 
 def test_interpret_phrase_none(none_ok):
@@ -31,15 +31,24 @@ def test_interpret_phrase_none(none_ok):
         for a in none_ok:
             inp = Interpreter(range_size=m)
             w = Interpreter.Word(a.data)
-            assert inp._interpret_phrase(w) == set()
+            assert inp._interpret(Interpreter.Sentence(w)) == set()
 
 
 def test_interpret_phrase_ng(integer_data, help_ok, ng):
+    # none of them is taken as a phrase choosing all or none of the numbers
     for a in integer_data + help_ok + ng:
+        w = Interpreter.Word(a.data)
+        inp = Interpreter(range_size=10)
+        assert all(token.kind not in ["all", "none"] for token in inp._tokenize(Interpreter.Sentence(w)))
+
+
+def test_interpret_ng(help_ok, ng):
+    # help is not a set of integers, see interpret
+    for a in help_ok + ng:
         w = Interpreter.Word(a.data)
         inp = Interpreter(range_size=10)
         with pytest.raises(Exception):
-            inp._interpret_phrase(w)
+            inp._interpret(Interpreter.Sentence(w))
 
 
 def test_interpret_digit_wrt_empty_set(digit_ok):
@@ -48,10 +57,10 @@ def test_interpret_digit_wrt_empty_set(digit_ok):
     for d in digit_ok:
         w = Interpreter.Word(d.data)
         digit = int(d.data)
-        set_added = inp._interpret_digit_pattern(word=w)
+        set_added = inp._interpret(Interpreter.Sentence(w))
         assert set_added == {digit}
         # add again should cause no change
-        assert inp._interpret_digit_pattern(word=w, wrt=set_added) == {digit}
+        assert inp._interpret(Interpreter.Sentence(w), wrt=set_added) == {digit}
 
 
 def test_interpret_minus_wrt_range(minus_ok):
@@ -61,11 +70,11 @@ def test_interpret_minus_wrt_range(minus_ok):
         w = Interpreter.Word(d.data)
         inp = Interpreter(range_size=M)
         # interpret minus pattern to range
-        set_removed: set[int] = inp._interpret_minus_pattern(word=w, wrt=inp.range)
+        set_removed: set[int] = inp._interpret(Interpreter.Sentence(w), wrt=inp.range)
         # now the element is removed
         assert d_int not in set_removed
         # remove again should have no effect
-        assert inp._interpret_minus_pattern(word=w, wrt=set_removed) == set_removed
+        assert inp._interpret(Interpreter.Sentence(w), wrt=set_removed) == set_removed
 
 
 def test_interpret_range_wrt_empty_set(range_ok):
@@ -78,4 +87,4 @@ def test_interpret_range_wrt_empty_set(range_ok):
             w = Interpreter.Word(d.data)
             inp = Interpreter(range_size=M)
             # coincides with [dmin,dmax]
-            assert set(range(d_min, d_max + 1)) == inp._interpret_range_pattern(word=w)
+            assert set(range(d_min, d_max + 1)) == inp._interpret(Interpreter.Sentence(w))
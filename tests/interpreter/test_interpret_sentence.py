@@ -218,3 +218,27 @@ def test_interpret_ok_mixed():
             s = Interpreter.Sentence(data)
             print(s)
             assert sorted(inp._interpret(s)) == ans
+
+
+@pytest.fixture
+def data_assign() -> list[tuple[str, set[int], dict[int, str]]]:
+    return [
+        ("1-4 7 -3 5=123", {1, 2, 4, 7}, {5: "123"}),
+        ("5=123", set(), {5: "123"}),
+        ("a 2=+40 2=41", set(range(10)), {2: "41"}),
+    ]
+
+
+def test_assign(data_assign):
+    inter = Interpreter(range_size=10, allow_assign=True)
+    for text, ans, assignments in data_assign:
+        sentence = Interpreter.Sentence(text)
+        assert inter.test_valid_characters(sentence)
+        assert inter.get_invalid_words(sentence) == []
+        assert inter.interpret(sentence) == ans
+        assert inter.get_assignments(sentence) == assignments
+    # not allowed by default
+    inter = Interpreter(range_size=10)
+    sentence = Interpreter.Sentence("5=123")
+    assert not inter.test_valid_characters(sentence)
+    assert inter.get_assignments(sentence) == {}
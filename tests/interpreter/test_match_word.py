@@ -1,6 +1,5 @@
 import os
 import sys
-from re import Pattern
 
 import pytest
 
@@ -73,34 +72,20 @@ def test_test_match_range_ng(constants, digit_ok, minus_ok, ng):
         assert not inp._test_match(constants.pat_range, Interpreter.Word(s))
 
 
-def test_test_match_any_ok(constants, phrase_data, integer_data):
+def test_test_match_any_ok(phrase_data, integer_data):
+    # every kind of words is told by the single pattern
     inp = Interpreter(range_size=10)
-    pat_any: list[Pattern] = [
-        constants.pat_none,
-        constants.pat_all,
-        constants.pat_help,
-        constants.pat_digit,
-        constants.pat_minus,
-        constants.pat_range,
-    ]
     ok_sample: list[str] = [d.data for d in (phrase_data + integer_data)]
     for word in ok_sample:
-        assert inp._test_match_by(pats=pat_any, word=Interpreter.Word(word))
+        assert inp.pat_token.fullmatch(Interpreter.Word(word)) is not None
 
 
-def test_match_any_ng(constants, ng):
+def test_match_any_ng(ng):
+    # every kind of words is told by the single pattern
     inp = Interpreter(range_size=10)
-    pat_any: list[Pattern] = [
-        constants.pat_none,
-        constants.pat_all,
-        constants.pat_help,
-        constants.pat_digit,
-        constants.pat_minus,
-        constants.pat_range,
-    ]
     ng_sample: list[str] = [d.data for d in ng]
     for word in ng_sample:
-        assert not inp._test_match_by(pats=pat_any, word=Interpreter.Word(word))
+        assert inp.pat_token.fullmatch(Interpreter.Word(word)) is None
 
 
 def test_test_match_none_ok(constants, none_ok):
@@ -135,4 +120,4 @@ def test_exsist_dominant_phrase_ok(help_ok):
     inp = Interpreter(range_size=10)
     ok_sample: list[str] = [d.data for d in help_ok]
     for s in ok_sample:
-        assert inp._exist_dominant_phrase(Interpreter.Sentence(s))
+        assert inp.interpret(Interpreter.Sentence(s)) == Interpreter.Phrase.Name.HELP
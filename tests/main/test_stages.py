@@ -0,0 +1,49 @@
+import os
+import sys
+
+sys.path.append(os.path.join(".", "scr"))
+
+from Decision import Policy, Policy_Decider, Review_Collector
+from main import Stage, apply_clean, apply_merge, apply_page_correct, get_stages, insert_space, run_stages
+from Mediator import Mediator
+from Page_Corrector import rebuild
+from Text_Lines import Paged_Text_Lines
+
+
+def test_get_stages():
+    assert get_stages() == [Stage.Clean, Stage.Select, Stage.Merge, Stage.Page]
+    assert get_stages(clean_dust=False, spacing=True, merge_line=False) == [Stage.Space, Stage.Select, Stage.Page]
+    assert get_stages(["page", "clean"], clean_dust=False) == [Stage.Page, Stage.Clean]
+
+
+def test_run_stages():
+    ptls = Paged_Text_Lines(["1 Introduction 1", "2 Basics 3"])
+    dropped = Paged_Text_Lines(["1 Introduction 1"])
+    ptls_out, timings = run_stages(ptls, [(Stage.Merge, lambda p: p), (Stage.Select, lambda p: dropped)])
+    assert ptls_out is dropped
+    assert [(t.stage, t.rows_in, t.rows_out, t.changed) for t in timings] == [
+        (Stage.Merge, 2, 2, False),
+        (Stage.Select, 2, 1, True),
+    ]
+    assert all(t.seconds >= 0 for t in timings)
+
+
+def test_no_change_keeps_rows():
+    ptls = Paged_Text_Lines(["1 Introduction 1", "2 Basics 3", "3 Advanced 5"])
+    assert ptls.remove_blank_rows() is ptls
+    assert ptls.format_space() is ptls
+    assert Paged_Text_Lines(["1  Introduction 1"]).format_space().to_list_str() == ["1 Introduction 1"]
+    assert rebuild(ptls, [], []) is ptls
+    assert rebuild(ptls, [], [0]).to_list_str() == ["2 Basics 3", "3 Advanced 5"]
+    # nothing to ask in a well numbered toc
+    assert apply_merge(ptls, merge_line=True) is ptls
+    assert apply_page_correct(ptls, correct_page=True) is ptls
+
+
+def test_clean_toc_unchanged():
+    ptls = Paged_Text_Lines(["1 Introduction 1", "2 Basics 3", "3 Advanced 5"])
+    runners = [(Stage.Clean, apply_clean), (Stage.Space, lambda p: insert_space(p, spacing=True))]
+    with Mediator.use_deciders([Policy_Decider(Policy.Default), Review_Collector()]):
+        ptls_out, timings = run_stages(ptls, runners)
+    assert ptls_out is ptls
+    assert [t.changed for t in timings] == [False, False]
@@ -0,0 +1,101 @@
+import os
+import sys
+
+sys.path.append(os.path.join(".", "scr"))
+
+import pytest
+from Learner import Choice_Model
+from main import tidy, tidy_all
+from Manifest import Manifest
+from Mediator import Mediator
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    dir = tmp_path / "in"
+    dir.mkdir()
+    with open(os.path.join("sample", "sample_merge_page.txt")) as f:
+        rows = f.read().splitlines()
+    for i in range(3):
+        (dir / f"toc{i}.txt").write_text("\n".join(rows[10 * i : 10 * i + 20]) + "\n")
+    # not decodable, which fails alone
+    (dir / "broken.txt").write_bytes(b"\xff\xfe\xfa")
+    return dir
+
+
+def test_jobs_match_sequential(corpus, tmp_path, capsys):
+    saved = tidy_all(corpus, auto="skip", dirout=tmp_path / "par", jobs=2)
+    assert [p.name for p in saved] == [f"toc{i}_cleaned.txt" for i in range(3)]
+    out = capsys.readouterr().out
+    assert "failed to tidy broken.txt." in out
+    # logs are in the order of files
+    assert out.index("reading toc0.txt") < out.index("reading toc1.txt") < out.index("reading toc2.txt")
+    for i in range(3):
+        expected = tidy(corpus / f"toc{i}.txt", auto="skip", dir=tmp_path / "seq")
+        assert saved[i].read_text() == expected.read_text()
+
+
+def test_jobs_need_batch(corpus, tmp_path, capsys):
+    (corpus / "broken.txt").unlink()
+    saved = tidy_all(corpus, clean_dust=False, select_line=False, merge_line=False, correct_page_number=False, jobs=2)
+    assert len(saved) == 3
+    assert "--jobs is ignored" in capsys.readouterr().out
+
+
+def test_incremental(corpus, tmp_path, capsys):
+    (corpus / "broken.txt").unlink()
+    out = tmp_path / "out"
+    assert len(tidy_all(corpus, auto="skip", dirout=out)) == 3
+    assert tidy_all(corpus, auto="skip", dirout=out) == []
+    assert "3 files are unchanged" in capsys.readouterr().out
+    # changed input, options and output are tidied again
+    (corpus / "toc0.txt").write_text("1.1 Introduction 1\n")
+    assert [p.name for p in tidy_all(corpus, auto="skip", dirout=out)] == ["toc0_cleaned.txt"]
+    (out / "toc1_cleaned.txt").write_text("edited\n")
+    assert [p.name for p in tidy_all(corpus, auto="skip", dirout=out)] == ["toc1_cleaned.txt"]
+    assert len(tidy_all(corpus, auto="default", dirout=out)) == 3
+    assert len(tidy_all(corpus, auto="default", dirout=out, force=True)) == 3
+    (corpus / "toc2.txt").unlink()
+    capsys.readouterr()
+    assert tidy_all(corpus, auto="default", dirout=out) == []
+    assert "toc2_cleaned.txt is stale" in capsys.readouterr().out
+
+
+def test_deciders_restored(corpus, tmp_path):
+    tidy(corpus / "toc0.txt", auto="skip", dir=tmp_path / "out")
+    assert Mediator.deciders == []
+
+
+def test_learned_once(corpus, tmp_path, monkeypatch):
+    (corpus / "broken.txt").unlink()
+    trained = []
+    train = Choice_Model.train
+
+    def counted(self, decisions):
+        trained.append(len(decisions))
+        return train(self, decisions)
+
+    monkeypatch.setattr(Choice_Model, "train", counted)
+    journal = tmp_path / "journal.jsonl"
+    assert len(tidy_all(corpus, auto="skip", journal=journal, learn=True, dirout=tmp_path / "out")) == 3
+    assert len(trained) == 1
+
+
+def test_manifest_recovers(corpus, tmp_path, capsys):
+    (corpus / "broken.txt").unlink()
+    out = tmp_path / "out"
+    assert len(tidy_all(corpus, auto="skip", dirout=out)) == 3
+    assert [p.name for p in out.iterdir() if p.name.startswith(Manifest.file_name)] == [Manifest.file_name]
+    # a broken manifest is taken as empty
+    (out / Manifest.file_name).write_text('{"toc0.txt": {"key"')
+    assert len(tidy_all(corpus, auto="skip", dirout=out)) == 3
+    assert tidy_all(corpus, auto="skip", dirout=out) == []
+
+
+def test_journal_bypasses_manifest(corpus, tmp_path):
+    (corpus / "broken.txt").unlink()
+    out = tmp_path / "out"
+    journal = tmp_path / "journal.jsonl"
+    assert len(tidy_all(corpus, auto="skip", journal=journal, dirout=out)) == 3
+    assert len(tidy_all(corpus, auto="skip", journal=journal, dirout=out)) == 3
+    assert not (out / Manifest.file_name).exists()
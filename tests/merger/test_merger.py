@@ -81,7 +81,103 @@ def test_merge(data_merge):
     for idx, s, text, page in data_merge:
         ptls = to_ptls(idx, s)
         mer = Merger(ptls)
-        merged = mer._merge(ptls[0], ptls[1])
+        merged = mer._merge_chain([ptls[0], ptls[1]])
         print(merged)
         assert merged.text == text
         assert merged.page_number == page
+
+
+@pytest.fixture
+def data_merge_chain() -> list[tuple[list[str], list[tuple[int, int]], list[str], list[int]]]:
+    """input text + expected chains + expected text and idx after merging every chain"""
+    return [
+        (["1.1 hello", "world 5"], [(0, 1)], ["1.1 hello world 5"], [0]),
+        (
+            ["1.1 a title split", "across three", "rows 12", "1.2 next 13"],
+            [(0, 2)],
+            ["1.1 a title split across three rows 12", "1.2 next 13"],
+            [0, 3],
+        ),
+        (["1.1 hello 3", "1.2 world 5"], [], ["1.1 hello 3", "1.2 world 5"], [0, 1]),
+        (
+            ["A. hello", "world 14", "B. foo", "bar 15"],
+            [(0, 1), (2, 3)],
+            ["A. hello world 14", "B. foo bar 15"],
+            [0, 2],
+        ),
+    ]
+
+
+def test_merge_chain(data_merge_chain):
+    for s, chains, text, idx in data_merge_chain:
+        ptls = to_ptls(list(range(len(s))), s)
+        mer = Merger(ptls)
+        links = mer.get_links()
+        assert mer.get_chains(links) == chains
+        merged = mer.apply_links(links)
+        assert merged.to_list_str() == text
+        assert merged.get_index() == idx
+
+
+def test_merge_chain_reuses_page():
+    ptls = to_ptls([3, 7, 9], ["1.1 a title split", "across three", "rows 12"])
+    merged = Merger(ptls).apply_links([True, True])
+    assert len(merged) == 1
+    assert merged[0].idx == 3
+    assert merged[0].page_number == 12
+    assert merged[0].header == ptls[0].header
+
+
+@pytest.fixture
+def data_merge_score() -> list[list[str]]:
+    """pairs of rows whose scores are in the increasing order"""
+    return [
+        ["Chapter 1. hello", "World 15"],
+        ["1.1 hello", "world 15"],
+        ["1.1 hello", "15"],
+        ["1.1 Approxi-", "mation 15"],
+    ]
+
+
+def test_merge_score(data_merge_score):
+    scores: list[float] = []
+    for s in data_merge_score:
+        mer = Merger(to_ptls([0, 1], s))
+        features = mer.get_features()
+        assert len(features) == 1
+        scores.append(mer.score(features[0]))
+    assert scores == sorted(scores)
+
+
+def test_merge_by_threshold():
+    ptls = to_ptls([0, 1, 2, 3], ["1.1 Approxi-", "mation 15", "1.2 hello", "World 16"])
+    mer = Merger(ptls, threshold_merge=3.0, threshold_skip=2.0)
+    merged = mer.get_merged_lines()
+    assert merged.to_list_str() == ["1.1 Approxi- mation 15", "1.2 hello", "World 16"]
+
+
+def test_merge_links_ja_header():
+    ptls = to_ptls([0, 1, 2, 3], ["第1章 集合と", "第2章 写像 10", "第3節 位相の", "基礎 21"])
+    # a row starting with japanese header is never merged into the previous one
+    assert Merger(ptls).get_links() == [False, False, True]
+
+
+def test_merge_paged(monkeypatch):
+    import click
+
+    ptls = to_ptls([0, 1, 2, 3, 4, 5], ["1.1 hello", "World 15", "1.2 foo", "bar 16", "1.3 baz", "qux 17"])
+    mer = Merger(ptls, page_size=2)
+    # two screens for three pairs
+    answers = iter(["0", "a"])
+    monkeypatch.setattr(click, "prompt", lambda *args, **kwargs: next(answers))
+    merged = mer.get_merged_lines()
+    assert merged.to_list_str() == ["1.1 hello World 15", "1.2 foo", "bar 16", "1.3 baz qux 17"]
+
+
+def test_merge_paged_default(monkeypatch):
+    import click
+
+    ptls = to_ptls([0, 1, 2, 3], ["1.1 hello", "World 15", "1.2 foo", "bar 16"])
+    # pressing Enter merges nothing
+    monkeypatch.setattr(click, "prompt", lambda *args, **kwargs: kwargs["default"])
+    assert Merger(ptls, page_size=3).get_merged_lines().to_list_str() == ptls.to_list_str()
@@ -0,0 +1,110 @@
+import os
+import sys
+
+sys.path.append(os.path.join(".", "scr"))
+
+import pytest
+from Page_Corrector import Fill, Fill_Policy, Suggester
+from Text_Line import Paged_Text_Line
+from Text_Lines import Paged_Text_Lines
+
+
+def to_ptls(texts: list[str]) -> Paged_Text_Lines:
+    return Paged_Text_Lines([Paged_Text_Line(i * 2, s) for i, s in enumerate(texts)])
+
+
+@pytest.fixture
+def data_suggest() -> list[tuple[list[str], int, int, str]]:
+    """texts + positional index of the asked row + radius + expected suggestion"""
+    return [
+        (["a 3", "b", "c 5"], 1, 1, "5"),
+        (["a 3", "b", "c"], 1, 1, "3"),
+        (["a", "b", "c"], 1, 1, "p"),
+        (["a 3", "b", "c", "d 7"], 1, 1, "3"),
+        (["a", "b", "c", "d 7"], 1, 1, "p"),
+        (["a", "b", "c", "d 7"], 1, 2, "7"),
+        (["a 3", "b", "c", "d", "e 7"], 2, 2, "7"),
+        (["a 3", "b", "c", "d", "e", "f 7"], 2, 2, "3"),
+        (["a", "b 4"], 1, 1, "p"),
+        (["a ix", "b", "c x"], 1, 1, "p"),
+    ]
+
+
+def test_suggest(data_suggest):
+    for texts, pos, radius, ans in data_suggest:
+        ptls = to_ptls(texts)
+        sug = Suggester(lines_ref=ptls, radius=radius)
+        assert sug.suggest(ptls[pos]) == ans
+
+
+def test_suggest_not_found():
+    ptls = to_ptls(["a 3", "b", "c 5"])
+    sug = Suggester(lines_ref=ptls)
+    assert sug.suggest(Paged_Text_Line(idx=1, text="x")) == sug.default_value
+
+
+@pytest.fixture
+def data_interpolate() -> list[tuple[list[str], Fill_Policy, list[int | None]]]:
+    """texts + policy + expected page number of each row"""
+    return [
+        (["Part One", "Chapter One", "1.1 a 3", "1.2 b 5"], Fill_Policy.Next, [3, 3, 3, 5]),
+        (["1.1 a 3", "Exercises", "1.2 b 5"], Fill_Policy.Previous, [3, 3, 5]),
+        (["1.1 a 3", "Exercises", "1.2 b 5"], Fill_Policy.Between, [3, None, 5]),
+        (["1.1 a 3", "Exercises", "1.2 b 3"], Fill_Policy.Between, [3, 3, 3]),
+        (["1.1 a 8", "Chapter Two", "2.1 b 5"], Fill_Policy.Next, [8, None, 5]),
+        (["Chapter One"], Fill_Policy.Next, [None]),
+    ]
+
+
+def test_interpolate(data_interpolate):
+    for texts, policy, ans in data_interpolate:
+        ptls = to_ptls(texts)
+        blank = Paged_Text_Lines([line for line in ptls if not line.is_page_set()])
+        filler = Fill(lines_blank_page_number=blank, lines_ref=ptls, policy=policy)
+        filled, undecided = filler.interpolate(policy)
+        assert len(filled) + len(undecided) == len(blank)
+        assert all(line.page_number is None for line in undecided)
+        assert [line.page_number for line in ptls] == ans
+
+
+def test_fill_paged(monkeypatch):
+    import click
+
+    ptls = to_ptls(["1.1 a 3", "Exercises", "1.2 b 5", "Chapter Two", "2.1 c 9"])
+    blank = Paged_Text_Lines([line for line in ptls if not line.is_page_set()])
+    filler = Fill(lines_blank_page_number=blank, lines_ref=ptls, page_size=5)
+    # the first takes its suggestion and the second is set by hand, in a single answer
+    answers = iter(["0 1=+8"])
+    monkeypatch.setattr(click, "prompt", lambda *args, **kwargs: next(answers))
+    filled = filler.get_filled_lines()
+    assert [line.page_number for line in filled] == [3, 5, 5, 8, 9]
+
+
+def test_correct_paged(monkeypatch):
+    import click
+    from Page_Corrector import Correct
+
+    ptls = to_ptls(["1.1 a 3", "Chapter 2 12", "2.1 b 5", "2.2 c 80", "2.3 d 7"])
+    strange = Paged_Text_Lines([ptls[1], ptls[3]])
+    corrector = Correct(lines_strange_page_number=strange, lines_ref=ptls, page_size=3)
+    answers = iter(["0 1=6"])
+    monkeypatch.setattr(click, "prompt", lambda *args, **kwargs: next(answers))
+    corrected = corrector.get_corrected_lines()
+    # a chapter row takes the suggested page with its own number kept in text
+    assert [line.text for line in corrected] == ["1.1 a", "Chapter 2 12", "2.1 b", "2.2 c", "2.3 d"]
+    assert [line.page_number for line in corrected] == [3, 5, 5, 6, 7]
+
+
+def test_short_page_rejects_out_of_range(monkeypatch):
+    import click
+    from Page_Corrector import Correct
+
+    ptls = to_ptls(["1.1 a 3", "Chapter 2 12", "2.1 b 5", "2.2 c 80", "2.3 d 7"])
+    strange = Paged_Text_Lines([ptls[1], ptls[3]])
+    corrector = Correct(lines_strange_page_number=strange, lines_ref=ptls, page_size=3)
+    # only two rows are shown, so row 2 is asked again instead of being dropped
+    answers = iter(["2=9", "1=6"])
+    monkeypatch.setattr(click, "prompt", lambda *args, **kwargs: next(answers))
+    corrected = corrector.get_corrected_lines()
+    assert [line.page_number for line in corrected] == [3, 12, 5, 6, 7]
+    assert next(answers, None) is None
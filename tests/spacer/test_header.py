@@ -1,5 +1,6 @@
 import os
 import sys
+import time
 
 sys.path.append(os.path.join(".", "scr"))
 import pytest
@@ -8,7 +9,7 @@ import regex
 # from scr.Spacer import Candidate, Header_Aligner, Insert_Space, Remove_Space
 # from scr.Text_Line import Paged_Text_Line
 # from scr.Text_Lines import Paged_Text_Lines
-from Spacer import Candidate, Header_Aligner, Insert_Space, Remove_Space  # type: ignore
+from Spacer import Candidate, Header_Aligner, Header_Symbol_Detecter, Insert_Space, Remove_Space  # type: ignore
 from Text_Line import Paged_Text_Line  # type: ignore
 from Text_Lines import Paged_Text_Lines
 
@@ -80,6 +81,11 @@ def data_is_digit_place_undecidable() -> list[tuple[str, bool]]:
     ]
 
 
+@pytest.fixture
+def data_header_histogram() -> str:
+    return "\n".join(["§1. 集合と写像 1", "§1.1 集合 3", "§ 2, 写像 5", "1.1 hoge 7", " 3-1 piyo 11", "(1) foo 14", "a"])
+
+
 def test_aligned(data_well_aligned):
     for text, ans in data_well_aligned:
         al = Header_Aligner(lines=Paged_Text_Lines(text), sep=".", header_symbol="§")
@@ -111,3 +117,63 @@ def test_is_digit_place_undecidable(data_is_digit_place_undecidable):
     for text, ans in data_is_digit_place_undecidable:
         al = Header_Aligner(lines=Paged_Text_Lines(text), sep=".", header_symbol="")
         assert al._is_digit_place_undecidable(text) == ans
+
+
+def test_header_histogram(data_header_histogram):
+    detecter = Header_Symbol_Detecter(Paged_Text_Lines(data_header_histogram))
+    histogram = detecter.get_histogram()
+    assert detecter.get_header_symbol_frequency() == {"": 0, "§": 3, "1": 1, "(": 1}
+    assert detecter.get_header_sep_frequency("§") == {"": 0, ".": 2, ",": 1}
+    assert detecter.get_header_sep_frequency(None) == {"": 0, ".": 1, "-": 1}
+    assert detecter.get_header_sep_frequency("(") == {"": 0, ")": 1}
+    assert detecter.get_idx_symboled() == [0, 1, 2, 3, 5]
+    # served from the same histogram as long as nothing changes
+    assert detecter.get_histogram() is histogram
+    detecter.sep_symbol = "-"
+    detecter.pat_leading_symbol = detecter._get_pat_leading_symbol()
+    assert detecter.get_histogram() is not histogram
+
+
+def test_raw_candidates_memoized(data_test_raw_cands):
+    al = Header_Aligner(lines=Paged_Text_Lines(), sep=".", header_symbol="")
+    for text, ans in data_test_raw_cands:
+        assert ans in al._get_raw_candidates(Paged_Text_Line(text=text))
+    # rows of the same header share candidates
+    assert al._get_raw_candidates(Paged_Text_Line(text="1 , 2-dom")) == {
+        c.replace("dim", "dom") for c in al._get_raw_candidates(Paged_Text_Line(text="1 , 2-dim"))
+    }
+    assert ("1 , 2", True) in al._raw_candidates
+    # memoized candidates agree with those expanded from scratch
+    for text in ["12a3 b", "12a 3c", "1 , 2-dim", "§1 . hoge"]:
+        assert al._get_raw_candidates(Paged_Text_Line(text=text)) == al._expand_raw_candidates(text)
+
+
+def test_find_rows_after_deletion():
+    text: str = "\n".join(["Contents", "hoge", "§ 1. 集合と写像", "fuga", "§2.1 . 位相", "§3. 完備性"])
+    # rows dropped by earlier stages leave gaps in row numbers
+    lines = Paged_Text_Lines(text).exclude([0, 1, 3])
+    al = Header_Aligner(lines=lines, sep=".", header_symbol="§")
+    assert [line.idx for line in al.find_rows()] == [2, 4]
+
+
+def test_ignore_discards_prefetched():
+    from Decision import Decider
+    from Mediator import Mediator
+
+    class Ignore_All(Decider):
+        def __init__(self) -> None:
+            self.asked: list[str] = []
+
+        def decide(self, query):
+            # user takes a while to answer, during which the next rows are prefetched
+            time.sleep(0.05)
+            self.asked.append(query.text)
+            return "i"
+
+    decider = Ignore_All()
+    with Mediator.use_deciders([decider]):
+        al = Header_Aligner(lines=Paged_Text_Lines("§ 1, x 1\n§ 2, y 3\n§ 3, z 5"), sep=".", header_symbol="§")
+        al.align_header()
+    # the rest of rows are ignorable once the first one is ignored
+    assert decider.asked == ["§ 1, x"]
+    assert al.ignore == {"§"}
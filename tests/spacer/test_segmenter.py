@@ -0,0 +1,57 @@
+import os
+import sys
+
+sys.path.append(os.path.join(".", "scr"))
+
+import pytest
+from Segmenter import Word_Segmenter  # type: ignore
+from Spacer import Insert_Space  # type: ignore
+from Text_Line import Paged_Text_Line  # type: ignore
+from Text_Lines import Paged_Text_Lines
+
+
+@pytest.fixture
+def data_sample_segment() -> list[tuple[str, tuple[str, ...]]]:
+    return [
+        ("LinearAlgebra", ("Linear", "Algebra")),
+        ("theoryofgames", ("theory", "of", "games")),
+        ("IntroductionToLinearAlgebra", ("Introduction", "To", "Linear", "Algebra")),
+        ("Algebra", ("Algebra",)),
+    ]
+
+
+@pytest.fixture
+def data_sample_candidates_segment() -> list[tuple[str, str]]:
+    return [
+        ("1.3.2 答えにくい質問 (sensitiveQuestions) 9", "1.3.2 答えにくい質問 (sensitive Questions)"),
+        ("1.3 1927年, RandomSamplingNumbersの本が出版される 7", "1.3 1927年, Random Sampling Numbersの本が出版される"),
+        ("3.5.1 Berkson'sBias 35", "3.5.1 Berkson's Bias"),
+        ("4 ProbabilityTheoryAndBrownianMotion 88", "4 Probability Theory And Brownian Motion"),
+    ]
+
+
+def test_segment(data_sample_segment):
+    segmenter = Word_Segmenter()
+    for token, words in data_sample_segment:
+        segs = segmenter.segment(token)
+        assert 0 < len(segs) <= segmenter.top_k
+        assert segs[0].words == words
+        assert segs == sorted(segs, reverse=True)
+
+
+def test_segment_memoized():
+    segmenter = Word_Segmenter()
+    first = segmenter.segment("LinearAlgebra")
+    assert segmenter.segment("LinearAlgebra") is first
+    segmenter.clear()
+    assert segmenter.segment("LinearAlgebra") is not first
+    assert segmenter.segment("") == []
+
+
+def test_candidates_segment(data_sample_candidates_segment):
+    inserter = Insert_Space(Paged_Text_Lines(), segmenter=Word_Segmenter())
+    for sample, cand in data_sample_candidates_segment:
+        line = Paged_Text_Line(text=sample)
+        cands: list[str] = [c.text for c in inserter._get_candidates(line)]
+        assert cands[0] == cand
+        assert line.text not in cands
@@ -3,6 +3,8 @@ import sys
 
 sys.path.append(os.path.join(".", "scr"))
 
+import threading
+
 import pytest
 
 # from scr.Text_Line import Paged_Text_Line
@@ -35,6 +37,14 @@ def data_sample_candidates_remove_pass() -> list[str]:
     return ["第I章 実数と連続", "第x節 実数と連続", "第I部 実数と連続"]
 
 
+@pytest.fixture
+def data_sample_candidates_remove_ranked() -> list[tuple[str, list[str]]]:
+    return [
+        ("推 定 法 の 基 礎 理 論", ["推定法の基礎理論"]),
+        ("1.2 確率 論の 基礎 と ベイズ 統計 12", ["1.2 確率論の基礎とベイズ統計", "1.2 確率論の 基礎とベイズ統計"]),
+    ]
+
+
 def test_candidates_insert(data_sample_candidates_insert):
     inserter = Insert_Space(Paged_Text_Lines())
     for sample, cand in data_sample_candidates_insert:
@@ -56,3 +66,40 @@ def test_candidates_remove_pass(data_sample_candidates_remove_pass):
     for sample in data_sample_candidates_remove_pass:
         remover = Remove_Space(Paged_Text_Lines(sample))
         assert remover.find_rows() == []
+
+
+def test_candidates_remove_ranked(data_sample_candidates_remove_ranked):
+    remover = Remove_Space(Paged_Text_Lines())
+    for sample, expected in data_sample_candidates_remove_ranked:
+        line = Paged_Text_Line(text=sample)
+        cands: list[str] = [c.text for c in remover._get_candidates(line)]
+        assert cands[: len(expected)] == expected
+
+
+def test_candidates_remove_bounded():
+    remover = Remove_Space(Paged_Text_Lines(), candidates_max=5)
+    line = Paged_Text_Line(text="2 " + " ".join(["統計学"] * 40))
+    assert len(remover._get_where_to_remove(line)) == 5
+
+
+def test_candidates_prefetched(monkeypatch):
+    from Decision import Policy, Policy_Decider
+    from Mediator import Mediator
+
+    texts = ["1 ProbabilityTheory 1", "2 LinearAlgebra 5", "3 IntroductionToStatistics 9", "4 SampleSize 12"]
+    threads: set[str] = set()
+    get_candidates = Insert_Space._get_candidates
+
+    def recorded(self, line):
+        threads.add(threading.current_thread().name)
+        return get_candidates(self, line)
+
+    monkeypatch.setattr(Insert_Space, "_get_candidates", recorded)
+    results: list[str] = []
+    with Mediator.use_deciders([Policy_Decider(Policy.Longest)]):
+        for prefetch in [0, 2]:
+            inserter = Insert_Space(Paged_Text_Lines("\n".join(texts)))
+            inserter.prefetch = prefetch
+            results.append(inserter.get_rows_space_inserted().to_text())
+    assert results[0] == results[1]
+    assert "MainThread" not in threads
@@ -0,0 +1,49 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(".", "scr"))
+from Char_Class import Char_Class, get_char_class, tokenize  # type: ignore
+from Text_Line import Paged_Text_Line  # type: ignore
+
+
+@pytest.fixture
+def data_char_class() -> list[tuple[str, Char_Class]]:
+    return [
+        ("漢", Char_Class.HAN),
+        ("々", Char_Class.HAN),
+        ("か", Char_Class.HIRAGANA),
+        ("カ", Char_Class.KATAKANA),
+        ("ー", Char_Class.KATAKANA),
+        ("a", Char_Class.LETTER),
+        ("Ａ", Char_Class.LETTER),
+        ("1", Char_Class.DIGIT),
+        ("１", Char_Class.DIGIT),
+        (" ", Char_Class.SPACE),
+        ("　", Char_Class.SPACE),
+        ("・", Char_Class.PUNCTUATION),
+        (".", Char_Class.PUNCTUATION),
+    ]
+
+
+def test_char_class(data_char_class):
+    for char, char_class in data_char_class:
+        assert get_char_class(char) == char_class
+
+
+def test_tokenize():
+    runs = tokenize("1.2 確率論のデータ解析 Ａa")
+    assert [r.text for r in runs] == ["1", ".", "2", " ", "確率論", "の", "データ", "解析", " ", "Ａ", "a"]
+    assert [r.ascii for r in runs][-2:] == [False, True]
+    assert all(runs[i].end == runs[i + 1].start for i in range(len(runs) - 1))
+    assert tokenize("") == ()
+
+
+def test_runs_cached_on_line():
+    line = Paged_Text_Line(text="確率 論 12")
+    runs = line.runs
+    assert line.runs is runs
+    assert [r.text for r in runs] == ["確率", " ", "論"]
+    line.text = "確率論"
+    assert [r.text for r in line.runs] == ["確率論"]
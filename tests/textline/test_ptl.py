@@ -6,7 +6,7 @@ from re import Match, Pattern
 import pytest
 
 sys.path.append(os.path.join(".", "scr"))
-from Text_Line import Paged_Text_Line, Text_Line  # type: ignore
+from Text_Line import Paged_Text_Line, Text_Line, kanji_to_int  # type: ignore
 
 # from scr.Text_Line import Paged_Text_Line
 
@@ -45,6 +45,26 @@ def data_header_type() -> list[tuple[str, H]]:
         ("A. brownian motion", H.ALPHABET),
         ("Contents ix", H.NO),
         ("xv", H.NO),
+        ("第十二章 序論 5", H.JA),
+        ("第3節ベイズ推定", H.JA),
+        ("付録A 数表", H.JA),
+        ("第一歩 5", H.NO),
+    ]
+
+
+@pytest.fixture
+def data_kanji_to_int() -> list[tuple[str, int | None]]:
+    return [("十二", 12), ("二〇", 20), ("１２", 12), ("百二十三", 123), ("十百", None), ("二三十", None), ("章", None)]
+
+
+@pytest.fixture
+def data_ja_header() -> list[tuple[str, tuple[str, int] | None]]:
+    return [
+        ("第十二章 序論", ("章", 12)),
+        ("第 2 部 応用", ("部", 2)),
+        ("付録Ｂ 数表", ("付録", 2)),
+        ("付録 補遺", ("付録", 0)),
+        ("序論", None),
     ]
 
 
@@ -112,6 +132,16 @@ def test_ptl_header_type(data_header_type):
         assert read_header == ans_header
 
 
+def test_kanji_to_int(data_kanji_to_int):
+    for kanji, ans in data_kanji_to_int:
+        assert kanji_to_int(kanji) == ans
+
+
+def test_ja_header(data_ja_header):
+    for text, ans in data_ja_header:
+        assert Paged_Text_Line(text=text).get_ja_header() == ans
+
+
 def test_test_pattern_at(data_test_roman_pattern):
     for pat, text, at, res in data_test_roman_pattern:
         ptl = Paged_Text_Line(idx=-1, text=text)
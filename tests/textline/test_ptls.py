@@ -32,3 +32,19 @@ def test_select_ptls(data_select):
         idx_calc: list[int] = ptls.get_index()
         assert idx_calc == ans
         assert isinstance(ptls, Paged_Text_Lines)
+
+
+def test_lookup_row():
+    ptls = to_ptls(idx=[0, 2, 3, 7])
+    assert [ptls.lookup_row(i) is not None for i in range(8)] == [True, False, True, True, False, False, False, True]
+    assert ptls.lookup_row(7).idx == 7
+    # rows added or renumbered after the first lookup are found
+    ptls.lines.append(Paged_Text_Line(idx=9, text="text"))
+    assert ptls.lookup_row(9).idx == 9
+    ptls.lines[1].idx = 5
+    assert ptls.lookup_row(5).idx == 5
+    assert ptls.lookup_row(2) is None
+    # positions are rebuilt after lines are altered
+    ptls.lines.pop(0)
+    assert ptls.lookup_row(0) is None
+    assert ptls.lookup_row(7).idx == 7
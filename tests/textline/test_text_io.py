@@ -0,0 +1,35 @@
+import os
+import sys
+
+sys.path.append(os.path.join(".", "scr"))
+
+import pytest
+from Text_IO import read_lines, write_lines
+from Text_Lines import Paged_Text_Lines
+
+
+@pytest.fixture
+def data_sample_texts():
+    return [
+        "",
+        "\n",
+        "1 Introduction 1",
+        "1 Introduction 1\n2 Basics 3\n",
+        "1 Introduction 1\r\n\r\n2 Basics 3",
+        "第1章 序論 1\r2 基礎 3\x0c",
+    ]
+
+
+def test_read_lines(data_sample_texts, tmp_path):
+    path = tmp_path / "toc.txt"
+    for text in data_sample_texts:
+        path.write_bytes(text.encode("utf-8"))
+        assert list(read_lines(path, encoding="utf-8")) == text.splitlines()
+
+
+def test_write_lines(data_sample_texts, tmp_path):
+    path = tmp_path / "toc.txt"
+    for text in data_sample_texts:
+        ptls = Paged_Text_Lines(text)
+        write_lines(path, ptls.iter_text(), encoding="utf-8")
+        assert path.read_text(encoding="utf-8") == ptls.to_text()